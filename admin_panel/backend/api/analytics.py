@@ -52,17 +52,32 @@ async def get_analytics_overview(
     product_result = db.execute(text(product_query), {"since_date": since_date})
     product_data = [dict(row._mapping) for row in product_result]
     
-    # Processing performance
+    # Processing performance. Duplicate checks aren't logged, so a day can have
+    # blocked duplicates in daily_stats without any log rows.
     performance_query = """
+        WITH log_days AS (
+            SELECT 
+                DATE(timestamp) as date,
+                COUNT(CASE WHEN action = 'sent' THEN 1 END) as successful,
+                COUNT(CASE WHEN action = 'error' THEN 1 END) as errors
+            FROM order_processing_log
+            WHERE timestamp >= :since_date
+            GROUP BY DATE(timestamp)
+        ),
+        duplicate_days AS (
+            SELECT day as date, duplicate_count
+            FROM daily_stats
+            WHERE day >= DATE(:since_date) AND duplicate_count > 0
+        )
         SELECT 
-            DATE(timestamp) as date,
-            COUNT(CASE WHEN action = 'sent' THEN 1 END) as successful,
-            COUNT(CASE WHEN action = 'error' THEN 1 END) as errors,
-            COUNT(CASE WHEN action = 'duplicate_check' AND details = 'Order already sent' THEN 1 END) as duplicates_blocked
-        FROM order_processing_log
-        WHERE timestamp >= :since_date
-        GROUP BY DATE(timestamp)
-        ORDER BY date
+            days.date,
+            COALESCE(log_days.successful, 0) as successful,
+            COALESCE(log_days.errors, 0) as errors,
+            COALESCE(duplicate_days.duplicate_count, 0) as duplicates_blocked
+        FROM (SELECT date FROM log_days UNION SELECT date FROM duplicate_days) days
+        LEFT JOIN log_days ON log_days.date = days.date
+        LEFT JOIN duplicate_days ON duplicate_days.date = days.date
+        ORDER BY days.date
     """
     performance_result = db.execute(text(performance_query), {"since_date": since_date})
     performance_data = [dict(row._mapping) for row in performance_result]
@@ -122,11 +137,9 @@ async def get_email_metrics(
     # Duplicate prevention effectiveness
     duplicate_query = """
         SELECT 
-            COUNT(*) as duplicates_blocked
-        FROM order_processing_log
-        WHERE action = 'duplicate_check' 
-        AND details = 'Order already sent'
-        AND timestamp >= :since_date
+            COALESCE(SUM(duplicate_count), 0) as duplicates_blocked
+        FROM daily_stats
+        WHERE day >= DATE(:since_date)
     """
     duplicate_result = db.execute(text(duplicate_query), {"since_date": since_date}).fetchone()
     
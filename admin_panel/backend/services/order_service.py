@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text, and_, or_
 import json
 import sys
+import traceback
 from pathlib import Path
 
 # Add parent directory for imports
@@ -166,6 +167,7 @@ class OrderService:
             )
             
             self.db.commit()
+            self.order_tracker.forget_order(order_id)
             return True
             
         except Exception as e:
@@ -271,10 +273,12 @@ class OrderService:
                 "timestamp": datetime.utcnow().isoformat()
             }
             
-            self.order_tracker._log_action(
-                order_id,
-                "updated",
-                json.dumps(audit_details)
+            # Written on this session's connection so the entry commits with the
+            # update and is re-keyed below along with the rest of the history
+            self.db.execute(
+                text("INSERT INTO order_processing_log (order_id, action, details) "
+                     "VALUES (:order_id, :action, :details)"),
+                {"order_id": order_id, "action": "updated", "details": json.dumps(audit_details)}
             )
             
             # If order_id was changed, update the log entries
@@ -286,8 +290,13 @@ class OrderService:
             
             self.db.commit()
             
-            # Return the updated order
+            # Drop both ids; a renamed order may have been cached under its new id
             final_order_id = updates.get("order_id", order_id)
+            self.order_tracker.forget_order(order_id)
+            if final_order_id != order_id:
+                self.order_tracker.forget_order(final_order_id)
+            
+            # Return the updated order
             return self.get_order_detail(final_order_id)
             
         except ValueError as ve:
@@ -381,7 +390,6 @@ class OrderService:
         except Exception as e:
             logger.error(f"Error resending Laticrete order {order.get('order_id')}: {e}", exc_info=True)
             # Also log to a file for debugging
-            import traceback
             with open('/tmp/laticrete_resend_error.log', 'w') as f:
                 f.write(f"Error resending Laticrete order {order.get('order_id')}: {e}\n")
                 f.write(traceback.format_exc())
@@ -541,6 +549,7 @@ class OrderService:
             )
             
             self.db.commit()
+            self.order_tracker.forget_order(order_id)
             return True
             
         except Exception as e:
@@ -19,7 +19,7 @@ from src.email_sender import EmailSender
 from src.claude_processor import ClaudeProcessor
 from src.order_tracker import OrderTracker
 from src.laticrete_processor import LatricreteProcessor
-from src.utils.logger import setup_logger
+from src.utils.logger import disable_unused_record_fields, setup_logger
 
 # Load environment variables
 load_dotenv()
@@ -336,4 +336,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # The processor's formats use none of the per-record thread/process/caller fields
+    disable_unused_record_fields()
     main()
\ No newline at end of file
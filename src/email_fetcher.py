@@ -1,8 +1,9 @@
 """IMAP email fetcher for retrieving Tile Pro Depot emails."""
 
 import re
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from imap_tools import MailBox, AND, OR
 from email.header import decode_header
 import logging
@@ -47,6 +48,18 @@ class EmailFetcher:
                 decoded_parts.append(str(part))
         return ' '.join(decoded_parts)
         
+    @contextmanager
+    def session(self) -> Iterator[MailBox]:
+        """
+        Open one logged-in IMAP session that several operations can share.
+        
+        Yields:
+            Logged-in MailBox, logged out when the block exits
+        """
+        with MailBox(self.server, self.port).login(self.email, self.password) as mailbox:
+            logger.info(f"Connected to {self.server} as {self.email} (read-only mode)")
+            yield mailbox
+    
     def fetch_tile_pro_depot_emails(self, since_days: int = 1) -> List[Dict]:
         """
         Fetch emails from Tile Pro Depot.
@@ -57,79 +70,89 @@ class EmailFetcher:
         Returns:
             List of email dictionaries with parsed content
         """
-        emails = []
-        
         try:
             # Connect to mailbox
-            with MailBox(self.server, self.port).login(self.email, self.password) as mailbox:
-                logger.info(f"Connected to {self.server} as {self.email} (read-only mode)")
-                
-                # Calculate date range
-                since_date = datetime.now() - timedelta(days=since_days)
-                
-                # Search criteria for Tile Pro Depot emails
-                # Use OR to catch both direct emails and forwarded emails
-                criteria = AND(
-                    OR(
-                        from_="noreply@tileprodepot.com",
-                        to="customerservice@tileprodepot.com"
-                    ),
-                    date_gte=since_date.date()
-                )
-                
-                # Fetch matching emails without marking as read
-                for msg in mailbox.fetch(criteria, mark_seen=False):
-                    try:
-                        # Check if subject contains "New customer order"
-                        subject = self._decode_header_value(msg.subject)
-                        logger.debug(f"Checking email - From: {msg.from_}, To: {msg.to}, Subject: {subject}")
-                        
-                        if "new customer order" not in subject.lower():
-                            logger.debug(f"Skipping email - subject doesn't contain 'new customer order': {subject}")
-                            continue
-                            
-                        # Extract order number from subject if present
-                        order_match = re.search(r'\((\d+)\)', subject)
-                        order_id = order_match.group(1) if order_match else None
-                        
-                        # Get email content
-                        html_content = msg.html or ""
-                        text_content = msg.text or ""
-                        
-                        # Check if email contains the expected pattern
-                        # Use case-insensitive search for better matching
-                        html_lower = html_content.lower()
-                        text_lower = text_content.lower()
-                        
-                        if "received the following order" in html_lower or \
-                           "received the following order" in text_lower or \
-                           "received a new order" in html_lower or \
-                           "received a new order" in text_lower:
-                            
-                            email_data = {
-                                'uid': msg.uid,
-                                'subject': subject,
-                                'from': msg.from_,
-                                'date': msg.date,
-                                'order_id': order_id,
-                                'html': html_content,
-                                'text': text_content,
-                                'has_attachments': len(msg.attachments) > 0
-                            }
-                            
-                            emails.append(email_data)
-                            logger.info(f"Found Tile Pro Depot order email: {subject}")
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing email: {e}")
-                        continue
-                
-                logger.info(f"Fetched {len(emails)} Tile Pro Depot order emails")
+            with self.session() as mailbox:
+                return self._fetch_within(mailbox, since_days)
                 
         except Exception as e:
             logger.error(f"Error connecting to mailbox: {e}")
             raise
+    
+    def _fetch_within(self, mailbox: MailBox, since_days: int = 1) -> List[Dict]:
+        """
+        Fetch Tile Pro Depot order emails through an already open session.
+        
+        Args:
+            mailbox: Logged-in MailBox, e.g. from session()
+            since_days: Number of days to look back for emails
             
+        Returns:
+            List of email dictionaries with parsed content
+        """
+        emails = []
+        
+        # Calculate date range
+        since_date = datetime.now() - timedelta(days=since_days)
+        
+        # Search criteria for Tile Pro Depot emails
+        # Use OR to catch both direct emails and forwarded emails
+        criteria = AND(
+            OR(
+                from_="noreply@tileprodepot.com",
+                to="customerservice@tileprodepot.com"
+            ),
+            date_gte=since_date.date()
+        )
+        
+        # Fetch matching emails without marking as read
+        for msg in mailbox.fetch(criteria, mark_seen=False):
+            try:
+                # Check if subject contains "New customer order"
+                subject = self._decode_header_value(msg.subject)
+                logger.debug(f"Checking email - From: {msg.from_}, To: {msg.to}, Subject: {subject}")
+                
+                if "new customer order" not in subject.lower():
+                    logger.debug(f"Skipping email - subject doesn't contain 'new customer order': {subject}")
+                    continue
+                    
+                # Extract order number from subject if present
+                order_match = re.search(r'\((\d+)\)', subject)
+                order_id = order_match.group(1) if order_match else None
+                
+                # Get email content
+                html_content = msg.html or ""
+                text_content = msg.text or ""
+                
+                # Check if email contains the expected pattern
+                # Use case-insensitive search for better matching
+                html_lower = html_content.lower()
+                text_lower = text_content.lower()
+                
+                if "received the following order" in html_lower or \
+                   "received the following order" in text_lower or \
+                   "received a new order" in html_lower or \
+                   "received a new order" in text_lower:
+                    
+                    email_data = {
+                        'uid': msg.uid,
+                        'subject': subject,
+                        'from': msg.from_,
+                        'date': msg.date,
+                        'order_id': order_id,
+                        'html': html_content,
+                        'text': text_content,
+                        'has_attachments': len(msg.attachments) > 0
+                    }
+                    
+                    emails.append(email_data)
+                    logger.info(f"Found Tile Pro Depot order email: {subject}")
+                
+            except Exception as e:
+                logger.error(f"Error processing email: {e}")
+                continue
+        
+        logger.info(f"Fetched {len(emails)} Tile Pro Depot order emails")
         return emails
     
     def fetch_unread_tile_pro_depot_emails(self) -> List[Dict]:
@@ -9,6 +9,38 @@ from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Order fields, tried in order until one matches
+CUSTOMER_NAME_RES = [
+    re.compile(r"You've received the following order from ([^:]+):"),
+    re.compile(r"You've received a new order from ([^:]+):"),
+    re.compile(r"Woo! You've received a new order from ([^:]+):")
+]
+ORDER_ID_RES = [
+    re.compile(r'\[Order #(\d+)\]'),
+    re.compile(r'Order #(\d+)'),
+    re.compile(r'#(\d+) \(.*\d{4}\)')  # Matches "#43333 (June 13, 2025)"
+]
+SHIPPING_METHOD_RES = [
+    re.compile(r'Shipping:\s*([^\n]+)', re.IGNORECASE),
+    re.compile(r'Shipping method:\s*([^\n]+)', re.IGNORECASE),
+    re.compile(r'Ship via:\s*([^\n]+)', re.IGNORECASE)
+]
+TOTAL_RE = re.compile(r'Total:\s*\$?([\d,]+\.?\d*)', re.IGNORECASE)
+QUANTITY_RE = re.compile(r'[×x]\d+')
+
+
+def _address_res(address_type: str) -> List[re.Pattern]:
+    """Billing or shipping address patterns, most specific first."""
+    return [
+        re.compile(rf'{address_type}\s+address:?\s*([^$]+?)(?:Shipping|Billing|Payment|Email|Phone|$)',
+                   re.IGNORECASE | re.DOTALL),
+        re.compile(rf'{address_type}:?\s*([^$]+?)(?:Shipping|Billing|Payment|Email|Phone|$)',
+                   re.IGNORECASE | re.DOTALL)
+    ]
+
+
+ADDRESS_RES = {address_type: _address_res(address_type) for address_type in ('shipping', 'billing')}
+
 
 class TileProDepotParser:
     """Parser for Tile Pro Depot order emails."""
@@ -29,6 +61,29 @@ class TileProDepotParser:
             r'LATI\s*CRETE'
         ]
         
+        # Each list as one case-insensitive pattern; matches if any of its patterns would
+        self._tileware_re = re.compile('|'.join(self.tileware_patterns), re.IGNORECASE)
+        self._laticrete_re = re.compile('|'.join(self.laticrete_patterns), re.IGNORECASE)
+        self._product_re = re.compile('|'.join(self.tileware_patterns + self.laticrete_patterns),
+                                      re.IGNORECASE)
+        
+        # (html, parsed tree) for the most recently parsed email
+        self._parsed = None
+        
+    def _parse(self, html_content: str) -> BeautifulSoup:
+        """
+        Parse email HTML, reusing the tree from the last call on the same HTML.
+        
+        Detection and extraction usually run back to back on one email, so it
+        is parsed once instead of per method. The tree is only ever read.
+        """
+        parsed = self._parsed
+        if parsed is not None and parsed[0] == html_content:
+            return parsed[1]
+        soup = BeautifulSoup(html_content, 'html.parser')
+        self._parsed = (html_content, soup)
+        return soup
+        
     def contains_tileware_product(self, html_content: str) -> bool:
         """
         Check if the email contains TileWare products.
@@ -51,33 +106,30 @@ class TileProDepotParser:
             
         # Parse HTML to look for TileWare in product tables
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self._parse(html_content)
             
             # Look for tables that might contain product information
             tables = soup.find_all('table')
             
             for table in tables:
-                table_text = table.get_text()
-                for pattern in self.tileware_patterns:
-                    if re.search(pattern, table_text, re.IGNORECASE):
-                        logger.info("Found TileWare product in order")
-                        return True
+                if self._tileware_re.search(table.get_text()):
+                    logger.info("Found TileWare product in order")
+                    return True
                         
             # Also check in general content if not in tables
             body_text = soup.get_text()
-            for pattern in self.tileware_patterns:
-                if re.search(pattern, body_text, re.IGNORECASE):
-                    # Make sure it's in a product context
-                    lines = body_text.split('\n')
-                    for i, line in enumerate(lines):
-                        if re.search(pattern, line, re.IGNORECASE):
-                            # Check surrounding lines for product indicators
-                            context_lines = lines[max(0, i-2):min(len(lines), i+3)]
-                            context = ' '.join(context_lines)
-                            if any(indicator in context.lower() for indicator in 
-                                   ['product', 'item', 'quantity', 'price', '$']):
-                                logger.info("Found TileWare product in email content")
-                                return True
+            if self._tileware_re.search(body_text):
+                # Make sure it's in a product context
+                lines = body_text.split('\n')
+                for i, line in enumerate(lines):
+                    if self._tileware_re.search(line):
+                        # Check surrounding lines for product indicators
+                        context_lines = lines[max(0, i-2):min(len(lines), i+3)]
+                        context = ' '.join(context_lines)
+                        if any(indicator in context.lower() for indicator in 
+                               ['product', 'item', 'quantity', 'price', '$']):
+                            logger.info("Found TileWare product in email content")
+                            return True
                                 
         except Exception as e:
             logger.error(f"Error parsing HTML content: {e}")
@@ -106,33 +158,30 @@ class TileProDepotParser:
             
         # Parse HTML to look for Laticrete in product tables
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self._parse(html_content)
             
             # Look for tables that might contain product information
             tables = soup.find_all('table')
             
             for table in tables:
-                table_text = table.get_text()
-                for pattern in self.laticrete_patterns:
-                    if re.search(pattern, table_text, re.IGNORECASE):
-                        logger.info("Found Laticrete product in order")
-                        return True
+                if self._laticrete_re.search(table.get_text()):
+                    logger.info("Found Laticrete product in order")
+                    return True
                         
             # Also check in general content if not in tables
             body_text = soup.get_text()
-            for pattern in self.laticrete_patterns:
-                if re.search(pattern, body_text, re.IGNORECASE):
-                    # Make sure it's in a product context
-                    lines = body_text.split('\n')
-                    for i, line in enumerate(lines):
-                        if re.search(pattern, line, re.IGNORECASE):
-                            # Check surrounding lines for product indicators
-                            context_lines = lines[max(0, i-2):min(len(lines), i+3)]
-                            context = ' '.join(context_lines)
-                            if any(indicator in context.lower() for indicator in 
-                                   ['product', 'item', 'quantity', 'price', '$']):
-                                logger.info("Found Laticrete product in email content")
-                                return True
+            if self._laticrete_re.search(body_text):
+                # Make sure it's in a product context
+                lines = body_text.split('\n')
+                for i, line in enumerate(lines):
+                    if self._laticrete_re.search(line):
+                        # Check surrounding lines for product indicators
+                        context_lines = lines[max(0, i-2):min(len(lines), i+3)]
+                        context = ' '.join(context_lines)
+                        if any(indicator in context.lower() for indicator in 
+                               ['product', 'item', 'quantity', 'price', '$']):
+                            logger.info("Found Laticrete product in email content")
+                            return True
                                 
         except Exception as e:
             logger.error(f"Error parsing HTML content: {e}")
@@ -182,47 +231,32 @@ class TileProDepotParser:
         }
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self._parse(html_content)
             text = soup.get_text()
             
             # Extract customer name
-            customer_patterns = [
-                r"You've received the following order from ([^:]+):",
-                r"You've received a new order from ([^:]+):",
-                r"Woo! You've received a new order from ([^:]+):"
-            ]
-            for pattern in customer_patterns:
-                customer_match = re.search(pattern, text)
+            for pattern in CUSTOMER_NAME_RES:
+                customer_match = pattern.search(text)
                 if customer_match:
                     order_info['customer_name'] = customer_match.group(1).strip()
                     break
                 
             # Extract order ID
-            order_id_patterns = [
-                r'\[Order #(\d+)\]',
-                r'Order #(\d+)',
-                r'#(\d+) \(.*\d{4}\)'  # Matches "#43333 (June 13, 2025)"
-            ]
-            for pattern in order_id_patterns:
-                order_id_match = re.search(pattern, text)
+            for pattern in ORDER_ID_RES:
+                order_id_match = pattern.search(text)
                 if order_id_match:
                     order_info['order_id'] = order_id_match.group(1)
                     break
                 
             # Extract shipping method
-            shipping_patterns = [
-                r'Shipping:\s*([^\n]+)',
-                r'Shipping method:\s*([^\n]+)',
-                r'Ship via:\s*([^\n]+)'
-            ]
-            for pattern in shipping_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
+            for pattern in SHIPPING_METHOD_RES:
+                match = pattern.search(text)
                 if match:
                     order_info['shipping_method'] = match.group(1).strip()
                     break
                     
             # Extract total
-            total_match = re.search(r'Total:\s*\$?([\d,]+\.?\d*)', text, re.IGNORECASE)
+            total_match = TOTAL_RE.search(text)
             if total_match:
                 order_info['total'] = total_match.group(1).replace(',', '')
                 
@@ -240,13 +274,10 @@ class TileProDepotParser:
     
     def _extract_address(self, text: str, address_type: str) -> Optional[str]:
         """Extract billing or shipping address from text."""
-        patterns = [
-            rf'{address_type}\s+address:?\s*([^$]+?)(?:Shipping|Billing|Payment|Email|Phone|$)',
-            rf'{address_type}:?\s*([^$]+?)(?:Shipping|Billing|Payment|Email|Phone|$)'
-        ]
+        patterns = ADDRESS_RES.get(address_type) or _address_res(address_type)
         
         for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+            match = pattern.search(text)
             if match:
                 address = match.group(1).strip()
                 # Clean up the address
@@ -289,18 +320,15 @@ class TileProDepotParser:
                         for idx, cell in enumerate(cells):
                             cell_text = cell.get_text().strip()
                             # Check if this cell contains TileWare or Laticrete
-                            if any(re.search(pattern, cell_text, re.IGNORECASE) 
-                                   for pattern in self.tileware_patterns + self.laticrete_patterns):
+                            if self._product_re.search(cell_text):
                                 product_cell_idx = idx
                                 product_text = cell_text
                                 break
                         
                         if product_cell_idx >= 0:
                             # Check if this is a TileWare or Laticrete product
-                            is_tileware = any(re.search(pattern, product_text, re.IGNORECASE) 
-                                            for pattern in self.tileware_patterns)
-                            is_laticrete = any(re.search(pattern, product_text, re.IGNORECASE) 
-                                             for pattern in self.laticrete_patterns)
+                            is_tileware = bool(self._tileware_re.search(product_text))
+                            is_laticrete = bool(self._laticrete_re.search(product_text))
                             
                             # Extract quantity and price from remaining cells
                             quantity = '1'
@@ -310,7 +338,7 @@ class TileProDepotParser:
                                 if idx != product_cell_idx:
                                     cell_text = cell.get_text().strip()
                                     # Check for quantity pattern (×N or xN)
-                                    if re.match(r'[×x]\d+', cell_text):
+                                    if QUANTITY_RE.match(cell_text):
                                         quantity = cell_text.replace('×', '').replace('x', '').strip()
                                     # Check for price pattern
                                     elif '$' in cell_text:
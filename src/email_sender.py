@@ -11,6 +11,7 @@ from typing import Optional, List, Dict
 import time
 import logging
 import os
+import threading
 import imaplib
 from email import message_from_string
 
@@ -39,6 +40,20 @@ class EmailSender:
         self.password = password
         self.from_address = username
         self.signature_html = signature_html
+        # Set while used as a context manager: sends share one logged-in connection
+        self._keep_alive = False
+        self._server: Optional[smtplib.SMTP] = None
+        self._server_lock = threading.Lock()
+        
+    def __enter__(self) -> 'EmailSender':
+        """Reuse one SMTP connection for every send until the block exits."""
+        self._keep_alive = True
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self._keep_alive = False
+        with self._server_lock:
+            self._close_server()
         
     def send_order_to_cs(self, recipient: str, order_text: str, 
                         original_order_id: str = "Unknown") -> bool:
@@ -264,39 +279,14 @@ Instagram: https://www.instagram.com/installations_plus/
         """
         for attempt in range(max_retries):
             try:
-                # Create SSL context
-                context = ssl.create_default_context()
+                self._send_message(message)
                 
-                # Connect to server based on port
-                if self.smtp_port == 465:
-                    # Use SMTP_SSL for port 465
-                    with smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, context=context) as server:
-                        server.login(self.username, self.password)
-                        
-                        # Send email
-                        server.send_message(message)
-                        
-                        logger.info(f"Successfully sent order email to {recipient}")
-                        
-                        # Save to sent folder if configured
-                        self._save_to_sent_folder(message)
-                        
-                        return True
-                else:
-                    # Use STARTTLS for other ports (587, 25)
-                    with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                        server.starttls(context=context)
-                        server.login(self.username, self.password)
-                        
-                        # Send email
-                        server.send_message(message)
-                        
-                        logger.info(f"Successfully sent order email to {recipient}")
-                        
-                        # Save to sent folder if configured
-                        self._save_to_sent_folder(message)
-                        
-                        return True
+                logger.info(f"Successfully sent order email to {recipient}")
+                
+                # Save to sent folder if configured
+                self._save_to_sent_folder(message)
+                
+                return True
                     
             except smtplib.SMTPAuthenticationError as e:
                 logger.error(f"SMTP authentication failed: {e}")
@@ -317,6 +307,52 @@ Instagram: https://www.instagram.com/installations_plus/
         logger.error(f"Failed to send email after {max_retries} attempts")
         return False
     
+    def _connect(self) -> smtplib.SMTP:
+        """Open a logged-in SMTP connection (SSL on port 465, STARTTLS otherwise)."""
+        # Create SSL context
+        context = ssl.create_default_context()
+        
+        if self.smtp_port == 465:
+            # Use SMTP_SSL for port 465
+            server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, context=context)
+        else:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            if self.smtp_port != 465:
+                # Use STARTTLS for other ports (587, 25)
+                server.starttls(context=context)
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _send_message(self, message: MIMEMultipart) -> None:
+        """Send a message over the shared connection, or a new one outside a with block."""
+        if not self._keep_alive:
+            with self._connect() as server:
+                server.send_message(message)
+            return
+        
+        with self._server_lock:
+            try:
+                if self._server is None:
+                    self._server = self._connect()
+                self._server.send_message(message)
+            except Exception:
+                # Reconnect on the next attempt rather than reuse a broken session
+                self._close_server()
+                raise
+    
+    def _close_server(self) -> None:
+        """Close the shared connection, if open. Callers hold _server_lock."""
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+    
     def test_connection(self) -> bool:
         """
         Test SMTP connection.
@@ -325,17 +361,8 @@ Instagram: https://www.instagram.com/installations_plus/
             True if connection successful, False otherwise
         """
         try:
-            context = ssl.create_default_context()
-            
-            if self.smtp_port == 465:
-                # Use SMTP_SSL for port 465
-                with smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, context=context) as server:
-                    server.login(self.username, self.password)
-            else:
-                # Use STARTTLS for other ports
-                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                    server.starttls(context=context)
-                    server.login(self.username, self.password)
+            with self._connect():
+                pass
                 
             logger.info("SMTP connection test successful")
             return True
@@ -368,7 +395,8 @@ Instagram: https://www.instagram.com/installations_plus/
     
     def send_email_with_attachment(self, to_email: str, subject: str, 
                                   html_content: str, text_content: str,
-                                  attachment_path: str, attachment_name: str) -> bool:
+                                  attachment_path: Optional[str], attachment_name: str,
+                                  attachment_data: Optional[bytes] = None) -> bool:
         """
         Send email with a PDF attachment.
         
@@ -377,8 +405,9 @@ Instagram: https://www.instagram.com/installations_plus/
             subject: Email subject
             html_content: HTML version of email body
             text_content: Plain text version of email body
-            attachment_path: Path to PDF file to attach
+            attachment_path: Path to PDF file to attach (ignored if attachment_data is given)
             attachment_name: Name for the attachment
+            attachment_data: PDF content already in memory, attached without touching disk
             
         Returns:
             True if sent successfully, False otherwise
@@ -407,20 +436,27 @@ Instagram: https://www.instagram.com/installations_plus/
         
         # Add PDF attachment
         try:
-            # Verify attachment exists and has content
-            if not os.path.exists(attachment_path):
-                logger.error(f"Attachment file not found: {attachment_path}")
-                return False
+            if attachment_data is None:
+                # Verify attachment exists and has content
+                if not attachment_path or not os.path.exists(attachment_path):
+                    logger.error(f"Attachment file not found: {attachment_path}")
+                    return False
+                    
+                file_size = os.path.getsize(attachment_path)
+                logger.info(f"Attaching PDF: {attachment_path} (size: {file_size} bytes)")
                 
-            file_size = os.path.getsize(attachment_path)
-            logger.info(f"Attaching PDF: {attachment_path} (size: {file_size} bytes)")
+                with open(attachment_path, 'rb') as attachment:
+                    attachment_data = attachment.read()
+                    logger.info(f"Read {len(attachment_data)} bytes from PDF")
+            elif not attachment_data:
+                logger.error("Attachment data is empty")
+                return False
+            else:
+                logger.info(f"Attaching in-memory PDF ({len(attachment_data)} bytes)")
             
-            with open(attachment_path, 'rb') as attachment:
-                # Create MIMEBase instance
-                pdf_part = MIMEBase('application', 'pdf')
-                pdf_content = attachment.read()
-                pdf_part.set_payload(pdf_content)
-                logger.info(f"Read {len(pdf_content)} bytes from PDF")
+            # Create MIMEBase instance
+            pdf_part = MIMEBase('application', 'pdf')
+            pdf_part.set_payload(attachment_data)
                 
             # Encode file
             encoders.encode_base64(pdf_part)
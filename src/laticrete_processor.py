@@ -6,7 +6,7 @@ Handles Laticrete product orders: extracts data, matches prices, fills PDF, and
 import os
 from typing import Dict, List, Optional
 from pathlib import Path
-import tempfile
+import io
 import logging
 from datetime import datetime
 from src.price_list_reader import PriceListReader
@@ -20,12 +20,19 @@ logger = setup_logger(__name__)
 class LatricreteProcessor:
     """Processes Laticrete orders end-to-end."""
     
-    def __init__(self):
-        """Initialize processor components."""
-        self.price_reader = PriceListReader()
+    def __init__(self, price_reader: Optional[PriceListReader] = None,
+                 email_sender: Optional[EmailSender] = None):
+        """
+        Initialize processor components.
+        
+        Args:
+            price_reader: Already loaded price list; defaults to the process-wide shared reader
+            email_sender: Sender to reuse (e.g. one holding an open SMTP connection)
+        """
+        self.price_reader = price_reader or PriceListReader.shared()
         self.pdf_filler = PDFOrderFormFiller()
         # Initialize email sender with SMTP credentials
-        self.email_sender = EmailSender(
+        self.email_sender = email_sender or EmailSender(
             smtp_server=os.getenv('SMTP_SERVER'),
             smtp_port=int(os.getenv('SMTP_PORT', 587)),
             username=os.getenv('SMTP_USERNAME'),
@@ -52,19 +59,13 @@ class LatricreteProcessor:
             enriched_order = self._enrich_with_prices(order_data)
             
             # Generate filled PDF
-            pdf_path = self._generate_order_pdf(enriched_order)
-            if not pdf_path:
+            pdf_bytes = self._generate_order_pdf(enriched_order)
+            if not pdf_bytes:
                 logger.error("Failed to generate PDF")
                 return False
             
             # Send email with PDF attachment
-            success = self._send_order_email(enriched_order, pdf_path)
-            
-            # Clean up temp file
-            if pdf_path and os.path.exists(pdf_path):
-                os.unlink(pdf_path)
-            
-            return success
+            return self._send_order_email(enriched_order, pdf_bytes)
             
         except Exception as e:
             logger.error(f"Error processing Laticrete order: {e}")
@@ -74,21 +75,22 @@ class LatricreteProcessor:
         """Add price list information to products."""
         enriched_order = order_data.copy()
         enriched_products = []
+        products = order_data.get('laticrete_products', [])
         
-        for product in order_data.get('laticrete_products', []):
-            enriched_product = product.copy()
-            
+        queries = []
+        for product in products:
             # Clean product name for better matching
             product_name = product.get('name', '')
             # Remove "Laticrete" prefix if present for cleaner matching
             if product_name.lower().startswith('laticrete '):
                 product_name = product_name[10:]  # Remove "Laticrete " prefix
-            
-            # Look up product in price list
-            price_info = self.price_reader.find_product(
-                product_name,
-                product.get('sku', '')
-            )
+            queries.append((product_name, product.get('sku', '')))
+        
+        # Look up all products in the price list at once
+        price_infos = self.price_reader.find_products(queries)
+        
+        for product, (product_name, _), price_info in zip(products, queries, price_infos):
+            enriched_product = product.copy()
             
             if price_info:
                 # Add/update with price list data
@@ -128,29 +130,23 @@ class LatricreteProcessor:
         
         return enriched_order
     
-    def _generate_order_pdf(self, order_data: Dict) -> Optional[str]:
-        """Generate filled PDF order form."""
+    def _generate_order_pdf(self, order_data: Dict) -> Optional[bytes]:
+        """Generate filled PDF order form in memory."""
         try:
-            # Create temp file for PDF
-            temp_file = tempfile.NamedTemporaryFile(
-                delete=False,
-                suffix=f'_laticrete_order_{order_data.get("order_id", "unknown")}.pdf'
-            )
-            temp_file.close()
-            
-            # Fill the PDF
-            if self.pdf_filler.fill_order_form(order_data, temp_file.name):
-                logger.info(f"Generated PDF: {temp_file.name}")
-                return temp_file.name
-            else:
-                os.unlink(temp_file.name)
-                return None
+            # Fill into a buffer; the bytes go straight into the attachment
+            buffer = io.BytesIO()
+            if self.pdf_filler.fill_order_form(order_data, buffer):
+                pdf_bytes = buffer.getvalue()
+                logger.info(f"Generated PDF for order {order_data.get('order_id', 'unknown')} "
+                            f"({len(pdf_bytes)} bytes)")
+                return pdf_bytes
+            return None
                 
         except Exception as e:
             logger.error(f"Error generating PDF: {e}")
             return None
     
-    def _send_order_email(self, order_data: Dict, pdf_path: str) -> bool:
+    def _send_order_email(self, order_data: Dict, pdf_bytes: bytes) -> bool:
         """Send order email with PDF attachment."""
         if not self.laticrete_cs_email:
             logger.error("LATICRETE_CS_EMAIL not configured")
@@ -273,6 +269,7 @@ This order was automatically processed from Tile Pro Depot order confirmation.
             subject=subject,
             html_content=html_content,
             text_content=text_content,
-            attachment_path=pdf_path,
-            attachment_name=f"Laticrete_Order_{order_data.get('order_id', 'unknown')}.pdf"
+            attachment_path=None,
+            attachment_name=f"Laticrete_Order_{order_data.get('order_id', 'unknown')}.pdf",
+            attachment_data=pdf_bytes
         )
\ No newline at end of file
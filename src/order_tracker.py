@@ -3,33 +3,395 @@
 import sqlite3
 import json
 import os
-from datetime import datetime, timedelta
-from typing import Dict, Optional, List, Any, Tuple
+import atexit
+import queue
+import weakref
+import textwrap
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional, List, Any, Tuple, Iterator, Iterable
+from collections import OrderedDict, Counter
 from contextlib import contextmanager
 import threading
+import time
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Larger pages keep formatted_content/JSON rows off overflow pages. SQLite only
+# honours page_size before the first table is created, so existing databases
+# keep their page size until a one-time manual `VACUUM` after changing it.
+DB_PAGE_SIZE = 8192
+DB_MMAP_SIZE = 256 * 1024 * 1024  # 256MB
+
+# Applied to every connection when it is opened. NORMAL sync is durable under WAL
+# apart from the last commits on power loss; the busy timeout comes from connect().
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",  # 64MB
+    "PRAGMA temp_store=MEMORY",
+    f"PRAGMA mmap_size={DB_MMAP_SIZE}",
+)
+
+
+def _dumps_json(value: Any) -> str:
+    """Encode a value for a JSON TEXT column, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+
+_loads_json = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# raw_email_content is only read back through the tracker, so it is stored as a
+# zlib BLOB. Columns the admin panel queries directly stay plain TEXT.
+RAW_EMAIL_COMPRESS_LEVEL = 6
+
+
+def _compress_text(text: Optional[str]) -> Any:
+    """Compress a large text column (raw email HTML) into a zlib BLOB."""
+    if not text:
+        return text
+    return zlib.compress(text.encode('utf-8'), RAW_EMAIL_COMPRESS_LEVEL)
+
+
+def _decompress_text(value: Any) -> Any:
+    """Inverse of _compress_text; rows written before compression are plain TEXT."""
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode('utf-8')
+    return value
+
+
+class _LazyOrderRow(dict):
+    """
+    Order row whose JSON columns are decoded on first access.
+    
+    Listings rarely read the product and order_data payloads, so the parse cost
+    is only paid for the fields a caller actually touches. Values that are not
+    valid JSON are left as stored.
+    """
+    
+    JSON_FIELDS = ('order_data', 'tileware_products', 'laticrete_products')
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._undecoded = {key for key in self.JSON_FIELDS if dict.get(self, key)}
+        
+    def _decode(self, key):
+        if key in self._undecoded:
+            self._undecoded.discard(key)
+            try:
+                dict.__setitem__(self, key, _loads_json(dict.__getitem__(self, key)))
+            except Exception:
+                pass
+                
+    def _decode_all(self):
+        for key in tuple(self._undecoded):
+            self._decode(key)
+            
+    def __getitem__(self, key):
+        self._decode(key)
+        return dict.__getitem__(self, key)
+        
+    def __setitem__(self, key, value):
+        self._undecoded.discard(key)
+        dict.__setitem__(self, key, value)
+        
+    def __iter__(self):
+        # Defining __iter__ also stops dict(row) from copying the raw values
+        # through the C fast path; it goes via keys() and __getitem__ instead
+        return dict.__iter__(self)
+        
+    def get(self, key, default=None):
+        self._decode(key)
+        return dict.get(self, key, default)
+        
+    def items(self):
+        self._decode_all()
+        return dict.items(self)
+        
+    def values(self):
+        self._decode_all()
+        return dict.values(self)
+
+
+# Column lists for sent_orders reads. Listings skip the large content/JSON
+# columns; only detail lookups load every column.
+LIGHT_COLUMNS = ("id, order_id, email_subject, sent_at, sent_to, customer_name, "
+                 "order_total, status, created_at")
+FAILED_COLUMNS = (LIGHT_COLUMNS + ", error_message, product_type, tileware_products, "
+                  "laticrete_products, order_data")
+FULL_COLUMNS = (LIGHT_COLUMNS + ", tileware_products, formatted_content, email_uid, "
+                "error_message, raw_email_content, product_type, laticrete_products, "
+                "order_data, duplicate_hits")
+LOG_COLUMNS = "id, order_id, action, details, timestamp"
+
+# update_order_status statements keyed by (sent_to given, error_message given).
+# Fixed strings keep each variant's prepared statement in the sqlite3 cache.
+STATUS_UPDATE_SQL = {
+    (False, False): "UPDATE sent_orders SET status = ? WHERE order_id = ?",
+    (True, False): ("UPDATE sent_orders SET status = ?, sent_to = ?, "
+                    "sent_at = CURRENT_TIMESTAMP WHERE order_id = ?"),
+    (False, True): "UPDATE sent_orders SET status = ?, error_message = ? WHERE order_id = ?",
+    (True, True): ("UPDATE sent_orders SET status = ?, sent_to = ?, "
+                   "sent_at = CURRENT_TIMESTAMP, error_message = ? WHERE order_id = ?"),
+}
+
+
+def _sql(statement: str) -> str:
+    """Normalize a module-level SQL constant once at import time."""
+    return textwrap.dedent(statement).strip()
+
+
+# Statements run after start-up. Building each string once keeps every call on
+# the same sqlite3 statement cache key instead of re-formatting f-strings.
+SELECT_SENT_BY_ORDER_ID_SQL = f"SELECT {LIGHT_COLUMNS} FROM sent_orders WHERE order_id = ?"
+SELECT_DETAILS_BY_ORDER_ID_SQL = f"SELECT {FULL_COLUMNS} FROM sent_orders WHERE order_id = ?"
+SELECT_ORDER_ID_EXISTS_SQL = "SELECT id FROM sent_orders WHERE order_id = ?"
+# get_orders_details appends one "?" per ID in the batch
+SELECT_DETAILS_BY_ORDER_IDS_SQL = f"SELECT {FULL_COLUMNS} FROM sent_orders WHERE order_id IN "
+LIST_SENT_ORDERS_SQL = (f"SELECT {LIGHT_COLUMNS} FROM sent_orders "
+                        "ORDER BY created_ts DESC LIMIT ? OFFSET ?")
+LIST_FAILED_ORDERS_SQL = (f"SELECT {FAILED_COLUMNS} FROM sent_orders "
+                          "WHERE status = 'failed' ORDER BY created_ts DESC LIMIT ?")
+SELECT_ORDER_HISTORY_SQL = (f"SELECT {LOG_COLUMNS} FROM order_processing_log "
+                            "WHERE order_id = ? ORDER BY timestamp DESC")
+SELECT_DAILY_STATS_SQL = ("SELECT day, sent_count, duplicate_count FROM daily_stats "
+                          "WHERE day >= ? ORDER BY day DESC")
+INSERT_LOG_SQL = "INSERT INTO order_processing_log (order_id, action, details) VALUES (?, ?, ?)"
+# Upsert in place: keeps id/created_at and doesn't delete the old row
+UPSERT_SENT_ORDER_SQL = _sql("""
+    INSERT INTO sent_orders (
+        order_id, email_subject, sent_to, customer_name,
+        tileware_products, order_total, formatted_content,
+        email_uid, order_data, created_ts
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))
+    ON CONFLICT(order_id) DO UPDATE SET
+        email_subject = excluded.email_subject,
+        sent_to = excluded.sent_to,
+        customer_name = excluded.customer_name,
+        tileware_products = excluded.tileware_products,
+        order_total = excluded.order_total,
+        formatted_content = excluded.formatted_content,
+        email_uid = excluded.email_uid,
+        order_data = excluded.order_data,
+        status = 'sent',
+        error_message = NULL,
+        sent_at = CURRENT_TIMESTAMP
+""")
+INSERT_FAILED_ORDER_SQL = _sql("""
+    INSERT INTO sent_orders (
+        order_id, email_subject, sent_to, status,
+        error_message, raw_email_content, email_uid,
+        product_type, order_data, customer_name, created_ts
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))
+""")
+ADD_DUPLICATE_HITS_SQL = "UPDATE sent_orders SET duplicate_hits = duplicate_hits + ? WHERE order_id = ?"
+ADD_DAILY_DUPLICATES_SQL = _sql("""
+    INSERT INTO daily_stats (day, duplicate_count) VALUES (?, ?)
+    ON CONFLICT(day) DO UPDATE SET
+        duplicate_count = duplicate_count + excluded.duplicate_count
+""")
+DELETE_OLD_ORDERS_SQL = _sql("""
+    DELETE FROM sent_orders WHERE id IN (
+        SELECT id FROM sent_orders WHERE created_ts < ? LIMIT ?
+    )
+""")
+DELETE_OLD_LOGS_SQL = _sql("""
+    DELETE FROM order_processing_log WHERE id IN (
+        SELECT id FROM order_processing_log WHERE timestamp < ? LIMIT ?
+    )
+""")
+
+# Prepared statements each connection keeps compiled (sqlite3 defaults to 128)
+CACHED_STATEMENTS = 256
+
+# Rows removed per transaction by cleanup_old_records
+DELETE_CHUNK_SIZE = 1000
+
+# Order IDs per IN (...) query in get_orders_details, below SQLite's default
+# host parameter limit of 999
+DETAILS_BATCH_SIZE = 500
+
+# Free pages returned to the filesystem per cleanup (auto_vacuum=INCREMENTAL)
+INCREMENTAL_VACUUM_PAGES = 1000
+
+# Upper bound on order IDs remembered by the in-process duplicate check cache
+SENT_CACHE_SIZE = 8192
+
+# Upper bound on full order rows remembered by get_order_details
+DETAILS_CACHE_SIZE = 1024
+
+# Buffered duplicate hit counts are written once this many accumulate, or
+# DUPLICATE_FLUSH_INTERVAL seconds after the first one, whichever is sooner
+DUPLICATE_FLUSH_THRESHOLD = 20
+DUPLICATE_FLUSH_INTERVAL = 5.0
+
+# Standalone log entries are written by a background thread in batches of up
+# to LOG_BATCH_SIZE; the thread exits after LOG_FLUSH_INTERVAL seconds idle
+LOG_BATCH_SIZE = 500
+LOG_FLUSH_INTERVAL = 0.05
+
+# Maximum number of idle read-only connections kept per tracker
+READ_POOL_SIZE = 4
+
+# Minimum seconds between PRAGMA data_version polls, i.e. how long a row
+# changed by another connection can still be served from the caches
+DATA_VERSION_POLL_INTERVAL = 1.0
+
+# Bumped whenever _init_database gains a new table, column, index or trigger
+SCHEMA_VERSION = 2
+
+# Trackers with open connections, closed at interpreter exit
+_open_trackers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_trackers():
+    """Close the connections of every tracker still alive at exit."""
+    for tracker in list(_open_trackers):
+        tracker.close()
+
 
 class OrderTracker:
     """Track processed orders to prevent duplicate sends."""
     
-    def __init__(self, db_path: str = "order_tracking.db"):
+    def __init__(self, db_path: str = "order_tracking.db", read_pool_size: int = READ_POOL_SIZE):
         """Initialize the order tracker with database."""
         self.db_path = db_path
-        self._lock = threading.Lock()
+        # Serializes use of the single writer connection. Reentrant so helpers like
+        # _log_action can run inside a locked write. Reads never take it; the
+        # data_version poll has its own connection and lock.
+        self._lock = threading.RLock()
+        # Guards the in-process caches and pending hit counts only, never held
+        # across a query
+        self._cache_lock = threading.Lock()
+        # Bumped whenever cached rows are invalidated, so a reader that queried
+        # before a write does not cache what it saw afterwards
+        self._cache_generation = 0
+        # PRAGMA data_version of the watcher connection when the caches were last
+        # validated; it changes whenever any other connection (the admin panel,
+        # another process's tracker, or this tracker's writer) commits
+        self._data_version: Optional[int] = None
+        self._version_conn: Optional[sqlite3.Connection] = None
+        # Held only for the poll itself; a reader that finds it taken skips the poll
+        self._version_lock = threading.Lock()
+        self._version_checked_at = 0.0
+        # (order_id, row) of the last sent order seen, checked before the LRU so
+        # an immediately repeated lookup skips the cache lock and the dict lookup.
+        # Replaced as a whole tuple, so readers always see a consistent pair.
+        self._last_check: Tuple[Optional[str], Optional[Dict[str, Any]]] = (None, None)
+        # order_id -> row of orders known to be sent, most recently used last
+        self._recent_seen: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # order_id -> parsed get_order_details result; misses are never cached
+        # because the admin panel also writes to this database
+        self._details_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Duplicate hits per (UTC day, order_id) not yet written to the database,
+        # and the timer that writes them if the threshold isn't reached first
+        self._pending_hits: "Counter[Tuple[str, str]]" = Counter()
+        self._hit_timer: Optional[threading.Timer] = None
+        # (order_id, action, details) rows waiting for the log writer thread,
+        # which is started on demand and exits once the queue stays empty
+        self._log_queue: "queue.Queue[Tuple[str, str, str]]" = queue.Queue()
+        self._log_thread: Optional[threading.Thread] = None
+        self._log_thread_lock = threading.Lock()
+        
+        # One long-lived writer plus a lazily filled pool of read-only connections.
+        # An in-memory database only exists on its own connection, so it has no readers.
+        self._in_memory = db_path == ":memory:"
+        self._read_uri = None if self._in_memory else f"{Path(db_path).resolve().as_uri()}?mode=ro"
+        self._rw_conn = self._connect()
+        self._read_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=read_pool_size)
+        
         self._init_database()
+        if not self._in_memory:
+            self._version_conn = self._connect(readonly=True)
+            self._data_version = self._read_data_version()
+        _open_trackers.add(self)
+        
+    def _connect(self, readonly: bool = False) -> sqlite3.Connection:
+        """Open a configured connection to the tracking database."""
+        if readonly:
+            conn = sqlite3.connect(self._read_uri, uri=True, timeout=10.0, check_same_thread=False,
+                                   cached_statements=CACHED_STATEMENTS)
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=10.0, check_same_thread=False,
+                                   cached_statements=CACHED_STATEMENTS)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+        
+    def close(self):
+        """Close the writer and all pooled reader connections."""
+        # Once flush() returns the log thread has nothing left to write
+        self.flush()
+        with self._version_lock:
+            if self._version_conn is not None:
+                self._version_conn.close()
+                self._version_conn = None
+        with self._lock:
+            while True:
+                try:
+                    self._read_pool.get_nowait().close()
+                except queue.Empty:
+                    break
+            # Last, so it can checkpoint and remove the WAL
+            self._rw_conn.close()
+        _open_trackers.discard(self)
+        
+    def __del__(self):
+        # Readers must close before the writer so it can checkpoint and remove the WAL
+        try:
+            self.close()
+        except Exception:
+            pass
         
     def _init_database(self):
         """Initialize database tables if they don't exist."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
-            # Enable WAL mode for better concurrency
+            # Page size and auto_vacuum must be set before any table exists
+            cursor.execute("PRAGMA page_count")
+            if cursor.fetchone()[0] == 0:
+                cursor.execute(f"PRAGMA page_size={DB_PAGE_SIZE}")
+                cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                cursor.execute("VACUUM")
+            else:
+                # Existing databases need a one-time full VACUUM to switch modes
+                cursor.execute("PRAGMA auto_vacuum")
+                if cursor.fetchone()[0] != 2:
+                    try:
+                        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                        cursor.execute("VACUUM")
+                        logger.info("Migrated order tracking database to incremental vacuum")
+                    except sqlite3.OperationalError as e:
+                        logger.warning(f"Could not enable incremental vacuum: {e}")
+            
+            # WAL is persistent in the file; only the writer checkpoints
             cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA wal_autocheckpoint=1000")
+            
+            # user_version lives in the file header, so an up-to-date database
+            # skips the table_info scan and DDL below on every start
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] >= SCHEMA_VERSION:
+                logger.info(f"Order tracking database initialized at {self.db_path}")
+                return
+            
+            # Run the whole migration as one transaction so a crash cannot
+            # leave columns half-added with the version already bumped
+            cursor.execute("BEGIN IMMEDIATE")
             
             # Create sent_orders table
             cursor.execute("""
@@ -50,12 +412,15 @@ class OrderTracker:
                     raw_email_content TEXT,
                     product_type TEXT,
                     laticrete_products TEXT,
-                    order_data TEXT
+                    order_data TEXT,
+                    duplicate_hits INTEGER DEFAULT 0,
+                    created_ts INTEGER
                 )
             """)
             
             # Create indexes for performance
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_id ON sent_orders(order_id)")
+            # order_id lookups use the implicit UNIQUE index; the old plain index duplicated it
+            cursor.execute("DROP INDEX IF EXISTS idx_order_id")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON sent_orders(created_at)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_status ON sent_orders(status)")
             
@@ -75,6 +440,17 @@ class OrderTracker:
                 cursor.execute("ALTER TABLE sent_orders ADD COLUMN laticrete_products TEXT")
             if 'order_data' not in columns:
                 cursor.execute("ALTER TABLE sent_orders ADD COLUMN order_data TEXT")
+            if 'duplicate_hits' not in columns:
+                cursor.execute("ALTER TABLE sent_orders ADD COLUMN duplicate_hits INTEGER DEFAULT 0")
+            if 'created_ts' not in columns:
+                # Epoch-seconds copy of created_at for range scans; created_at stays
+                # TEXT because the admin panel reads it directly
+                cursor.execute("ALTER TABLE sent_orders ADD COLUMN created_ts INTEGER")
+                cursor.execute("""
+                    UPDATE sent_orders SET created_ts = CAST(strftime('%s', created_at) AS INTEGER)
+                    WHERE created_ts IS NULL
+                """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_created_ts ON sent_orders(created_ts)")
             
             # Create processing log table
             cursor.execute("""
@@ -87,21 +463,163 @@ class OrderTracker:
                 )
             """)
             
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_log_order_id ON order_processing_log(order_id)")
+            # Serves get_order_history's filter and ordering without a sort step
+            cursor.execute("DROP INDEX IF EXISTS idx_log_order_id")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_log_order_ts "
+                           "ON order_processing_log(order_id, timestamp DESC)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_log_timestamp ON order_processing_log(timestamp)")
             
+            # Per-day rollup read by get_statistics, kept current by triggers
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_stats'")
+            has_daily_stats = cursor.fetchone() is not None
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS daily_stats (
+                    day DATE PRIMARY KEY,
+                    sent_count INTEGER NOT NULL DEFAULT 0,
+                    duplicate_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_daily_stats_insert AFTER INSERT ON sent_orders
+                BEGIN
+                    INSERT INTO daily_stats (day, sent_count) VALUES (DATE(NEW.created_at), 1)
+                    ON CONFLICT(day) DO UPDATE SET sent_count = sent_count + 1;
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_daily_stats_delete AFTER DELETE ON sent_orders
+                BEGIN
+                    UPDATE daily_stats SET sent_count = sent_count - 1
+                    WHERE day = DATE(OLD.created_at);
+                END
+            """)
+            if not has_daily_stats:
+                # Backfill from existing rows. Duplicates come from the old
+                # duplicate_check log entries plus the per-order hit counters.
+                cursor.execute("""
+                    INSERT INTO daily_stats (day, sent_count)
+                    SELECT DATE(created_at), COUNT(*)
+                    FROM sent_orders
+                    GROUP BY DATE(created_at)
+                """)
+                cursor.execute("""
+                    INSERT INTO daily_stats (day, duplicate_count)
+                    SELECT day, SUM(hits) FROM (
+                        SELECT DATE(timestamp) as day, COUNT(*) as hits
+                        FROM order_processing_log
+                        WHERE action = 'duplicate_check' AND details = 'Order already sent'
+                        GROUP BY DATE(timestamp)
+                        UNION ALL
+                        SELECT DATE(created_at), SUM(duplicate_hits)
+                        FROM sent_orders
+                        GROUP BY DATE(created_at)
+                    )
+                    WHERE day IS NOT NULL
+                    GROUP BY day
+                    ON CONFLICT(day) DO UPDATE SET duplicate_count = excluded.duplicate_count
+                """)
+            
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             conn.commit()
             logger.info(f"Order tracking database initialized at {self.db_path}")
             
     @contextmanager
-    def _get_connection(self):
-        """Get database connection with proper cleanup."""
-        conn = sqlite3.connect(self.db_path, timeout=10.0)
-        conn.row_factory = sqlite3.Row
+    def _get_connection(self, readonly: bool = False):
+        """
+        Check out a database connection.
+        
+        Writes get the shared writer connection while holding the lock, and any
+        uncommitted transaction is rolled back if the block raises. Reads borrow a
+        read-only connection from the pool, which WAL lets run beside the writer.
+        """
+        if not readonly or self._in_memory:
+            with self._lock:
+                try:
+                    yield self._rw_conn
+                except Exception:
+                    self._rw_conn.rollback()
+                    raise
+            return
+            
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect(readonly=True)
         try:
             yield conn
         finally:
-            conn.close()
+            try:
+                self._read_pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+            
+    @staticmethod
+    def _cache_put(cache: OrderedDict, order_id: str, row: Dict[str, Any], maxsize: int):
+        """Insert a row into an LRU cache, evicting the oldest entry when full."""
+        cache[order_id] = row
+        cache.move_to_end(order_id)
+        if len(cache) > maxsize:
+            cache.popitem(last=False)
+            
+    def forget_order(self, order_id: str):
+        """
+        Drop an order from this tracker's in-process caches.
+        
+        Call this after changing a sent_orders row outside the tracker. Trackers
+        in other processes notice the change through PRAGMA data_version on
+        their next lookup (see _drop_stale_caches).
+        """
+        with self._cache_lock:
+            self._cache_generation += 1
+            self._last_check = (None, None)
+            self._recent_seen.pop(order_id, None)
+            self._details_cache.pop(order_id, None)
+            
+    def _read_data_version(self) -> int:
+        """Read PRAGMA data_version on the watcher connection; call with _version_lock held."""
+        return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+            
+    def _drop_stale_caches(self):
+        """
+        Clear the in-process caches if another connection has committed since the last check.
+        
+        The admin panel deletes and edits sent_orders rows from its own process, so
+        a cached row can't be trusted without this check. The poll runs at most once
+        per DATA_VERSION_POLL_INTERVAL on a dedicated connection, so lookups never
+        wait on the writer. That connection also sees this tracker's own commits,
+        which costs at most one needless cache refill per interval.
+        """
+        # An in-memory database can't be written to from outside this tracker
+        if self._in_memory:
+            return
+        now = time.monotonic()
+        if now - self._version_checked_at < DATA_VERSION_POLL_INTERVAL:
+            return
+        if not self._version_lock.acquire(blocking=False):
+            # Another thread is polling right now
+            return
+        try:
+            if self._version_conn is None:
+                return
+            self._version_checked_at = now
+            version = self._read_data_version()
+        finally:
+            self._version_lock.release()
+        if version == self._data_version:
+            return
+        with self._cache_lock:
+            self._data_version = version
+            self._cache_generation += 1
+            self._last_check = (None, None)
+            self._recent_seen.clear()
+            self._details_cache.clear()
+            
+    def _cache_if_current(self, cache: OrderedDict, order_id: str, row: Dict[str, Any],
+                          maxsize: int, generation: int):
+        """Cache a row read at the given generation unless an invalidation happened since."""
+        with self._cache_lock:
+            if generation == self._cache_generation:
+                self._cache_put(cache, order_id, row, maxsize)
             
     def has_order_been_sent(self, order_id: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
         """
@@ -113,31 +631,47 @@ class OrderTracker:
         Returns:
             Tuple of (is_sent, order_details)
         """
-        with self._lock:
-            try:
-                with self._get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        SELECT * FROM sent_orders 
-                        WHERE order_id = ?
-                        ORDER BY created_at DESC
-                        LIMIT 1
-                    """, (order_id,))
-                    
-                    row = cursor.fetchone()
-                    if row:
-                        # Convert row to dict
-                        order_details = dict(row)
-                        self._log_action(order_id, "duplicate_check", "Order already sent")
-                        return True, order_details
-                    else:
-                        self._log_action(order_id, "duplicate_check", "Order not found")
-                        return False, None
-                        
-            except Exception as e:
-                logger.error(f"Error checking order {order_id}: {e}")
+        self._drop_stale_caches()
+        last_id, last_row = self._last_check
+        if last_id == order_id:
+            self._count_duplicate_hit(order_id)
+            return True, dict(last_row)
+            
+        with self._cache_lock:
+            cached = self._recent_seen.get(order_id)
+            if cached is not None:
+                self._recent_seen.move_to_end(order_id)
+                self._last_check = (order_id, cached)
+                cached = dict(cached)
+            generation = self._cache_generation
+        if cached is not None:
+            self._count_duplicate_hit(order_id)
+            return True, cached
+            
+        try:
+            with self._get_connection(readonly=True) as conn:
+                cursor = conn.cursor()
+                cursor.execute(SELECT_SENT_BY_ORDER_ID_SQL, (order_id,))
+                
+                row = cursor.fetchone()
+                
+            if row:
+                # Convert row to dict
+                order_details = dict(row)
+                with self._cache_lock:
+                    if generation == self._cache_generation:
+                        cached = dict(order_details)
+                        self._cache_put(self._recent_seen, order_id, cached, SENT_CACHE_SIZE)
+                        self._last_check = (order_id, cached)
+                self._count_duplicate_hit(order_id)
+                return True, order_details
+            else:
                 return False, None
                 
+        except Exception as e:
+            logger.error(f"Error checking order {order_id}: {e}")
+            return False, None
+                
     def mark_order_as_sent(self, order_id: str, email_data: Dict[str, Any], 
                           order_details: Dict[str, Any], formatted_content: str,
                           recipient: str) -> bool:
@@ -154,58 +688,244 @@ class OrderTracker:
         Returns:
             True if successfully recorded, False otherwise
         """
-        with self._lock:
-            try:
+        return self.mark_orders_as_sent_bulk([{
+            'order_id': order_id,
+            'email_data': email_data,
+            'order_details': order_details,
+            'formatted_content': formatted_content,
+            'recipient': recipient
+        }])
+        
+    def mark_orders_as_sent_bulk(self, items: List[Dict[str, Any]]) -> bool:
+        """
+        Mark several orders as sent in a single transaction.
+        
+        Args:
+            items: Dicts with the keyword arguments of mark_order_as_sent
+                (order_id, email_data, order_details, formatted_content, recipient)
+            
+        Returns:
+            True if every order was recorded, False if the batch was rolled back
+        """
+        order_ids = [item['order_id'] for item in items]
+        try:
+            # Serialize outside the lock so other writers aren't blocked on it
+            order_rows = []
+            log_rows = []
+            for item in items:
+                order_id = item['order_id']
+                email_data = item['email_data']
+                order_details = item['order_details']
+                recipient = item['recipient']
+                
+                # Prepare tileware products as JSON
+                products_json = _dumps_json(order_details.get('tileware_products', []))
+                
+                # Store full order data as JSON for Laticrete orders
+                order_data_json = _dumps_json(order_details) if order_id.startswith('LAT-') else None
+                
+                order_rows.append((
+                    order_id,
+                    email_data.get('subject', ''),
+                    recipient,
+                    order_details.get('customer_name', ''),
+                    products_json,
+                    order_details.get('total', ''),
+                    item['formatted_content'],
+                    email_data.get('uid', ''),
+                    order_data_json
+                ))
+                log_rows.append((order_id, "sent", f"Order sent to {recipient}"))
+                
+            with self._lock:
                 with self._get_connection() as conn:
                     cursor = conn.cursor()
-                    
-                    # Prepare tileware products as JSON
-                    products_json = json.dumps(order_details.get('tileware_products', []))
-                    
-                    # Store full order data as JSON for Laticrete orders
-                    order_data_json = json.dumps(order_details) if order_id.startswith('LAT-') else None
-                    
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO sent_orders (
-                            order_id, email_subject, sent_to, customer_name,
-                            tileware_products, order_total, formatted_content,
-                            email_uid, order_data
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        order_id,
-                        email_data.get('subject', ''),
-                        recipient,
-                        order_details.get('customer_name', ''),
-                        products_json,
-                        order_details.get('total', ''),
-                        formatted_content,
-                        email_data.get('uid', ''),
-                        order_data_json
-                    ))
-                    
+                    cursor.executemany(UPSERT_SENT_ORDER_SQL, order_rows)
+                    cursor.executemany(INSERT_LOG_SQL, log_rows)
                     conn.commit()
                     
-                    self._log_action(order_id, "sent", f"Order sent to {recipient}")
+                for order_id in order_ids:
+                    # Drop any stale cached row; the next check reloads it
+                    self.forget_order(order_id)
                     logger.info(f"Order {order_id} marked as sent")
-                    return True
-                    
-            except Exception as e:
+            return True
+            
+        except Exception as e:
+            for order_id in order_ids:
                 logger.error(f"Error marking order {order_id} as sent: {e}")
-                self._log_action(order_id, "error", f"Failed to mark as sent: {e}")
-                return False
+                self._log_action(order_id, "error", f"Failed to mark as sent: {e}", deferred=True)
+            return False
+            
+    def _log_action(self, order_id: str, action: str, details: str,
+                    cursor: Optional[sqlite3.Cursor] = None, deferred: bool = False):
+        """
+        Log an action to the processing log.
+        
+        When the caller passes the cursor of its open write transaction the row is
+        committed together with it. Otherwise it is committed before returning,
+        so callers outside the tracker (the admin panel) can rely on its order
+        relative to their own writes. The tracker's own best-effort entries pass
+        deferred=True to queue the row for the background log thread instead;
+        flush() writes those immediately.
+        """
+        if cursor is not None:
+            cursor.execute(INSERT_LOG_SQL, (order_id, action, details))
+            return
+            
+        if not deferred:
+            try:
+                with self._get_connection() as conn:
+                    conn.execute(INSERT_LOG_SQL, (order_id, action, details))
+                    conn.commit()
+            except Exception as e:
+                logger.error(f"Error logging action: {e}")
+            return
+            
+        with self._log_thread_lock:
+            self._log_queue.put((order_id, action, details))
+            if self._log_thread is None:
+                self._log_thread = threading.Thread(
+                    target=self._run_log_writer, name="order-log-writer", daemon=True
+                )
+                self._log_thread.start()
                 
-    def _log_action(self, order_id: str, action: str, details: str):
-        """Log an action to the processing log."""
+    def _run_log_writer(self):
+        """Write queued log rows in batches until the queue stays empty."""
+        while True:
+            try:
+                batch = [self._log_queue.get(timeout=LOG_FLUSH_INTERVAL)]
+            except queue.Empty:
+                with self._log_thread_lock:
+                    # Re-check under the lock so a row queued right now still
+                    # finds a running writer
+                    if self._log_queue.empty():
+                        self._log_thread = None
+                        return
+                continue
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(self._log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_log_batch(batch)
+            finally:
+                for _ in batch:
+                    self._log_queue.task_done()
+            
+    def _write_log_batch(self, batch: List[Tuple[str, str, str]]):
+        """Insert a batch of log rows in one transaction."""
         try:
             with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO order_processing_log (order_id, action, details)
-                    VALUES (?, ?, ?)
-                """, (order_id, action, details))
+                conn.executemany(INSERT_LOG_SQL, batch)
                 conn.commit()
         except Exception as e:
-            logger.error(f"Error logging action: {e}")
+            logger.error(f"Error logging {len(batch)} actions: {e}")
+            
+    def flush(self):
+        """Write any queued log rows and buffered duplicate hit counts now."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            try:
+                self._write_log_batch(batch)
+            finally:
+                for _ in batch:
+                    self._log_queue.task_done()
+        # Wait for a batch the log thread took before we drained the queue
+        self._log_queue.join()
+        self._flush_duplicate_hits()
+            
+    def _count_duplicate_hit(self, order_id: str):
+        """Count a blocked duplicate and persist the counts once enough accumulate or time passes."""
+        # Same day format as SQLite's DATE('now'), which the other daily_stats writes use
+        day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        with self._cache_lock:
+            self._pending_hits[(day, order_id)] += 1
+            should_flush = sum(self._pending_hits.values()) >= DUPLICATE_FLUSH_THRESHOLD
+            if not should_flush:
+                self._schedule_hit_flush()
+        if should_flush:
+            self._flush_duplicate_hits()
+            
+    def _schedule_hit_flush(self):
+        """Start the flush timer unless one is pending; call with _cache_lock held."""
+        if self._hit_timer is None:
+            self._hit_timer = threading.Timer(DUPLICATE_FLUSH_INTERVAL, self._flush_duplicate_hits)
+            self._hit_timer.daemon = True
+            self._hit_timer.start()
+            
+    def _flush_duplicate_hits(self):
+        """
+        Add the buffered duplicate hit counts to sent_orders and daily_stats in one transaction.
+        
+        If the write fails (e.g. the admin panel holds the database lock) the counts
+        go back into the buffer and are retried on the next flush.
+        """
+        with self._cache_lock:
+            if self._hit_timer is not None:
+                self._hit_timer.cancel()
+                self._hit_timer = None
+            if not self._pending_hits:
+                return
+            pending = self._pending_hits
+            self._pending_hits = Counter()
+        by_order: "Counter[str]" = Counter()
+        by_day: "Counter[str]" = Counter()
+        for (day, order_id), count in pending.items():
+            by_order[order_id] += count
+            by_day[day] += count
+        try:
+            with self._get_connection() as conn:
+                conn.executemany(ADD_DUPLICATE_HITS_SQL,
+                                 [(count, order_id) for order_id, count in by_order.items()])
+                conn.executemany(ADD_DAILY_DUPLICATES_SQL, list(by_day.items()))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Error recording duplicate hits for {len(by_order)} orders, will retry: {e}")
+            with self._cache_lock:
+                self._pending_hits.update(pending)
+                # Closed trackers have no connection left to retry on
+                if self in _open_trackers:
+                    self._schedule_hit_flush()
+                
+    def iter_sent_orders(self, limit: Optional[int] = None, offset: int = 0,
+                         batch_size: int = 500) -> Iterator[sqlite3.Row]:
+        """
+        Stream sent orders, newest first, without materializing the whole result.
+        
+        Rows are fetched batch_size at a time and yielded as sqlite3.Row objects,
+        so exports of the full table run in constant memory. The read connection
+        is held until the iterator is exhausted or closed.
+        
+        Args:
+            limit: Maximum number of orders to yield, or None for all
+            offset: Number of orders to skip
+            batch_size: Rows fetched from SQLite per round trip
+            
+        Yields:
+            One row per order with the listing columns
+        """
+        try:
+            with self._get_connection(readonly=True) as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(LIST_SENT_ORDERS_SQL, (-1 if limit is None else limit, offset))
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        yield from rows
+                finally:
+                    # Ends the read transaction even if the caller stops early
+                    cursor.close()
+                    
+        except Exception as e:
+            logger.error(f"Error retrieving sent orders: {e}")
             
     def get_sent_orders(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """
@@ -218,40 +938,28 @@ class OrderTracker:
         Returns:
             List of order dictionaries
         """
-        try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT * FROM sent_orders 
-                    ORDER BY created_at DESC
-                    LIMIT ? OFFSET ?
-                """, (limit, offset))
-                
-                return [dict(row) for row in cursor.fetchall()]
-                
-        except Exception as e:
-            logger.error(f"Error retrieving sent orders: {e}")
-            return []
+        return [dict(row) for row in self.iter_sent_orders(limit, offset)]
             
     def get_order_details(self, order_id: str) -> Optional[Dict[str, Any]]:
         """Get details for a specific order."""
+        self._drop_stale_caches()
+        with self._cache_lock:
+            cached = self._details_cache.get(order_id)
+            if cached is not None:
+                self._details_cache.move_to_end(order_id)
+                return dict(cached)
+            generation = self._cache_generation
+                
         try:
-            with self._get_connection() as conn:
+            with self._get_connection(readonly=True) as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT * FROM sent_orders 
-                    WHERE order_id = ?
-                """, (order_id,))
+                cursor.execute(SELECT_DETAILS_BY_ORDER_ID_SQL, (order_id,))
                 
                 row = cursor.fetchone()
                 if row:
-                    details = dict(row)
-                    # Parse JSON products
-                    if details.get('tileware_products'):
-                        details['tileware_products'] = json.loads(details['tileware_products'])
-                    # Parse order_data if present
-                    if details.get('order_data'):
-                        details['order_data'] = json.loads(details['order_data'])
+                    details = self._decode_details(row)
+                    self._cache_if_current(self._details_cache, order_id, dict(details),
+                                           DETAILS_CACHE_SIZE, generation)
                     return details
                 return None
                 
@@ -259,18 +967,71 @@ class OrderTracker:
             logger.error(f"Error retrieving order {order_id}: {e}")
             return None
             
+    def get_orders_details(self, order_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get details for several orders, querying the uncached ones in batches.
+        
+        Args:
+            order_ids: Order IDs to look up
+            
+        Returns:
+            Details keyed by order ID; IDs that aren't tracked are left out
+        """
+        self._drop_stale_caches()
+        found = {}
+        missing = []
+        with self._cache_lock:
+            for order_id in dict.fromkeys(order_ids):
+                cached = self._details_cache.get(order_id)
+                if cached is not None:
+                    self._details_cache.move_to_end(order_id)
+                    found[order_id] = dict(cached)
+                else:
+                    missing.append(order_id)
+            generation = self._cache_generation
+        if not missing:
+            return found
+        
+        try:
+            with self._get_connection(readonly=True) as conn:
+                for start in range(0, len(missing), DETAILS_BATCH_SIZE):
+                    batch = missing[start:start + DETAILS_BATCH_SIZE]
+                    placeholders = f"({', '.join('?' * len(batch))})"
+                    for row in conn.execute(SELECT_DETAILS_BY_ORDER_IDS_SQL + placeholders, batch):
+                        details = self._decode_details(row)
+                        self._cache_if_current(self._details_cache, details['order_id'], dict(details),
+                                               DETAILS_CACHE_SIZE, generation)
+                        found[details['order_id']] = details
+            return found
+                
+        except Exception as e:
+            logger.error(f"Error retrieving orders {missing}: {e}")
+            return found
+    
+    @staticmethod
+    def _decode_details(row: sqlite3.Row) -> Dict[str, Any]:
+        """Turn a sent_orders row into a details dict with its JSON and text columns decoded."""
+        details = dict(row)
+        # Parse JSON products
+        if details.get('tileware_products'):
+            details['tileware_products'] = _loads_json(details['tileware_products'])
+        # Parse order_data if present
+        if details.get('order_data'):
+            details['order_data'] = _loads_json(details['order_data'])
+        details['raw_email_content'] = _decompress_text(details.get('raw_email_content'))
+        return details
+            
     def get_order_history(self, order_id: str) -> List[Dict[str, Any]]:
         """Get processing history for an order."""
+        # Make rows still waiting for the log thread visible to this read
+        if self._log_queue.unfinished_tasks:
+            self.flush()
         try:
-            with self._get_connection() as conn:
+            with self._get_connection(readonly=True) as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT * FROM order_processing_log 
-                    WHERE order_id = ?
-                    ORDER BY timestamp DESC
-                """, (order_id,))
+                cursor.execute(SELECT_ORDER_HISTORY_SQL, (order_id,))
                 
-                return [dict(row) for row in cursor.fetchall()]
+                return [dict(row) for row in cursor]
                 
         except Exception as e:
             logger.error(f"Error retrieving order history: {e}")
@@ -280,45 +1041,31 @@ class OrderTracker:
         """
         Get order processing statistics.
         
+        Counts come from the daily_stats rollup, so the window covers whole UTC
+        days: today and the `days` days before it.
+        
         Args:
             days: Number of days to look back
             
         Returns:
             Dictionary with statistics
         """
+        self._flush_duplicate_hits()
         try:
-            with self._get_connection() as conn:
+            with self._get_connection(readonly=True) as conn:
                 cursor = conn.cursor()
                 
-                since_date = datetime.now() - timedelta(days=days)
-                
-                # Total orders sent
-                cursor.execute("""
-                    SELECT COUNT(DISTINCT order_id) as total
-                    FROM sent_orders
-                    WHERE created_at >= ?
-                """, (since_date,))
-                total = cursor.fetchone()['total']
+                # daily_stats days are UTC dates (SQLite's DATE('now'), DATE(created_at))
+                since_day = (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%d')
                 
-                # Orders by day
-                cursor.execute("""
-                    SELECT DATE(created_at) as date, COUNT(*) as count
-                    FROM sent_orders
-                    WHERE created_at >= ?
-                    GROUP BY DATE(created_at)
-                    ORDER BY date DESC
-                """, (since_date,))
-                daily_counts = [dict(row) for row in cursor.fetchall()]
+                # One pass over the daily rollup; totals are summed from the same rows
+                cursor.execute(SELECT_DAILY_STATS_SQL, (since_day,))
+                rows = cursor.fetchall()
                 
-                # Duplicate attempts blocked
-                cursor.execute("""
-                    SELECT COUNT(*) as duplicates
-                    FROM order_processing_log
-                    WHERE action = 'duplicate_check' 
-                    AND details = 'Order already sent'
-                    AND timestamp >= ?
-                """, (since_date,))
-                duplicates = cursor.fetchone()['duplicates']
+                total = sum(row['sent_count'] for row in rows)
+                duplicates = sum(row['duplicate_count'] for row in rows)
+                daily_counts = [{'date': row['day'], 'count': row['sent_count']}
+                                for row in rows if row['sent_count'] > 0]
                 
                 return {
                     'total_orders_sent': total,
@@ -341,39 +1088,52 @@ class OrderTracker:
         Returns:
             Number of records removed
         """
-        with self._lock:
-            try:
-                with self._get_connection() as conn:
-                    cursor = conn.cursor()
-                    
-                    cutoff_date = datetime.now() - timedelta(days=days)
-                    
-                    # Delete old orders
-                    cursor.execute("""
-                        DELETE FROM sent_orders 
-                        WHERE created_at < ?
-                    """, (cutoff_date,))
-                    orders_deleted = cursor.rowcount
-                    
-                    # Delete old log entries
-                    cursor.execute("""
-                        DELETE FROM order_processing_log 
-                        WHERE timestamp < ?
-                    """, (cutoff_date,))
-                    logs_deleted = cursor.rowcount
-                    
-                    conn.commit()
-                    
-                    # Vacuum to reclaim space
-                    cursor.execute("VACUUM")
-                    
-                    total_deleted = orders_deleted + logs_deleted
-                    logger.info(f"Cleaned up {total_deleted} old records")
-                    return total_deleted
-                    
-            except Exception as e:
-                logger.error(f"Error cleaning up old records: {e}")
-                return 0
+        try:
+            cutoff_date = datetime.now() - timedelta(days=days)
+            
+            # Delete old orders, then old log entries
+            orders_deleted = self._delete_in_chunks(DELETE_OLD_ORDERS_SQL, cutoff_date.timestamp())
+            with self._cache_lock:
+                self._cache_generation += 1
+                self._last_check = (None, None)
+                self._recent_seen.clear()
+                self._details_cache.clear()
+                
+            logs_deleted = self._delete_in_chunks(DELETE_OLD_LOGS_SQL, cutoff_date)
+            
+            # Reclaim freed pages in a separate short write instead of rewriting the
+            # file, then truncate the WAL the deletes grew.
+            # executescript steps the pragmas to completion; execute() frees only one page
+            with self._get_connection() as conn:
+                conn.executescript(f"""
+                    PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES});
+                    PRAGMA wal_checkpoint(TRUNCATE);
+                """)
+                
+            total_deleted = orders_deleted + logs_deleted
+            logger.info(f"Cleaned up {total_deleted} old records")
+            return total_deleted
+            
+        except Exception as e:
+            logger.error(f"Error cleaning up old records: {e}")
+            return 0
+            
+    def _delete_in_chunks(self, sql: str, cutoff: Any) -> int:
+        """
+        Run a chunked DELETE until it removes fewer rows than the chunk size.
+        
+        Each chunk commits on its own so other writers can take the lock in between.
+        The statement takes the cutoff (a date or epoch seconds, matching the
+        column it filters) and the chunk size as parameters.
+        """
+        total = 0
+        while True:
+            with self._get_connection() as conn:
+                deleted = conn.execute(sql, (cutoff, DELETE_CHUNK_SIZE)).rowcount
+                conn.commit()
+            total += deleted
+            if deleted < DELETE_CHUNK_SIZE:
+                return total
                 
     def save_failed_order(self, order_id: str, email_data: Dict[str, Any], 
                          error_message: str, product_type: str = None,
@@ -391,48 +1151,45 @@ class OrderTracker:
         Returns:
             True if successfully saved, False otherwise
         """
-        with self._lock:
-            try:
+        try:
+            # Prepare data outside the lock
+            order_data_json = _dumps_json(partial_order_data) if partial_order_data else None
+            raw_email = _compress_text(email_data.get('body', ''))
+            
+            with self._lock:
                 with self._get_connection() as conn:
                     cursor = conn.cursor()
                     
                     # Check if order already exists
-                    cursor.execute("SELECT id FROM sent_orders WHERE order_id = ?", (order_id,))
+                    cursor.execute(SELECT_ORDER_ID_EXISTS_SQL, (order_id,))
                     if cursor.fetchone():
                         logger.warning(f"Order {order_id} already exists in database")
                         return False
                     
-                    # Prepare data
-                    order_data_json = json.dumps(partial_order_data) if partial_order_data else None
-                    
-                    cursor.execute("""
-                        INSERT INTO sent_orders (
-                            order_id, email_subject, sent_to, status,
-                            error_message, raw_email_content, email_uid,
-                            product_type, order_data, customer_name
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
+                    cursor.execute(INSERT_FAILED_ORDER_SQL, (
                         order_id,
                         email_data.get('subject', ''),
                         'pending',  # sent_to is 'pending' for failed orders
                         'failed',
                         error_message,
-                        email_data.get('body', ''),
+                        raw_email,
                         email_data.get('uid', ''),
                         product_type,
                         order_data_json,
                         partial_order_data.get('customer_name', '') if partial_order_data else ''
                     ))
+                    self._log_action(order_id, "failed_save", f"Order saved as failed: {error_message}",
+                                     cursor=cursor)
                     
                     conn.commit()
+                    self.forget_order(order_id)
                     
-                    self._log_action(order_id, "failed_save", f"Order saved as failed: {error_message}")
                     logger.info(f"Failed order {order_id} saved for later processing")
                     return True
                     
-            except Exception as e:
-                logger.error(f"Error saving failed order {order_id}: {e}")
-                return False
+        except Exception as e:
+            logger.error(f"Error saving failed order {order_id}: {e}")
+            return False
                 
     def get_failed_orders(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -445,37 +1202,12 @@ class OrderTracker:
             List of failed order dictionaries
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_connection(readonly=True) as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT * FROM sent_orders 
-                    WHERE status = 'failed'
-                    ORDER BY created_at DESC
-                    LIMIT ?
-                """, (limit,))
+                cursor.execute(LIST_FAILED_ORDERS_SQL, (limit,))
                 
-                orders = []
-                for row in cursor.fetchall():
-                    order = dict(row)
-                    # Parse JSON fields
-                    if order.get('order_data'):
-                        try:
-                            order['order_data'] = json.loads(order['order_data'])
-                        except:
-                            pass
-                    if order.get('tileware_products'):
-                        try:
-                            order['tileware_products'] = json.loads(order['tileware_products'])
-                        except:
-                            pass
-                    if order.get('laticrete_products'):
-                        try:
-                            order['laticrete_products'] = json.loads(order['laticrete_products'])
-                        except:
-                            pass
-                    orders.append(order)
-                    
-                return orders
+                # JSON fields are parsed when first read
+                return [_LazyOrderRow(row) for row in cursor]
                 
         except Exception as e:
             logger.error(f"Error retrieving failed orders: {e}")
@@ -500,30 +1232,25 @@ class OrderTracker:
                 with self._get_connection() as conn:
                     cursor = conn.cursor()
                     
-                    update_fields = ["status = ?"]
                     update_values = [status]
-                    
                     if sent_to:
-                        update_fields.append("sent_to = ?")
                         update_values.append(sent_to)
-                        update_fields.append("sent_at = CURRENT_TIMESTAMP")
-                        
                     if error_message:
-                        update_fields.append("error_message = ?")
                         update_values.append(error_message)
-                        
                     update_values.append(order_id)
                     
-                    cursor.execute(f"""
-                        UPDATE sent_orders 
-                        SET {', '.join(update_fields)}
-                        WHERE order_id = ?
-                    """, update_values)
+                    cursor.execute(STATUS_UPDATE_SQL[(bool(sent_to), bool(error_message))],
+                                   update_values)
+                    
+                    updated = cursor.rowcount > 0
+                    if updated:
+                        self._log_action(order_id, "status_update", f"Status changed to {status}",
+                                         cursor=cursor)
                     
                     conn.commit()
+                    self.forget_order(order_id)
                     
-                    if cursor.rowcount > 0:
-                        self._log_action(order_id, "status_update", f"Status changed to {status}")
+                    if updated:
                         logger.info(f"Order {order_id} status updated to {status}")
                         return True
                     else:
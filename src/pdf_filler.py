@@ -1,56 +1,94 @@
 """
 PDF form filler for Laticrete order forms.
-Fills out PDF order forms with order data using multiple methods for maximum compatibility.
+Fills out PDF order forms with PyMuPDF, falling back to a text overlay.
 """
 
 import os
-from typing import Dict, List, Optional
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 from pathlib import Path
 import logging
 from datetime import datetime
-import tempfile
+import importlib.util
+import io
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
-# Try to import all available PDF libraries
-try:
-    import fitz  # PyMuPDF
-    PYMUPDF_AVAILABLE = True
-except ImportError:
-    PYMUPDF_AVAILABLE = False
-
-try:
-    import pdfrw
-    PDFRW_AVAILABLE = True
-except ImportError:
-    PDFRW_AVAILABLE = False
-
-from pypdf import PdfReader, PdfWriter
-from pypdf.generic import (
-    NameObject, TextStringObject, BooleanObject,
-    DictionaryObject, ArrayObject, NumberObject
-)
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
+# PyMuPDF and ReportLab are slow to import, so they are loaded on first use.
+# Availability is probed without importing.
+PYMUPDF_AVAILABLE = importlib.util.find_spec('fitz') is not None
+fitz = None  # PyMuPDF module, set by _import_fitz()
 
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# pypdf serializes objects in many small writes; buffer them into few syscalls
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# The order form has 13 product rows. Field names per row are built once here
+# rather than formatted for every product of every order.
+MAX_PRODUCT_ROWS = 13
+PRODUCT_ROW_FIELDS = [
+    (f'Quantity OrderedRow{n}', f'DescriptionRow{n}', f'Item NumberRow{n}',
+     f'Unit PriceRow{n}', f'AmountRow{n}')
+    for n in range(1, MAX_PRODUCT_ROWS + 1)
+]
+
+
+def _find_project_root(start: Path) -> Optional[Path]:
+    """Walk up from start to the directory holding main.py and resources/laticrete."""
+    current = start
+    while current != current.parent:
+        if (current / "main.py").exists() and (current / "resources" / "laticrete").exists():
+            return current
+        current = current.parent
+    return None
+
+
+# Located once at import instead of walking the filesystem per filler
+PROJECT_ROOT = _find_project_root(Path(__file__).parent)
+
+# Fill method names accepted by fill_order_form, in the order "auto" tries them
+FILL_METHODS = {
+    "pymupdf": "_fill_with_pymupdf",
+    "overlay": "_overlay_text_on_pdf",
+}
+
+# Strips currency symbols, thousands separators and spaces from a price
+PRICE_STRIP_RE = re.compile(r'[^\d.-]')
+
+
+def _import_fitz():
+    """Import PyMuPDF on first use and return the module."""
+    global fitz
+    if fitz is None:
+        import fitz as _fitz
+        fitz = _fitz
+    return fitz
+
+
+# Filler built once in each fill_order_forms worker process
+_worker_filler = None
+
 
 class PDFOrderFormFiller:
-    """Fills out Laticrete PDF order forms with order data using multiple methods."""
+    """Fills out Laticrete PDF order forms with order data using PyMuPDF."""
+    
+    # Shared by every filler in the process, keyed by resolved template path:
+    # the raw template file, and each form field's (page index, widget xref)
+    _template_bytes: Dict[Path, bytes] = {}
+    _template_widget_index: Dict[Path, Dict[str, Tuple[int, int]]] = {}
     
     def __init__(self, template_path: str = None):
         """Initialize with path to blank order form template."""
+        if not PYMUPDF_AVAILABLE:
+            raise ImportError("PyMuPDF is required to fill PDF order forms (pip install PyMuPDF)")
+        
         if template_path is None:
             # Use absolute path based on project structure
-            from pathlib import Path
-            # Try to find the project root by looking for the main.py file
-            current = Path(__file__).parent
-            while current != current.parent:
-                if (current / "main.py").exists() and (current / "resources" / "laticrete").exists():
-                    template_path = str(current / "resources" / "laticrete" / "lat_blank_orderform.pdf")
-                    break
-                current = current.parent
+            if PROJECT_ROOT is not None:
+                template_path = str(PROJECT_ROOT / "resources" / "laticrete" / "lat_blank_orderform.pdf")
             else:
                 # Fallback to relative path
                 template_path = "resources/laticrete/lat_blank_orderform.pdf"
@@ -58,36 +96,40 @@ class PDFOrderFormFiller:
         self.template_path = Path(template_path)
         if not self.template_path.exists():
             raise FileNotFoundError(f"PDF template not found at {self.template_path}")
+        
+        # Read the blank form once per process instead of once per order
+        self._template_key = self.template_path.resolve()
+        if self._template_key not in PDFOrderFormFiller._template_bytes:
+            PDFOrderFormFiller._template_bytes[self._template_key] = self.template_path.read_bytes()
+        
+        # pypdf reader over the template for the overlay fallback, parsed on first use
+        self._template_reader = None
     
-    def fill_order_form(self, order_data: Dict, output_path: str, method: str = "auto") -> bool:
+    def fill_order_form(self, order_data: Dict, output_path: Union[str, BinaryIO], method: str = "auto",
+                        today_str: Optional[str] = None) -> bool:
         """
-        Fill out PDF order form with order data using the best available method.
+        Fill out PDF order form with order data.
         
         Args:
             order_data: Dictionary containing order information
-            output_path: Path to save filled PDF
-            method: Method to use - "auto", "pymupdf", "pdfrw", "pypdf", or "overlay"
+            output_path: Path to save filled PDF, or a binary stream (e.g. io.BytesIO) to write it into
+            method: Method to use - "auto" (form fields, then overlay), "pymupdf", or "overlay"
+            today_str: Form date as MM/DD/YYYY (defaults to today)
             
         Returns:
             True if successful, False otherwise
         """
+        if today_str is None:
+            today_str = datetime.now().strftime('%m/%d/%Y')
+        
         try:
             if method == "auto":
-                # Try methods in order of reliability
-                methods = []
-                if PYMUPDF_AVAILABLE:
-                    methods.append(("pymupdf", self._fill_with_pymupdf))
-                if PDFRW_AVAILABLE:
-                    methods.append(("pdfrw", self._fill_with_pdfrw))
-                methods.extend([
-                    ("pypdf", self._fill_with_pypdf_improved),
-                    ("overlay", self._overlay_text_on_pdf)
-                ])
-                
-                for method_name, method_func in methods:
+                # Stops at the first success, so a PyMuPDF fill never touches the
+                # overlay path or its ReportLab/pypdf imports
+                for method_name, attr in FILL_METHODS.items():
                     logger.info(f"Trying {method_name} method for PDF filling")
                     try:
-                        if method_func(order_data, output_path):
+                        if getattr(self, attr)(order_data, output_path, today_str):
                             logger.info(f"Successfully filled PDF with {method_name} method")
                             return True
                     except Exception as e:
@@ -98,55 +140,90 @@ class PDFOrderFormFiller:
             
             else:
                 # Use specific method
-                method_map = {
-                    "pymupdf": self._fill_with_pymupdf,
-                    "pdfrw": self._fill_with_pdfrw,
-                    "pypdf": self._fill_with_pypdf_improved,
-                    "overlay": self._overlay_text_on_pdf
-                }
-                
-                if method not in method_map:
+                if method not in FILL_METHODS:
                     logger.error(f"Unknown method: {method}")
                     return False
                 
-                return method_map[method](order_data, output_path)
+                return getattr(self, FILL_METHODS[method])(order_data, output_path, today_str)
             
         except Exception as e:
             logger.error(f"Error filling PDF form: {e}")
             return False
     
-    def _fill_with_pymupdf(self, order_data: Dict, output_path: str) -> bool:
-        """Fill PDF using PyMuPDF which has excellent form field support."""
-        if not PYMUPDF_AVAILABLE:
-            return False
+    def fill_order_forms(self, orders: List[Tuple[Dict, str]],
+                         max_workers: Optional[int] = None) -> List[bool]:
+        """
+        Fill several order forms in parallel worker processes.
         
-        try:
-            # Open the PDF
-            doc = fitz.open(str(self.template_path))
+        Args:
+            orders: (order_data, output_path) pairs
+            max_workers: Worker processes to use (defaults to the CPU count)
             
-            # Get the first page
-            page = doc[0]
+        Returns:
+            One success flag per order, in input order
+        """
+        # One date for the whole batch
+        today_str = datetime.now().strftime('%m/%d/%Y')
+        if len(orders) <= 1:
+            return [self.fill_order_form(order_data, output_path, today_str=today_str)
+                    for order_data, output_path in orders]
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(orders))
+        chunksize = max(1, len(orders) // (4 * workers))
+        try:
+            # Workers get the template bytes up front instead of re-reading the file
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_fill_worker,
+                initargs=(str(self.template_path), self._template_bytes[self._template_key])
+            ) as executor:
+                return list(executor.map(_fill_one_order, orders, repeat(today_str),
+                                         chunksize=chunksize))
+        except Exception as e:
+            logger.error(f"Error filling PDF forms in parallel: {e}")
+            return [False] * len(orders)
+    
+    def _fill_with_pymupdf(self, order_data: Dict, output_path: Union[str, BinaryIO],
+                           today_str: Optional[str] = None) -> bool:
+        """Fill PDF using PyMuPDF which has excellent form field support."""
+        try:
+            # Open the cached template from memory
+            doc = _import_fitz().open(stream=self._template_bytes[self._template_key], filetype="pdf")
             
             # Get form fields
-            widgets = page.widgets()
-            if not widgets:
+            widget_index = self._get_widget_index(doc)
+            if not widget_index:
                 logger.debug("No form fields found with PyMuPDF")
                 doc.close()
                 return False
             
-            # Prepare field mappings
-            field_mappings = self._prepare_field_mappings(order_data)
+            # Prepare field mappings. Empty values would leave the blank field as it
+            # is, so they are dropped rather than regenerating its appearance.
+            field_mappings = {name: value for name, value in self._prepare_field_mappings(order_data, today_str).items()
+                              if value}
+            if not field_mappings:
+                logger.debug("No field values to fill")
+                doc.close()
+                return False
             
-            # Fill the fields
+            # Fill the fields, loading only the widgets that get a value. Pages are
+            # kept referenced because a widget is unbound once its page is freed.
             filled_count = 0
-            for widget in widgets:
-                field_name = widget.field_name
-                if field_name in field_mappings:
-                    value = field_mappings[field_name]
-                    widget.field_value = value
-                    widget.update()
-                    filled_count += 1
-                    logger.debug(f"Filled field: {field_name} = {value}")
+            pages = {}
+            for field_name, value in field_mappings.items():
+                location = widget_index.get(field_name)
+                if location is None:
+                    continue
+                page_index, xref = location
+                if page_index not in pages:
+                    pages[page_index] = doc[page_index]
+                widget = pages[page_index].load_widget(xref)
+                filled_count += 1
+                if widget.field_value == value:
+                    continue
+                widget.field_value = value
+                widget.update()
+                logger.debug("Filled field: %s = %s", field_name, value)
             
             if filled_count == 0:
                 logger.debug("No fields were filled")
@@ -155,340 +232,304 @@ class PDFOrderFormFiller:
             
             logger.info(f"Filled {filled_count} form fields with PyMuPDF")
             
-            # Save the document
-            doc.save(output_path)
+            # Serialize in memory, dropping unused objects and compressing streams,
+            # then write the file in one call; the byte count replaces a stat check
+            pdf_bytes = doc.tobytes(garbage=4, deflate=True, clean=True)
             doc.close()
             
-            # Verify file was created
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-                logger.info(f"Successfully created PDF with PyMuPDF: {output_path}")
-                return True
-            
-            return False
+            if not pdf_bytes:
+                return False
+            if hasattr(output_path, 'write'):
+                output_path.write(pdf_bytes)
+            else:
+                with open(output_path, 'wb') as output_file:
+                    output_file.write(pdf_bytes)
+            logger.info(f"Successfully created PDF with PyMuPDF: {output_path}")
+            return True
             
         except Exception as e:
             logger.debug(f"PyMuPDF method failed: {e}")
             return False
     
-    def _fill_with_pdfrw(self, order_data: Dict, output_path: str) -> bool:
-        """Fill PDF using pdfrw library."""
-        if not PDFRW_AVAILABLE:
-            return False
-            
-        try:
-            # Load the PDF
-            pdf = pdfrw.PdfReader(str(self.template_path))
-            
-            # Get the form fields
-            if not pdf.Root.AcroForm or not pdf.Root.AcroForm.Fields:
-                logger.debug("No form fields found in PDF")
-                return False
-            
-            fields = pdf.Root.AcroForm.Fields
-            
-            # Prepare field mappings
-            field_mappings = self._prepare_field_mappings(order_data)
-            
-            # Fill the fields
-            filled_count = 0
-            for field in fields:
-                field_name = field.T
-                if field_name and field_name[1:-1] in field_mappings:
-                    clean_name = field_name[1:-1]
-                    value = field_mappings[clean_name]
-                    
-                    # Set the field value
-                    field.V = pdfrw.objects.pdfstring.PdfString.encode(value)
-                    
-                    # Clear existing appearance to force regeneration
-                    field.AP = None
-                    filled_count += 1
-                    logger.debug(f"Filled field: {clean_name} = {value}")
-            
-            if filled_count == 0:
-                logger.debug("No fields were filled")
-                return False
-            
-            logger.info(f"Filled {filled_count} form fields with pdfrw")
-            
-            # Set NeedAppearances to ensure fields are rendered
-            pdf.Root.AcroForm.NeedAppearances = pdfrw.PdfObject('true')
-            
-            # Write the output
-            pdfrw.PdfWriter().write(output_path, pdf)
-            
-            # Verify file was created
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-                logger.info(f"Successfully created PDF with pdfrw: {output_path}")
-                return True
-            
-            return False
-            
-        except Exception as e:
-            logger.debug(f"pdfrw method failed: {e}")
-            return False
+    def _get_widget_index(self, doc) -> Dict[str, Tuple[int, int]]:
+        """Map each form field name to its page and widget xref, scanning the template once."""
+        index = PDFOrderFormFiller._template_widget_index.get(self._template_key)
+        if index is None:
+            index = {}
+            for page in doc:
+                for widget in page.widgets():
+                    index.setdefault(widget.field_name, (page.number, widget.xref))
+            PDFOrderFormFiller._template_widget_index[self._template_key] = index
+        return index
     
-    def _fill_with_pypdf_improved(self, order_data: Dict, output_path: str) -> bool:
-        """Fill PDF using improved pypdf approach."""
-        try:
-            reader = PdfReader(self.template_path)
-            writer = PdfWriter()
-            
-            # Clone the entire document
-            writer.clone_reader_document_root(reader)
-            
-            # Check for AcroForm
-            if '/AcroForm' not in writer._root_object:
-                logger.debug("No AcroForm found in PDF")
-                return False
-            
-            # Set NeedAppearances to true
-            writer._root_object['/AcroForm'][NameObject('/NeedAppearances')] = BooleanObject(True)
-            
-            # Prepare field mappings
-            field_mappings = self._prepare_field_mappings(order_data)
-            
-            # Get all fields
-            fields = writer._root_object['/AcroForm'].get('/Fields', [])
-            filled_count = 0
-            
-            for field_ref in fields:
-                try:
-                    field_obj = field_ref.get_object()
-                    
-                    if '/T' in field_obj:
-                        field_name = str(field_obj['/T'])
-                        
-                        if field_name in field_mappings:
-                            value = field_mappings[field_name]
-                            
-                            # Update the field value
-                            field_obj.update({
-                                NameObject("/V"): TextStringObject(value)
-                            })
-                            
-                            # Remove existing appearance
-                            if '/AP' in field_obj:
-                                del field_obj['/AP']
-                            
-                            # Clear read-only flag if present
-                            if '/Ff' in field_obj:
-                                flags = field_obj['/Ff']
-                                field_obj[NameObject('/Ff')] = NumberObject(flags & ~1)
-                            
-                            filled_count += 1
-                            logger.debug(f"Filled field: {field_name} = {value}")
-                            
-                except Exception as e:
-                    logger.debug(f"Error filling field: {e}")
-            
-            if filled_count == 0:
-                logger.debug("No fields were filled")
-                return False
-            
-            logger.info(f"Filled {filled_count} form fields with pypdf")
-            
-            # Write the output
-            with open(output_path, 'wb') as output_file:
-                writer.write(output_file)
-            
-            # Verify file was created
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-                logger.info(f"Successfully created PDF with pypdf: {output_path}")
-                return True
-            
-            return False
-            
-        except Exception as e:
-            logger.debug(f"pypdf method failed: {e}")
-            return False
+    def _select_address(self, order_data: Dict) -> Dict:
+        """Return the shipping address, falling back to billing if shipping is not available."""
+        shipping_address = order_data.get('shipping_address') or {}
+        if shipping_address.get('street'):
+            return shipping_address
+        
+        billing_address = order_data.get('billing_address') or {}
+        if billing_address.get('street'):
+            logger.info("Using billing address for PDF as shipping address not available")
+            return billing_address
+        
+        # Fallback to empty address
+        return {}
     
-    def _prepare_field_mappings(self, order_data: Dict) -> Dict[str, str]:
+    def _prepare_field_mappings(self, order_data: Dict,
+                                today_str: Optional[str] = None) -> Dict[str, str]:
         """Prepare the field mappings from order data."""
-        # Get address, falling back to billing if shipping not available
-        shipping_address = order_data.get('shipping_address', {})
-        billing_address = order_data.get('billing_address', {})
-        
-        # Use billing address if shipping is not available or empty
-        if not shipping_address or not shipping_address.get('street'):
-            if billing_address and billing_address.get('street'):
-                logger.info("Using billing address for PDF as shipping address not available")
-                address = billing_address
-            else:
-                # Fallback to empty address
-                address = {}
-        else:
-            address = shipping_address
+        address = self._select_address(order_data)
+        order_id = order_data.get('order_id', '')
+        customer_name = order_data.get('customer_name', '')
         
         # Basic field mappings
         field_mappings = {
-            'DATE': datetime.now().strftime('%m/%d/%Y'),
-            'O': order_data.get('order_id', ''),
-            'S 1': order_data.get('customer_name', ''),
+            'DATE': today_str or datetime.now().strftime('%m/%d/%Y'),
+            'O': order_id,
+            'S 1': customer_name,
             'S 2': address.get('street', ''),
             'S 3': f"{address.get('city', '')}, {address.get('state', '')} {address.get('zip', '')}",
             'S 4': '',
-            'Contact name': order_data.get('customer_name', ''),
+            'Contact name': customer_name,
             'Phone': order_data.get('phone', ''),
-            'Special Instructions 1': f"Tile Pro Depot Order #{order_data.get('order_id', '')}",
+            'Special Instructions 1': f"Tile Pro Depot Order #{order_id}",
             'Special Instructions 2': f"Ship via: {order_data.get('shipping_method', 'Standard')}",
         }
         
         # Add product lines
         products = order_data.get('laticrete_products', [])
-        for i, product in enumerate(products[:13]):  # Form has 13 product rows
-            row_num = i + 1
-            field_mappings.update({
-                f'Quantity OrderedRow{row_num}': str(product.get('quantity', '')),
-                f'DescriptionRow{row_num}': product.get('name', ''),
-                f'Item NumberRow{row_num}': product.get('sku', ''),
-                f'Unit PriceRow{row_num}': product.get('list_price', product.get('price', '')),
-                f'AmountRow{row_num}': self._calculate_amount(product.get('quantity', 0), product.get('list_price', product.get('price', '0')))
-            })
+        for fields, product in zip(PRODUCT_ROW_FIELDS, products):
+            qty_field, desc_field, sku_field, price_field, amount_field = fields
+            unit_price = product.get('list_price', product.get('price'))
+            field_mappings[qty_field] = str(product.get('quantity', ''))
+            field_mappings[desc_field] = product.get('name', '')
+            field_mappings[sku_field] = product.get('sku', '')
+            field_mappings[price_field] = '' if unit_price is None else unit_price
+            field_mappings[amount_field] = self._calculate_amount(
+                product.get('quantity', 0), '0' if unit_price is None else unit_price
+            )
         
         return field_mappings
     
     def _calculate_amount(self, quantity, unit_price):
         """Calculate total amount from quantity and unit price."""
         try:
-            # Remove $ and commas from price
-            price_str = str(unit_price).replace('$', '').replace(',', '')
-            price = float(price_str)
-            total = quantity * price
-            return f"${total:,.2f}"
-        except:
+            price = float(PRICE_STRIP_RE.sub('', str(unit_price)))
+            return f"${quantity * price:,.2f}"
+        except (ValueError, TypeError):
+            # Unparseable price, or a quantity that is not a number
             return ""
     
-    def _overlay_text_on_pdf(self, order_data: Dict, output_path: str) -> bool:
+    def _overlay_text_on_pdf(self, order_data: Dict, output_path: Union[str, BinaryIO],
+                             today_str: Optional[str] = None) -> bool:
         """Overlay text on PDF as a fallback method."""
         try:
-            # Get address, falling back to billing if shipping not available
-            shipping_address = order_data.get('shipping_address', {})
-            billing_address = order_data.get('billing_address', {})
-            
-            # Use billing address if shipping is not available or empty
-            if not shipping_address or not shipping_address.get('street'):
-                if billing_address and billing_address.get('street'):
-                    logger.info("Using billing address for PDF overlay as shipping address not available")
-                    address = billing_address
-                else:
-                    # Fallback to empty address
-                    address = {}
-            else:
-                address = shipping_address
-            
-            # Create a temporary PDF with the text
-            temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-            temp_pdf.close()
-            
-            # Create canvas for overlay
-            c = canvas.Canvas(temp_pdf.name, pagesize=letter)
-            
-            # Set font
-            c.setFont("Helvetica", 10)
-            
-            # Based on the screenshot, adjust positions:
-            # Date (top right area - after "DATE" label)
-            c.drawString(520, 645, datetime.now().strftime('%m/%d/%Y'))
-            
-            # Order number (left side - after "Order #:")
-            c.drawString(180, 625, order_data.get('order_id', ''))
-            
-            # Bill To section (left side)
-            c.drawString(140, 585, order_data.get('customer_name', ''))
-            c.drawString(100, 565, order_data.get('customer_name', ''))  # Company name
-            c.drawString(100, 550, address.get('street', ''))
-            c.drawString(100, 535, f"{address.get('city', '')}, {address.get('state', '')} {address.get('zip', '')}")
-            
-            # Phone number (left side - after "Tel. No.")
-            c.drawString(150, 510, order_data.get('phone', ''))
-            
-            # Ship To section (right side)
-            c.drawString(365, 585, order_data.get('customer_name', ''))
-            c.drawString(365, 565, address.get('street', ''))
-            c.drawString(365, 550, f"{address.get('city', '')}, {address.get('state', '')} {address.get('zip', '')}")
-            
-            # Contact name and phone (right bottom section)
-            c.drawString(450, 510, order_data.get('customer_name', ''))
-            c.drawString(470, 495, order_data.get('phone', ''))
+            # ReportLab is only needed on this fallback path
+            from reportlab.pdfgen import canvas
+            from reportlab.lib.pagesizes import letter
             
-            # Product details table
-            y_start = 425  # First product row
-            row_height = 26.5  # Space between rows based on form
+            # Render the overlay page in memory; it is only read back for the merge
+            overlay_buffer = io.BytesIO()
+            c = canvas.Canvas(overlay_buffer, pagesize=letter)
+            self._draw_overlay(c, order_data, today_str)
             
-            products = order_data.get('laticrete_products', [])
-            
-            c.setFont("Helvetica", 9)
-            for i, product in enumerate(products[:13]):  # Max 13 rows on form
-                y_pos = y_start - (i * row_height)
-                
-                # Quantity (left column)
-                c.drawString(65, y_pos, str(product.get('quantity', '')))
-                
-                # Description (wide column)
-                name = product.get('name', '')[:45]  # Truncate long names
-                if product.get('needs_verification'):
-                    name += ' *'
-                c.drawString(170, y_pos, name)
-                
-                # Item Number/SKU (middle column)
-                c.drawString(450, y_pos, product.get('sku', ''))
-                
-                # Unit Price (right columns)
-                c.drawString(520, y_pos, product.get('list_price', product.get('price', '')))
-                
-                # Amount (far right - removed as it exceeds page width)
-                # amount = self._calculate_amount(product.get('quantity', 0), product.get('price', '0'))
-                # c.drawString(550, y_pos, amount)
+            # Save overlay
+            c.save()
+            overlay_buffer.seek(0)
             
-            # Special instructions (lower on page)
-            c.setFont("Helvetica", 8)
-            c.drawString(100, 90, f"Tile Pro Depot Order #{order_data.get('order_id', '')}")
-            c.drawString(100, 75, f"Ship via: {order_data.get('shipping_method', 'Standard')}")
+            # pypdf is only needed on this fallback path, so it is not imported with the module
+            from pypdf import PdfReader
+            self._write_overlaid_template(PdfReader(overlay_buffer).pages[0], output_path)
+            logger.info(f"Successfully created PDF with overlay method: {output_path}")
+            return True
             
-            # Add verification note if any products need it
-            if any(p.get('needs_verification') for p in products):
-                c.drawString(100, 60, "* Product requires manual price verification")
+        except Exception as e:
+            logger.error(f"Overlay method failed: {e}")
+            return False
+    
+    def overlay_order_forms(self, orders: List[Tuple[Dict, str]],
+                            today_str: Optional[str] = None) -> List[bool]:
+        """
+        Fill several order forms with the text overlay, sharing one canvas.
+        
+        Every overlay is drawn as a page of a single ReportLab document, so the
+        canvas and font setup is paid once per batch, then each page is merged
+        onto its own copy of the template.
+        
+        Args:
+            orders: (order_data, output_path) pairs
+            today_str: Form date as MM/DD/YYYY (defaults to today)
             
-            # Requested by / Email fields at bottom
-            c.drawString(210, 30, "Tile Pro Depot")
-            c.drawString(510, 30, "orders@tileprodepot.com")
+        Returns:
+            One success flag per order, in input order
+        """
+        if today_str is None:
+            today_str = datetime.now().strftime('%m/%d/%Y')
+        results = [False] * len(orders)
+        
+        try:
+            from reportlab.pdfgen import canvas
+            from reportlab.lib.pagesizes import letter
             
-            # Save overlay
+            overlay_buffer = io.BytesIO()
+            c = canvas.Canvas(overlay_buffer, pagesize=letter)
+            drawn = []
+            for order_data, _ in orders:
+                try:
+                    self._draw_overlay(c, order_data, today_str)
+                    drawn.append(True)
+                except Exception as e:
+                    logger.error(f"Overlay drawing failed for order {order_data.get('order_id', '')}: {e}")
+                    drawn.append(False)
+                # Always end the page so page i stays aligned with order i
+                c.showPage()
             c.save()
+            overlay_buffer.seek(0)
+            
+            from pypdf import PdfReader
+            overlay_pages = PdfReader(overlay_buffer).pages
+            for i, (_, output_path) in enumerate(orders):
+                if not drawn[i]:
+                    continue
+                try:
+                    self._write_overlaid_template(overlay_pages[i], output_path)
+                    results[i] = True
+                except Exception as e:
+                    logger.error(f"Overlay method failed for {output_path}: {e}")
+                    
+        except Exception as e:
+            logger.error(f"Overlay batch failed: {e}")
+        
+        return results
+    
+    def _draw_overlay(self, c, order_data: Dict, today_str: Optional[str] = None):
+        """Draw one order's overlay text onto the current page of a ReportLab canvas."""
+        # Get address, falling back to billing if shipping not available
+        address = self._select_address(order_data)
+        customer_name = order_data.get('customer_name', '')
+        phone = order_data.get('phone', '')
+        
+        # One text object per font size: each becomes a single BT/ET block
+        # instead of one per string
+        text = c.beginText()
+        text.setFont("Helvetica", 10)
+        
+        def put(obj, x, y, value):
+            obj.setTextOrigin(x, y)
+            obj.textOut(value)
+        
+        # Based on the screenshot, adjust positions:
+        # Date (top right area - after "DATE" label)
+        put(text, 520, 645, today_str or datetime.now().strftime('%m/%d/%Y'))
+        
+        # Order number (left side - after "Order #:")
+        put(text, 180, 625, order_data.get('order_id', ''))
+        
+        # Bill To section (left side)
+        city_line = f"{address.get('city', '')}, {address.get('state', '')} {address.get('zip', '')}"
+        put(text, 140, 585, customer_name)
+        put(text, 100, 565, customer_name)  # Company name
+        put(text, 100, 550, address.get('street', ''))
+        put(text, 100, 535, city_line)
+        
+        # Phone number (left side - after "Tel. No.")
+        put(text, 150, 510, phone)
+        
+        # Ship To section (right side)
+        put(text, 365, 585, customer_name)
+        put(text, 365, 565, address.get('street', ''))
+        put(text, 365, 550, city_line)
+        
+        # Contact name and phone (right bottom section)
+        put(text, 450, 510, customer_name)
+        put(text, 470, 495, phone)
+        c.drawText(text)
+        
+        # Product details table
+        y_start = 425  # First product row
+        row_height = 26.5  # Space between rows based on form
+        
+        products = order_data.get('laticrete_products', [])
+        
+        rows = c.beginText()
+        rows.setFont("Helvetica", 9)
+        for i, product in enumerate(products[:MAX_PRODUCT_ROWS]):
+            y_pos = y_start - (i * row_height)
             
-            # Merge with original PDF
-            # Read both PDFs
-            original = PdfReader(self.template_path)
-            overlay = PdfReader(temp_pdf.name)
-            writer = PdfWriter()
+            get = product.get
             
-            # Merge first page
-            page = original.pages[0]
-            page.merge_page(overlay.pages[0])
-            writer.add_page(page)
+            # Quantity (left column)
+            put(rows, 65, y_pos, str(get('quantity', '')))
             
-            # Add remaining pages if any
-            for i in range(1, len(original.pages)):
-                writer.add_page(original.pages[i])
+            # Description (wide column)
+            name = get('name', '')[:45]  # Truncate long names
+            if get('needs_verification'):
+                name += ' *'
+            put(rows, 170, y_pos, name)
             
-            # Write output
-            with open(output_path, 'wb') as output_file:
-                writer.write(output_file)
+            # Item Number/SKU (middle column)
+            put(rows, 450, y_pos, get('sku', ''))
             
-            logger.info(f"Successfully created PDF with overlay method: {output_path}")
-            return True
+            # Unit Price (right columns)
+            put(rows, 520, y_pos, get('list_price', get('price', '')))
             
-        except Exception as e:
-            logger.error(f"Overlay method failed: {e}")
-            return False
-        finally:
-            # Clean up temp file
-            if 'temp_pdf' in locals():
-                try:
-                    os.unlink(temp_pdf.name)
-                except:
-                    pass
+            # Amount (far right - removed as it exceeds page width)
+        c.drawText(rows)
+        
+        # Special instructions (lower on page)
+        notes = c.beginText()
+        notes.setFont("Helvetica", 8)
+        put(notes, 100, 90, f"Tile Pro Depot Order #{order_data.get('order_id', '')}")
+        put(notes, 100, 75, f"Ship via: {order_data.get('shipping_method', 'Standard')}")
+        
+        # Add verification note if any products need it
+        if any(p.get('needs_verification') for p in products):
+            put(notes, 100, 60, "* Product requires manual price verification")
+        
+        # Requested by / Email fields at bottom
+        put(notes, 210, 30, "Tile Pro Depot")
+        put(notes, 510, 30, "orders@tileprodepot.com")
+        c.drawText(notes)
+    
+    def _write_overlaid_template(self, overlay_page, output_path: Union[str, BinaryIO]):
+        """Merge a rendered overlay page (a pypdf page) onto the template and write it out."""
+        from pypdf import PdfReader, PdfWriter
+        
+        # The template is parsed once and reused; add_page copies its pages
+        # into the writer, so merging leaves the cache untouched
+        if self._template_reader is None:
+            self._template_reader = PdfReader(io.BytesIO(self._template_bytes[self._template_key]))
+        original = self._template_reader
+        writer = PdfWriter()
+        
+        # Merge first page
+        page = writer.add_page(original.pages[0])
+        page.merge_page(overlay_page)
+        
+        # Add remaining pages if any
+        for i in range(1, len(original.pages)):
+            writer.add_page(original.pages[i])
+        
+        # Write output; streams are written in place and left open for the caller
+        if hasattr(output_path, 'write'):
+            writer.write(output_path)
+            return
+        with open(output_path, 'wb', buffering=OUTPUT_BUFFER_SIZE) as output_file:
+            writer.write(output_file)
+
+
+def _init_fill_worker(template_path: str, template_bytes: bytes):
+    """Set up a fill_order_forms worker with the parent's template bytes."""
+    global _worker_filler
+    PDFOrderFormFiller._template_bytes[Path(template_path).resolve()] = template_bytes
+    _worker_filler = PDFOrderFormFiller(template_path)
+
+
+def _fill_one_order(order: Tuple[Dict, str], today_str: str) -> bool:
+    """Fill a single (order_data, output_path) pair in a worker process."""
+    order_data, output_path = order
+    return _worker_filler.fill_order_form(order_data, output_path, today_str=today_str)
 
 
 if __name__ == "__main__":
@@ -3,16 +3,88 @@ Price list reader for Laticrete products.
 Parses Excel price list to match products with pricing information.
 """
 
-import pandas as pd
+from __future__ import annotations
+
+import heapq
+import importlib.util
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import logging
 import re
+import threading
 from difflib import SequenceMatcher
 from src.utils.logger import setup_logger
 
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
 logger = setup_logger(__name__)
 
+# pandas (and numpy with it) is slow to import, so it is loaded when a price
+# list is first read rather than when this module is imported.
+pd = None  # pandas module, set by _import_pandas()
+np = None  # numpy module, set by _import_pandas()
+
+
+def _import_pandas():
+    """Import pandas and numpy on first use and return pandas."""
+    global pd, np
+    if pd is None:
+        import numpy as _np
+        import pandas as _pd
+        np = _np
+        pd = _pd
+    return pd
+
+
+# Optional faster Excel reader and the Parquet cache written next to the price list
+CALAMINE_AVAILABLE = importlib.util.find_spec('python_calamine') is not None
+PARQUET_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+# Map common column names (updated for Laticrete Excel)
+COLUMN_MAPPINGS = {
+    'sku': ['LATICRETE Item No', 'SKU', 'Item #', 'Item Number', 'Product Code', 'Part Number'],
+    'name': ['Description', 'Product', 'Product Name', 'Item Description'],
+    'price': ['Price', 'List Price', 'Unit Price', 'Cost'],
+    'unit': ['Unit', 'UOM', 'Unit of Measure'],
+    'category': ['Category', 'Product Category', 'Type'],
+    'brand': ['Brand'],
+    'size': ['Unit Size'],
+    'weight': ['Unit Weight']
+}
+# Every column named above; the rest are passed through as extra info
+MAPPED_COLUMNS = frozenset(col for cols in COLUMN_MAPPINGS.values() for col in cols)
+
+# rapidfuzz scores (0-100) below this can't be a 0.6 SequenceMatcher match; kept
+# under 60 so float rounding never drops a row right at the threshold
+FUZZY_PREFILTER_CUTOFF = 59
+# Slack when comparing a rapidfuzz bound with a SequenceMatcher score
+FUZZY_BOUND_TOLERANCE = 1e-9
+
+# Columns searched by the exact SKU match, in priority order
+EXACT_SKU_COLUMNS = ['LATICRETE Item No', 'SKU', 'Item #', 'Item Number', 'Product Code', 'Part Number']
+
+# Columns searched by the partial SKU match, in priority order
+PARTIAL_SKU_COLUMNS = ['LATICRETE Item No', 'SKU']
+
+# Patterns used inside the per-row matching loops
+_TOKEN_RE = re.compile(r'\d+|[A-Z]+')
+_NONALNUM_RE = re.compile(r'[^A-Z0-9]')
+_DIM_RE = re.compile(r'\d+[xX]\d+')
+
+# Cap on remembered keyword -> matching rows lookups before the memo is reset
+KEYWORD_POSTINGS_MAX = 4096
+
+# Resolved price list path -> (file mtime, reader) for PriceListReader.shared()
+_shared_readers: Dict[str, Tuple[int, 'PriceListReader']] = {}
+_shared_readers_lock = threading.Lock()
+
+# Columns searched by the exact name match, in priority order
+NAME_COLUMNS = ['Description', 'Product', 'Product Name', 'Brand']
+
 
 class PriceListReader:
     """Reads and searches Laticrete price list Excel file."""
@@ -20,34 +92,85 @@ class PriceListReader:
     def __init__(self, price_list_path: str = None):
         """Initialize with path to price list Excel file."""
         if price_list_path is None:
-            # Use absolute path based on project structure
-            from pathlib import Path
-            # Try to find the project root by looking for the main.py file
-            current = Path(__file__).parent
-            while current != current.parent:
-                if (current / "main.py").exists() and (current / "resources" / "laticrete").exists():
-                    price_list_path = str(current / "resources" / "laticrete" / "lat_price_list.xlsx")
-                    break
-                current = current.parent
-            else:
-                # Fallback to relative path
-                price_list_path = "resources/laticrete/lat_price_list.xlsx"
+            price_list_path = self._default_price_list_path()
         
         self.price_list_path = Path(price_list_path)
         self.price_data = None
+        # Column name -> {stripped SKU: first row position}, built when the list is loaded
+        self._exact_skus: Dict[str, Dict[str, int]] = {}
+        # Column name -> per-row sets of SKU tokens
+        self._sku_tokens: Dict[str, List[frozenset]] = {}
+        # "Brand Description" per row for the exact name match
+        self._combined_names: Optional[pd.Series] = None
+        # _search_texts as plain lists, scored in bulk by the rapidfuzz prefilter
+        self._fuzzy_choices: Dict[str, List[str]] = {}
+        # Column name -> upper-cased row texts scored by _find_alternatives
+        self._alternative_texts: Dict[str, List[str]] = {}
+        # Column name -> upper-cased row texts searched by _find_by_keywords
+        self._search_texts: Dict[str, pd.Series] = {}
+        # (column, keyword) -> positions of the rows whose text contains the keyword
+        self._keyword_postings: Dict[Tuple[str, str], np.ndarray] = {}
+        # Column name -> (upper-cased trigram -> row positions, rows that must always be checked)
+        self._name_trigrams: Dict[str, Tuple[Dict[str, frozenset], List[int]]] = {}
+        # Row position -> product info dict, filled as rows are returned
+        self._product_info_cache: Dict[int, Dict] = {}
         self.load_price_list()
     
+    @staticmethod
+    def _default_price_list_path() -> str:
+        """Path to the bundled price list, found from the project root."""
+        # Try to find the project root by looking for the main.py file
+        current = Path(__file__).parent
+        while current != current.parent:
+            if (current / "main.py").exists() and (current / "resources" / "laticrete").exists():
+                return str(current / "resources" / "laticrete" / "lat_price_list.xlsx")
+            current = current.parent
+        # Fallback to relative path
+        return "resources/laticrete/lat_price_list.xlsx"
+    
+    @classmethod
+    def shared(cls, price_list_path: str = None) -> PriceListReader:
+        """
+        Reader for a price list that is reused by every caller in this process.
+        
+        The file is parsed again only when its modification time changes, so
+        code that builds a processor per order doesn't reload it each time.
+        
+        Args:
+            price_list_path: Price list Excel file, defaults to the bundled one
+            
+        Returns:
+            Loaded PriceListReader
+        """
+        path = Path(price_list_path or cls._default_price_list_path())
+        key = str(path.resolve())
+        with _shared_readers_lock:
+            try:
+                mtime = path.stat().st_mtime_ns
+            except OSError:
+                # Missing file: let the constructor raise its usual error
+                return cls(str(path))
+            cached = _shared_readers.get(key)
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, cls(str(path)))
+                _shared_readers[key] = cached
+            return cached[1]
+    
     def load_price_list(self):
         """Load price list from Excel file."""
+        _import_pandas()
         try:
             if not self.price_list_path.exists():
                 raise FileNotFoundError(f"Price list not found at {self.price_list_path}")
             
-            # Read Excel file, skip header rows
-            self.price_data = pd.read_excel(self.price_list_path, skiprows=4)
+            self.price_data = self._read_price_list()
             # Filter out rows with no description
             self.price_data = self.price_data[self.price_data['Description'].notna() & 
                                               (self.price_data['Description'] != 'No Data')]
+            # Number rows by position so matches can be cached by index
+            self.price_data = self.price_data.reset_index(drop=True)
+            self._product_info_cache = {}
+            self._build_match_indexes()
             logger.info(f"Loaded price list with {len(self.price_data)} items")
             logger.debug(f"Columns: {list(self.price_data.columns)}")
             
@@ -55,6 +178,89 @@ class PriceListReader:
             logger.error(f"Error loading price list: {e}")
             raise
     
+    def _read_price_list(self) -> pd.DataFrame:
+        """Read the raw price list, from the Parquet cache when it is up to date."""
+        cache_path = self.price_list_path.with_suffix('.parquet')
+        if (PARQUET_AVAILABLE and cache_path.exists() and
+                cache_path.stat().st_mtime >= self.price_list_path.stat().st_mtime):
+            logger.debug(f"Reading cached price list from {cache_path}")
+            return pd.read_parquet(cache_path)
+        
+        # Read Excel file, skip header rows
+        engine = 'calamine' if CALAMINE_AVAILABLE else None
+        data = pd.read_excel(self.price_list_path, skiprows=4, engine=engine)
+        
+        if PARQUET_AVAILABLE:
+            try:
+                data.to_parquet(cache_path, compression='zstd')
+            except Exception as e:
+                logger.warning(f"Could not cache price list at {cache_path}: {e}")
+        return data
+    
+    def _build_match_indexes(self):
+        """Precompute the per-row text the matchers search so lookups don't rebuild it."""
+        columns = self.price_data.columns
+        
+        self._exact_skus = {}
+        for col in EXACT_SKU_COLUMNS:
+            if col in columns:
+                positions = {}
+                for position, value in enumerate(self.price_data[col].astype(str).str.strip()):
+                    positions.setdefault(value, position)
+                self._exact_skus[col] = positions
+        
+        self._sku_tokens = {}
+        for col in PARTIAL_SKU_COLUMNS:
+            if col in columns:
+                tokens = self.price_data[col].astype(str).str.strip().str.upper().str.findall(_TOKEN_RE)
+                self._sku_tokens[col] = [frozenset(parts) for parts in tokens]
+        
+        self._combined_names = None
+        if 'Brand' in columns and 'Description' in columns:
+            combined = self.price_data['Brand'].fillna('') + ' ' + self.price_data['Description'].fillna('')
+            self._combined_names = combined.str.strip()
+        
+        self._alternative_texts = {
+            col: self.price_data[col].astype(str).str.upper().tolist()
+            for col in ['Description', 'Product'] if col in columns
+        }
+        
+        if self._combined_names is not None:
+            self._search_texts = {'_search_text': combined.str.upper()}
+        else:
+            self._search_texts = {
+                col: self.price_data[col].astype(str).str.upper()
+                for col in ['Description', 'Product', 'Brand'] if col in columns
+            }
+        self._fuzzy_choices = {col: texts.tolist() for col, texts in self._search_texts.items()}
+        self._keyword_postings = {}
+        
+        self._name_trigrams = {}
+        for col in NAME_COLUMNS:
+            if col in columns:
+                self._name_trigrams[col] = self._build_trigram_index(self.price_data[col].astype(str))
+        if self._combined_names is not None:
+            self._name_trigrams['_combined_name'] = self._build_trigram_index(self._combined_names)
+    
+    @staticmethod
+    def _build_trigram_index(texts: pd.Series) -> Tuple[Dict[str, frozenset], List[int]]:
+        """
+        Map each upper-cased 3-character substring to the rows containing it.
+        
+        Non-ASCII rows are left out of the map and returned separately, since
+        case-insensitive matching can pair their characters with ASCII ones.
+        """
+        postings: Dict[str, set] = {}
+        unindexed = []
+        for position, text in enumerate(texts):
+            if not text.isascii():
+                unindexed.append(position)
+                continue
+            text = text.upper()
+            for i in range(len(text) - 2):
+                postings.setdefault(text[i:i + 3], set()).add(position)
+        return {gram: frozenset(rows) for gram, rows in postings.items()}, unindexed
+    
     def find_product(self, product_name: str, sku: Optional[str] = None) -> Optional[Dict]:
         """
         Find product in price list by name or SKU using multiple matching strategies.
@@ -109,23 +315,34 @@ class PriceListReader:
             logger.error(f"Error searching for product: {e}")
             return None
     
+    def find_products(self, queries: List[Tuple[str, Optional[str]]]) -> List[Optional[Dict]]:
+        """
+        Find several products at once, e.g. every line of an order.
+        
+        Repeated (name, SKU) pairs are only searched once; each query otherwise
+        goes through the same strategies as find_product.
+        
+        Args:
+            queries: (product_name, sku) pairs, sku may be None
+            
+        Returns:
+            List of product info dicts (or None) in the same order as queries
+        """
+        found = {}
+        results = []
+        for product_name, sku in queries:
+            key = (product_name, sku)
+            if key not in found:
+                found[key] = self.find_product(product_name, sku)
+            result = found[key]
+            results.append(dict(result) if result else result)
+        return results
+    
     def _extract_product_info(self, row) -> Dict:
         """Extract product information from DataFrame row."""
         info = {}
         
-        # Map common column names (updated for Laticrete Excel)
-        column_mappings = {
-            'sku': ['LATICRETE Item No', 'SKU', 'Item #', 'Item Number', 'Product Code', 'Part Number'],
-            'name': ['Description', 'Product', 'Product Name', 'Item Description'],
-            'price': ['Price', 'List Price', 'Unit Price', 'Cost'],
-            'unit': ['Unit', 'UOM', 'Unit of Measure'],
-            'category': ['Category', 'Product Category', 'Type'],
-            'brand': ['Brand'],
-            'size': ['Unit Size'],
-            'weight': ['Unit Weight']
-        }
-        
-        for key, possible_cols in column_mappings.items():
+        for key, possible_cols in COLUMN_MAPPINGS.items():
             for col in possible_cols:
                 if col in row.index and pd.notna(row[col]):
                     info[key] = str(row[col]).strip()
@@ -142,25 +359,37 @@ class PriceListReader:
             elif desc:
                 info['name'] = desc
         
-        # Include all other columns as additional info
+        # Include all other columns as additional info (skipping internal helper columns)
         for col in row.index:
-            if col not in [c for cols in column_mappings.values() for c in cols]:
+            if col not in MAPPED_COLUMNS and not col.startswith('_'):
                 if pd.notna(row[col]):
                     info[col.lower().replace(' ', '_')] = str(row[col]).strip()
         
         return info
     
+    def _product_info_at(self, position: int) -> Dict:
+        """Product info for a row position, extracted once and copied per caller."""
+        info = self._product_info_cache.get(position)
+        if info is None:
+            info = self._extract_product_info(self.price_data.iloc[position])
+            self._product_info_cache[position] = info
+        return dict(info)
+    
+    def _first_match(self, mask: pd.Series) -> Optional[Dict]:
+        """Product info for the first row selected by a boolean mask."""
+        positions = np.flatnonzero(mask.to_numpy())
+        if len(positions):
+            return self._product_info_at(int(positions[0]))
+        return None
+    
     def _find_by_exact_sku(self, sku: str) -> Optional[Dict]:
         """Find product by exact SKU match."""
         clean_sku = sku.replace('#', '').strip()
         
-        for col in ['LATICRETE Item No', 'SKU', 'Item #', 'Item Number', 'Product Code', 'Part Number']:
-            if col in self.price_data.columns:
-                matches = self.price_data[
-                    self.price_data[col].astype(str).str.strip() == clean_sku
-                ]
-                if not matches.empty:
-                    return self._extract_product_info(matches.iloc[0])
+        for positions in self._exact_skus.values():
+            position = positions.get(clean_sku)
+            if position is not None:
+                return self._product_info_at(position)
         return None
     
     def _find_by_partial_sku(self, sku: str) -> Optional[Dict]:
@@ -168,48 +397,59 @@ class PriceListReader:
         clean_sku = sku.replace('#', '').strip()
         
         # Extract core SKU parts (numbers and key identifiers)
-        sku_parts = re.findall(r'\d+|[A-Z]+', clean_sku.upper())
+        sku_parts = _TOKEN_RE.findall(clean_sku.upper())
         
         if not sku_parts:
             return None
         
-        for col in ['LATICRETE Item No', 'SKU']:
-            if col in self.price_data.columns:
-                for _, row in self.price_data.iterrows():
-                    row_sku = str(row[col]).strip().upper()
-                    row_parts = re.findall(r'\d+|[A-Z]+', row_sku)
-                    
-                    # Check if significant parts match
-                    matching_parts = sum(1 for part in sku_parts if part in row_parts)
-                    if matching_parts >= len(sku_parts) * 0.7:  # 70% match threshold
-                        return self._extract_product_info(row)
+        required = len(sku_parts) * 0.7  # 70% match threshold
+        for row_tokens in self._sku_tokens.values():
+            # First row where enough significant parts match
+            position = next((i for i, tokens in enumerate(row_tokens)
+                             if sum(1 for part in sku_parts if part in tokens) >= required), None)
+            if position is not None:
+                return self._product_info_at(position)
         return None
     
     def _find_by_exact_name(self, product_name: str) -> Optional[Dict]:
         """Find product by exact name match."""
         # Check individual columns first
-        for col in ['Description', 'Product', 'Product Name', 'Brand']:
+        for col in NAME_COLUMNS:
             if col in self.price_data.columns:
-                matches = self.price_data[
-                    self.price_data[col].astype(str).str.contains(
-                        re.escape(product_name), case=False, na=False
-                    )
-                ]
-                if not matches.empty:
-                    return self._extract_product_info(matches.iloc[0])
+                match = self._first_containing(col, self.price_data[col].astype(str), product_name)
+                if match:
+                    return match
         
         # Try concatenated Brand + Description search
-        if 'Brand' in self.price_data.columns and 'Description' in self.price_data.columns:
-            self.price_data['_combined_name'] = (self.price_data['Brand'].fillna('') + ' ' + 
-                                                 self.price_data['Description'].fillna('')).str.strip()
-            matches = self.price_data[
-                self.price_data['_combined_name'].str.contains(
-                    re.escape(product_name), case=False, na=False
-                )
-            ]
-            if not matches.empty:
-                return self._extract_product_info(matches.iloc[0])
+        if self._combined_names is not None:
+            return self._first_containing('_combined_name', self._combined_names, product_name)
+        
+        return None
+    
+    def _first_containing(self, key: str, texts: pd.Series, product_name: str) -> Optional[Dict]:
+        """
+        Product info for the first row whose text contains product_name, ignoring case.
         
+        Only rows holding every trigram of the name can contain it, so those
+        candidates are checked instead of the whole column.
+        """
+        pattern = re.escape(product_name)
+        if len(product_name) < 3 or not product_name.isascii():
+            return self._first_match(texts.str.contains(pattern, case=False, na=False))
+        
+        postings, unindexed = self._name_trigrams[key]
+        query = product_name.upper()
+        grams = sorted(
+            (postings.get(query[i:i + 3], frozenset()) for i in range(len(query) - 2)),
+            key=len
+        )
+        candidates = set(grams[0]).intersection(*grams[1:])
+        candidates.update(unindexed)
+        
+        regex = re.compile(pattern, re.IGNORECASE)
+        for position in sorted(candidates):
+            if regex.search(texts.iat[position]):
+                return self._product_info_at(position)
         return None
     
     def _find_by_keywords(self, product_name: str) -> Optional[Dict]:
@@ -220,62 +460,93 @@ class PriceListReader:
         if not keywords:
             return None
         
-        best_match = None
+        best_position = None
         best_score = 0
         
-        # Create combined text for searching
-        if 'Brand' in self.price_data.columns and 'Description' in self.price_data.columns:
-            self.price_data['_search_text'] = (self.price_data['Brand'].fillna('') + ' ' + 
-                                               self.price_data['Description'].fillna('')).str.upper()
-        
-        search_columns = ['_search_text'] if '_search_text' in self.price_data.columns else ['Description', 'Product', 'Brand']
+        for col, texts in self._search_texts.items():
+            # Count matching keywords per row from the rows each keyword appears in
+            postings = [self._keyword_rows(col, texts, kw) for kw in keywords]
+            matches = np.bincount(np.concatenate(postings), minlength=len(texts))
+            scores = matches / len(keywords)
+            
+            position = int(np.argmax(scores))
+            if scores[position] > best_score and scores[position] >= 0.6:  # At least 60% keywords match
+                best_score = scores[position]
+                best_position = position
         
-        for col in search_columns:
-            if col in self.price_data.columns:
-                for _, row in self.price_data.iterrows():
-                    row_text = str(row[col]).upper()
-                    
-                    # Count matching keywords
-                    matches = sum(1 for kw in keywords if kw in row_text)
-                    score = matches / len(keywords)
-                    
-                    if score > best_score and score >= 0.6:  # At least 60% keywords match
-                        best_score = score
-                        best_match = row
-        
-        if best_match is not None:
-            return self._extract_product_info(best_match)
+        if best_position is not None:
+            return self._product_info_at(best_position)
         return None
     
+    def _keyword_rows(self, col: str, texts: pd.Series, keyword: str) -> np.ndarray:
+        """Positions of the rows whose search text contains the keyword, memoized per keyword."""
+        key = (col, keyword)
+        rows = self._keyword_postings.get(key)
+        if rows is None:
+            if len(self._keyword_postings) >= KEYWORD_POSTINGS_MAX:
+                self._keyword_postings.clear()
+            rows = np.flatnonzero(texts.str.contains(keyword, regex=False).to_numpy())
+            self._keyword_postings[key] = rows
+        return rows
+    
     def _find_by_fuzzy_match(self, product_name: str) -> Optional[Dict]:
         """Find product using fuzzy string matching."""
-        best_match = None
+        best_position = None
         best_score = 0
         
         product_upper = product_name.upper()
         
-        # Create combined text for fuzzy matching
-        if 'Brand' in self.price_data.columns and 'Description' in self.price_data.columns:
-            self.price_data['_fuzzy_text'] = (self.price_data['Brand'].fillna('') + ' ' + 
-                                              self.price_data['Description'].fillna('')).str.upper()
+        if RAPIDFUZZ_AVAILABLE and self._fuzzy_choices:
+            return self._find_by_prefiltered_fuzzy_match(product_upper)
         
-        search_columns = ['_fuzzy_text'] if '_fuzzy_text' in self.price_data.columns else ['Description', 'Product', 'Brand']
+        for texts in self._search_texts.values():
+            for position, row_text in enumerate(texts):
+                # Calculate similarity score
+                score = SequenceMatcher(None, product_upper, row_text).ratio()
+                
+                if score > best_score and score >= 0.6:  # At least 60% similar
+                    best_score = score
+                    best_position = position
         
-        for col in search_columns:
-            if col in self.price_data.columns:
-                for _, row in self.price_data.iterrows():
-                    row_text = str(row[col]).upper()
-                    
-                    # Calculate similarity score
-                    score = SequenceMatcher(None, product_upper, row_text).ratio()
-                    
-                    if score > best_score and score >= 0.6:  # At least 60% similar
-                        best_score = score
-                        best_match = row
-        
-        if best_match is not None:
+        if best_position is not None:
+            logger.debug(f"Fuzzy match score: {best_score:.2f}")
+            return self._product_info_at(best_position)
+        return None
+    
+    def _find_by_prefiltered_fuzzy_match(self, product_upper: str) -> Optional[Dict]:
+        """
+        Pick the same product as the SequenceMatcher scan, scoring most rows with rapidfuzz.
+        
+        fuzz.ratio is an upper bound on SequenceMatcher.ratio: both are twice the
+        matched characters over the combined length, and SequenceMatcher's matches
+        are a common subsequence, which fuzz.ratio maximizes. Rows are re-scored
+        with SequenceMatcher in order of that bound, stopping once no remaining
+        bound can reach the best score, so only the top few rows pay for it.
+        """
+        candidates = []
+        for column, texts in enumerate(self._fuzzy_choices.values()):
+            bounds = process.cdist([product_upper], texts, scorer=fuzz.ratio, dtype=np.float64,
+                                   score_cutoff=FUZZY_PREFILTER_CUTOFF)[0]
+            for position in np.flatnonzero(bounds):
+                candidates.append((-bounds[position], column, int(position)))
+        # Highest bound first; equal bounds in scan order, which breaks score ties
+        candidates.sort()
+        
+        choices = list(self._fuzzy_choices.values())
+        best_score = 0
+        best_key = None
+        for negative_bound, column, position in candidates:
+            if -negative_bound / 100 + FUZZY_BOUND_TOLERANCE < best_score:
+                break
+            score = SequenceMatcher(None, product_upper, choices[column][position]).ratio()
+            if score >= 0.6 and (score > best_score or
+                                 (score == best_score and (column, position) < best_key)):
+                best_score = score
+                best_key = (column, position)
+        
+        if best_key is not None:
             logger.debug(f"Fuzzy match score: {best_score:.2f}")
-            return self._extract_product_info(best_match)
+            return self._product_info_at(best_key[1])
         return None
     
     def _extract_keywords(self, text: str) -> List[str]:
@@ -291,12 +562,12 @@ class PriceListReader:
         keywords = []
         for word in words:
             # Remove non-alphanumeric characters
-            clean_word = re.sub(r'[^A-Z0-9]', '', word)
+            clean_word = _NONALNUM_RE.sub('', word)
             if clean_word and clean_word.lower() not in stop_words and len(clean_word) > 2:
                 keywords.append(clean_word)
         
         # Also extract dimensions if present (e.g., "12x12")
-        dimensions = re.findall(r'\d+[xX]\d+', text)
+        dimensions = _DIM_RE.findall(text)
         keywords.extend(dimensions)
         
         return keywords
@@ -331,31 +602,66 @@ class PriceListReader:
             return alternatives
         
         scores = []
+        query = product_name.upper()
+        
+        if RAPIDFUZZ_AVAILABLE:
+            # fuzz.ratio bounds SequenceMatcher.ratio from above (see
+            # _find_by_prefiltered_fuzzy_match), so each row's combined score is
+            # bounded too. Exact scores are only computed best-bound first until no
+            # remaining row can reach the current top N.
+            candidates = []
+            for column, row_texts in enumerate(self._alternative_texts.values()):
+                fuzzy_bounds = process.cdist([query], row_texts, scorer=fuzz.ratio, dtype=np.float64)[0]
+                for position, row_text in enumerate(row_texts):
+                    keyword_score = sum(1 for kw in keywords if kw in row_text) / len(keywords)
+                    bound = (keyword_score * 0.7) + (fuzzy_bounds[position] / 100 * 0.3)
+                    if bound + FUZZY_BOUND_TOLERANCE > 0.3:
+                        candidates.append((-bound, column, position, keyword_score))
+            candidates.sort()
+            
+            row_texts_by_column = list(self._alternative_texts.values())
+            exact = []
+            top_scores = []  # min-heap of the best top_n exact scores so far
+            for negative_bound, column, position, keyword_score in candidates:
+                if len(top_scores) == top_n and -negative_bound + FUZZY_BOUND_TOLERANCE < top_scores[0]:
+                    break
+                fuzzy_score = SequenceMatcher(None, query, row_texts_by_column[column][position]).ratio()
+                total_score = (keyword_score * 0.7) + (fuzzy_score * 0.3)
+                if total_score > 0.3:  # Minimum threshold
+                    exact.append(((column, position), total_score))
+                    if len(top_scores) < top_n:
+                        heapq.heappush(top_scores, total_score)
+                    else:
+                        heapq.heappushpop(top_scores, total_score)
+            # Back into scan order so ties resolve as in the full scan
+            exact.sort()
+            return self._top_alternatives([(position, score) for (_, position), score in exact], top_n)
+        
+        for row_texts in self._alternative_texts.values():
+            for position, row_text in enumerate(row_texts):
+                # Calculate keyword match score
+                keyword_matches = sum(1 for kw in keywords if kw in row_text)
+                keyword_score = keyword_matches / len(keywords) if keywords else 0
+                
+                # Calculate fuzzy match score
+                fuzzy_score = SequenceMatcher(None, query, row_text).ratio()
+                
+                # Combined score
+                total_score = (keyword_score * 0.7) + (fuzzy_score * 0.3)
+                
+                if total_score > 0.3:  # Minimum threshold
+                    scores.append((position, total_score))
         
-        for col in ['Description', 'Product']:
-            if col in self.price_data.columns:
-                for idx, row in self.price_data.iterrows():
-                    row_text = str(row[col]).upper()
-                    
-                    # Calculate keyword match score
-                    keyword_matches = sum(1 for kw in keywords if kw in row_text)
-                    keyword_score = keyword_matches / len(keywords) if keywords else 0
-                    
-                    # Calculate fuzzy match score
-                    fuzzy_score = SequenceMatcher(None, product_name.upper(), row_text).ratio()
-                    
-                    # Combined score
-                    total_score = (keyword_score * 0.7) + (fuzzy_score * 0.3)
-                    
-                    if total_score > 0.3:  # Minimum threshold
-                        scores.append((idx, total_score, row))
-        
-        # Sort by score and get top N
-        scores.sort(key=lambda x: x[1], reverse=True)
-        
-        for idx, score, row in scores[:top_n]:
-            alt = self._extract_product_info(row)
-            alt['match_score'] = round(score, 2)
+        return self._top_alternatives(scores, top_n)
+    
+    def _top_alternatives(self, scores: List[Tuple], top_n: int) -> List[Dict]:
+        """Turn (row position, score) candidates into the top N alternative products."""
+        alternatives = []
+        
+        # Top N by score without sorting every candidate; ties keep their order
+        for position, score in heapq.nlargest(top_n, scores, key=lambda x: x[1]):
+            alt = self._product_info_at(position)
+            alt['match_score'] = round(float(score), 2)
             alternatives.append(alt)
         
         return alternatives
@@ -366,11 +672,7 @@ class PriceListReader:
             logger.error("Price data not loaded")
             return []
         
-        products = []
-        for _, row in self.price_data.iterrows():
-            products.append(self._extract_product_info(row))
-        
-        return products
+        return [self._product_info_at(position) for position in range(len(self.price_data))]
 
 
 if __name__ == "__main__":
@@ -44,16 +44,16 @@ with MailBox(server, port).login(email, password) as mailbox:
             mailbox.folder.set(folder_name)
             print(f"\nChecking {folder_name}...")
             
-            # Get emails from today
+            # Let the server match today's emails mentioning the order (TEXT covers
+            # headers and body) so only the hits are downloaded
             today = datetime.now().date()
-            for msg in mailbox.fetch(AND(date_gte=today)):
-                if "43157" in msg.subject or (msg.html and "43157" in msg.html) or (msg.text and "43157" in msg.text):
-                    print(f"\n*** FOUND IN {folder_name} ***")
-                    print(f"From: {msg.from_}")
-                    print(f"To: {msg.to}")
-                    print(f"Subject: {msg.subject}")
-                    print(f"Date: {msg.date}")
-                    print(f"UID: {msg.uid}")
+            for msg in mailbox.fetch(AND(text="43157", date_gte=today), mark_seen=False, bulk=True):
+                print(f"\n*** FOUND IN {folder_name} ***")
+                print(f"From: {msg.from_}")
+                print(f"To: {msg.to}")
+                print(f"Subject: {msg.subject}")
+                print(f"Date: {msg.date}")
+                print(f"UID: {msg.uid}")
                     
         except Exception as e:
             print(f"Could not access {folder_name}: {e}")
\ No newline at end of file
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """Test connections for email client CLI."""
 
+import functools
 import os
 import sys
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
 from anthropic import Anthropic
 
 # Add parent directory to path
@@ -11,12 +12,30 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.email_fetcher import EmailFetcher
 from src.email_sender import EmailSender
+from src.utils.env_bootstrap import load_env_once
 from src.utils.logger import setup_logger
 
 # Load environment variables
-load_dotenv()
+load_env_once()
 logger = setup_logger(__name__)
 
+REQUIRED_VARS = [
+    'IMAP_SERVER', 'IMAP_PORT', 'EMAIL_ADDRESS', 'EMAIL_PASSWORD',
+    'ANTHROPIC_API_KEY', 'SMTP_SERVER', 'SMTP_PORT', 
+    'SMTP_USERNAME', 'SMTP_PASSWORD', 'CS_EMAIL'
+]
+# Printed masked by check_environment_variables
+SECRET_VARS = frozenset({'EMAIL_PASSWORD', 'ANTHROPIC_API_KEY', 'SMTP_PASSWORD'})
+
+# Read the settings once; every test below uses this snapshot
+ENV = {var: os.getenv(var) for var in REQUIRED_VARS}
+
+
+@functools.cache
+def _get_anthropic() -> Anthropic:
+    """Shared Claude client, so repeated calls reuse its connection pool."""
+    return Anthropic(api_key=ENV['ANTHROPIC_API_KEY'])
+
 
 def test_imap_connection():
     """Test IMAP connection."""
@@ -24,23 +43,22 @@ def test_imap_connection():
     
     try:
         fetcher = EmailFetcher(
-            server=os.getenv('IMAP_SERVER'),
-            port=int(os.getenv('IMAP_PORT', 993)),
-            email=os.getenv('EMAIL_ADDRESS'),
-            password=os.getenv('EMAIL_PASSWORD')
+            server=ENV['IMAP_SERVER'],
+            port=int(ENV['IMAP_PORT'] or 993),
+            email=ENV['EMAIL_ADDRESS'],
+            password=ENV['EMAIL_PASSWORD']
         )
         
-        if fetcher.test_connection():
+        # Log in once for both the connection check and the fetch
+        with fetcher.session() as mailbox:
+            mailbox.folder.set('INBOX')
             print("✅ IMAP connection successful!")
             
             # Try to fetch recent emails
-            emails = fetcher.fetch_tile_pro_depot_emails(since_days=7)
+            emails = fetcher._fetch_within(mailbox, since_days=7)
             print(f"📧 Found {len(emails)} Tile Pro Depot emails in the last 7 days")
             
             return True
-        else:
-            print("❌ IMAP connection failed!")
-            return False
             
     except Exception as e:
         print(f"❌ IMAP test error: {e}")
@@ -53,10 +71,10 @@ def test_smtp_connection():
     
     try:
         sender = EmailSender(
-            smtp_server=os.getenv('SMTP_SERVER'),
-            smtp_port=int(os.getenv('SMTP_PORT', 587)),
-            username=os.getenv('SMTP_USERNAME'),
-            password=os.getenv('SMTP_PASSWORD')
+            smtp_server=ENV['SMTP_SERVER'],
+            smtp_port=int(ENV['SMTP_PORT'] or 587),
+            username=ENV['SMTP_USERNAME'],
+            password=ENV['SMTP_PASSWORD']
         )
         
         if sender.test_connection():
@@ -76,7 +94,7 @@ def test_claude_api():
     print("\n🤖 Testing Claude API Connection...")
     
     try:
-        client = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        client = _get_anthropic()
         
         # Send a simple test message
         response = client.messages.create(
@@ -107,22 +125,16 @@ def check_environment_variables():
     """Check if all required environment variables are set."""
     print("\n🔧 Checking Environment Variables...")
     
-    required_vars = [
-        'IMAP_SERVER', 'IMAP_PORT', 'EMAIL_ADDRESS', 'EMAIL_PASSWORD',
-        'ANTHROPIC_API_KEY', 'SMTP_SERVER', 'SMTP_PORT', 
-        'SMTP_USERNAME', 'SMTP_PASSWORD', 'CS_EMAIL'
-    ]
-    
     missing_vars = []
-    for var in required_vars:
-        if not os.getenv(var):
+    for var in REQUIRED_VARS:
+        value = ENV[var]
+        if not value:
             missing_vars.append(var)
             print(f"❌ Missing: {var}")
         else:
             # Show masked value
-            value = os.getenv(var)
-            if 'PASSWORD' in var or 'API_KEY' in var:
-                masked = value[:4] + '*' * (len(value) - 8) + value[-4:] if len(value) > 8 else '*' * len(value)
+            if var in SECRET_VARS:
+                masked = f"{value[:4]}{'*' * (len(value) - 8)}{value[-4:]}" if len(value) > 8 else '*' * len(value)
                 print(f"✅ {var}: {masked}")
             else:
                 print(f"✅ {var}: {value}")
@@ -148,12 +160,16 @@ def main():
         print("\n⚠️  Please set all required environment variables in .env file")
         sys.exit(1)
     
-    # Run connection tests
-    results = {
-        'IMAP': test_imap_connection(),
-        'SMTP': test_smtp_connection(),
-        'Claude API': test_claude_api()
+    # Run connection tests; each one waits on its own server, so run them
+    # side by side (their output may interleave)
+    tests = {
+        'IMAP': test_imap_connection,
+        'SMTP': test_smtp_connection,
+        'Claude API': test_claude_api
     }
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = {service: executor.submit(test) for service, test in tests.items()}
+        results = {service: future.result() for service, future in futures.items()}
     
     # Summary
     print("\n" + "=" * 50)
@@ -2,11 +2,16 @@
 """Simple test to see what emails are in the inbox."""
 
 import os
-from dotenv import load_dotenv
+import sys
 from imap_tools import MailBox
 from datetime import datetime, timedelta
 
-load_dotenv()
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.env_bootstrap import load_env_once
+
+load_env_once()
 
 server = os.getenv('IMAP_SERVER')
 port = int(os.getenv('IMAP_PORT', 993))
@@ -25,7 +30,9 @@ with MailBox(server, port).login(email, password) as mailbox:
     
     count = 0
     from imap_tools import AND
-    for msg in mailbox.fetch(AND(date_gte=since_date.date())):
+    # Headers are enough for the listing; bodies are fetched only for matches
+    for msg in mailbox.fetch(AND(date_gte=since_date.date()), limit=10,
+                             mark_seen=False, headers_only=True, bulk=True):
         count += 1
         print(f"\n--- Email #{count} ---")
         print(f"From: {msg.from_}")
@@ -34,7 +41,8 @@ with MailBox(server, port).login(email, password) as mailbox:
         print(f"Date: {msg.date}")
         
         # Check if it's a Tile Pro Depot order
-        if "tileprodepot" in str(msg.from_).lower() or (msg.to and any("tileprodepot" in str(t).lower() for t in msg.to)):
+        to_addresses = " ".join(msg.to or ()).lower()
+        if "tileprodepot" in str(msg.from_).lower() or "tileprodepot" in to_addresses:
             print("✓ This is a Tile Pro Depot related email!")
             
             # Check subject
@@ -42,6 +50,7 @@ with MailBox(server, port).login(email, password) as mailbox:
                 print("✓ Subject contains 'customer order'")
             
             # Check body for order pattern
+            msg = next(mailbox.fetch(AND(uid=msg.uid), mark_seen=False), msg)
             if msg.html:
                 if "received the following order" in msg.html.lower():
                     print("✓ Body contains order pattern")
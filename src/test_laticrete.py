@@ -1,27 +1,34 @@
 #!/usr/bin/env python3
 """Test script for Laticrete order processing functionality."""
 
+import functools
 import os
 import sys
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
 
 # Add src to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.price_list_reader import PriceListReader
 from src.pdf_filler import PDFOrderFormFiller
-from src.laticrete_processor import LatricreteProcessor
 from src.claude_processor import ClaudeProcessor
 from src.email_parser import TileProDepotParser
+from src.utils.env_bootstrap import load_env_once
+from src.utils.shared_components import get_price_reader
 
 # Load environment variables
-load_dotenv()
+load_env_once()
+
+
+@functools.cache
+def _parser() -> TileProDepotParser:
+    """Email parser shared by the tests."""
+    return TileProDepotParser()
 
 
 def test_price_list_reader():
     """Test the price list reader functionality."""
     print("\n=== Testing Price List Reader ===")
-    reader = PriceListReader()
+    reader = get_price_reader()
     
     # Test searching for common Laticrete products
     test_products = [
@@ -32,9 +39,12 @@ def test_price_list_reader():
         ("SpectraLOCK", None)
     ]
     
-    for name, sku in test_products:
+    # The reader only reads its price data, so the lookups can run side by side
+    with ThreadPoolExecutor() as executor:
+        results = list(executor.map(lambda product: reader.find_product(*product), test_products))
+    
+    for (name, sku), result in zip(test_products, results):
         print(f"\nSearching for: {name}")
-        result = reader.find_product(name, sku)
         if result:
             print(f"  Found: {result.get('name', 'N/A')} (SKU: {result.get('sku', 'N/A')})")
             print(f"  Price: {result.get('price', 'N/A')}")
@@ -91,7 +101,7 @@ def test_email_detection():
     """Test detection of Laticrete products in sample email."""
     print("\n=== Testing Laticrete Product Detection ===")
     
-    parser = TileProDepotParser()
+    parser = _parser()
     
     # Sample HTML with Laticrete products
     sample_html = """
@@ -192,12 +202,15 @@ def test_claude_extraction():
     order_details = processor.extract_order_details(sample_html, product_type="laticrete")
     
     if order_details:
-        print("✓ Successfully extracted order details:")
-        print(f"  Order ID: {order_details.get('order_id')}")
-        print(f"  Customer: {order_details.get('customer_name')}")
-        print(f"  Products: {len(order_details.get('laticrete_products', []))}")
-        for product in order_details.get('laticrete_products', []):
-            print(f"    - {product.get('name')} x{product.get('quantity')}")
+        products = order_details.get('laticrete_products', [])
+        out = [
+            "✓ Successfully extracted order details:",
+            f"  Order ID: {order_details.get('order_id')}",
+            f"  Customer: {order_details.get('customer_name')}",
+            f"  Products: {len(products)}",
+        ]
+        out.extend(f"    - {product.get('name')} x{product.get('quantity')}" for product in products)
+        sys.stdout.write("\n".join(out) + "\n")
     else:
         print("✗ Failed to extract order details")
 
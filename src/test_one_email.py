@@ -2,11 +2,17 @@
 """Test processing one specific email."""
 
 import os
-from dotenv import load_dotenv
+import re
+import sys
 from imap_tools import MailBox, AND
 from datetime import datetime
 
-load_dotenv()
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.env_bootstrap import load_env_once
+
+load_env_once()
 
 server = os.getenv('IMAP_SERVER')
 port = int(os.getenv('IMAP_PORT', 993))
@@ -19,7 +25,7 @@ with MailBox(server, port).login(email, password) as mailbox:
     print("Connected successfully!")
     
     # Get one of the order emails
-    for msg in mailbox.fetch(AND(uid="2764")):  # The last one we found
+    for msg in mailbox.fetch(AND(uid="2764"), mark_seen=False, bulk=True):  # The last one we found
         print(f"\n=== Testing Email ===")
         print(f"From: {msg.from_}")
         print(f"To: {msg.to}")
@@ -34,6 +40,8 @@ with MailBox(server, port).login(email, password) as mailbox:
         # Test body content
         html_content = msg.html or ""
         text_content = msg.text or ""
+        # Lowercase the HTML once for every case-insensitive check below
+        html_lower = html_content.lower()
         
         print(f"\nHTML content length: {len(html_content)}")
         print(f"Text content length: {len(text_content)}")
@@ -46,10 +54,21 @@ with MailBox(server, port).login(email, password) as mailbox:
             "received the following order"
         ]
         
+        # Scan each body once for any pattern (longest first, so a match covers
+        # every shorter pattern inside it), then check the patterns against the
+        # short matched snippets only
+        pattern_re = re.compile(
+            '|'.join(re.escape(p) for p in sorted(set(patterns), key=len, reverse=True)),
+            re.IGNORECASE
+        )
+        html_hits = pattern_re.findall(html_content)
+        text_hits = pattern_re.findall(text_content)
+        html_hits_lower = [hit.lower() for hit in html_hits]
+        
         for pattern in patterns:
-            in_html = pattern in html_content
-            in_text = pattern in text_content
-            in_html_lower = pattern.lower() in html_content.lower()
+            in_html = any(pattern in hit for hit in html_hits)
+            in_text = any(pattern in hit for hit in text_hits)
+            in_html_lower = any(pattern.lower() in hit for hit in html_hits_lower)
             print(f"\nPattern '{pattern}':")
             print(f"  In HTML: {in_html}")
             print(f"  In Text: {in_text}")
@@ -57,7 +76,7 @@ with MailBox(server, port).login(email, password) as mailbox:
         
         # Show a snippet of the content
         if html_content:
-            start = html_content.lower().find("received")
+            start = html_lower.find("received")
             if start != -1:
                 print(f"\nHTML snippet around 'received': ...{html_content[max(0, start-50):start+200]}...")
         
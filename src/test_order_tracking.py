@@ -1,41 +1,38 @@
 #!/usr/bin/env python3
 """
-Test script for order tracking functionality.
+Tests for order tracking functionality.
+
+Each test gets its own tracker (in memory, or a file under tmp_path when a
+second connection is involved) and order ID, so they are independent of one
+another and can run in parallel (pytest -n auto with pytest-xdist).
 """
 
 import os
+import sqlite3
 import sys
+import threading
 from datetime import datetime
 
+import pytest
+
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.order_tracker import OrderTracker
+from src import order_tracker
+from src.order_tracker import OrderTracker, SCHEMA_VERSION
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Extra synthetic orders written in one batch by the bulk insert test
+SYNTHETIC_ORDER_COUNT = 50
 
-def test_order_tracking():
-    """Test various order tracking functionalities."""
-    print("=== Testing Order Tracking System ===\n")
-    
-    # Initialize tracker with test database
-    tracker = OrderTracker(db_path="test_order_tracking.db")
-    
-    # Test 1: Check if a non-existent order has been sent
-    print("Test 1: Checking non-existent order...")
-    order_id = "TEST-12345"
-    if not tracker.has_order_been_sent(order_id):
-        print("✓ Correctly identified that order TEST-12345 has not been sent\n")
-    else:
-        print("✗ Error: Order should not exist\n")
-    
-    # Test 2: Mark an order as sent
-    print("Test 2: Marking order as sent...")
-    test_order = {
-        'order_id': 'TEST-12345',
-        'email_subject': 'New customer order #TEST-12345',
+
+def _make_order(order_id):
+    """A TileWare test order with the given ID."""
+    return {
+        'order_id': order_id,
+        'email_subject': f'New customer order #{order_id}',
         'email_date': datetime.now().isoformat(),
         'customer_name': 'Test Customer',
         'total': '$299.99',
@@ -56,91 +53,351 @@ def test_order_tracking():
             'zip': '12345'
         }
     }
+
+
+def _sent_record(order):
+    """Arguments for OrderTracker.mark_order_as_sent / mark_orders_as_sent_bulk for a test order."""
+    return {
+        'order_id': order['order_id'],
+        'email_data': {'subject': order['email_subject'], 'uid': ''},
+        'order_details': order,
+        'formatted_content': '',
+        'recipient': order['recipient_email']
+    }
+
+
+def _create_baseline_db(db_path, orders, duplicate_checks=()):
+    """
+    Write a tracking database with the schema OrderTracker created before the
+    schema_version migrations, for testing the upgrade path.
     
-    if tracker.mark_order_as_sent(test_order):
-        print("✓ Successfully marked order as sent\n")
-    else:
-        print("✗ Failed to mark order as sent\n")
+    Args:
+        db_path: File to create
+        orders: (order_id, created_at) rows for sent_orders
+        duplicate_checks: Timestamps of old-style duplicate_check log entries
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE sent_orders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id TEXT UNIQUE NOT NULL,
+            email_subject TEXT,
+            sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            sent_to TEXT NOT NULL,
+            customer_name TEXT,
+            tileware_products TEXT,
+            order_total TEXT,
+            formatted_content TEXT,
+            email_uid TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            status TEXT DEFAULT 'sent',
+            error_message TEXT,
+            raw_email_content TEXT,
+            product_type TEXT,
+            laticrete_products TEXT,
+            order_data TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX idx_order_id ON sent_orders(order_id)")
+    conn.execute("CREATE INDEX idx_created_at ON sent_orders(created_at)")
+    conn.execute("CREATE INDEX idx_status ON sent_orders(status)")
+    conn.execute("""
+        CREATE TABLE order_processing_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id TEXT,
+            action TEXT,
+            details TEXT,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("CREATE INDEX idx_log_order_id ON order_processing_log(order_id)")
+    conn.execute("CREATE INDEX idx_log_timestamp ON order_processing_log(timestamp)")
+    conn.executemany(
+        "INSERT INTO sent_orders (order_id, sent_to, customer_name, tileware_products, created_at) "
+        "VALUES (?, 'cs@example.com', 'Old Customer', '[]', ?)",
+        orders
+    )
+    conn.executemany(
+        "INSERT INTO order_processing_log (order_id, action, details, timestamp) "
+        "VALUES ('OLD', 'duplicate_check', 'Order already sent', ?)",
+        [(timestamp,) for timestamp in duplicate_checks]
+    )
+    conn.commit()
+    conn.close()
+
+
+def _query(db_path, sql, params=()):
+    """Run a read query on its own connection, as another process would."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def tracker():
+    """Tracker over an in-memory database; nothing touches disk."""
+    tracker = OrderTracker(db_path=":memory:")
+    yield tracker
+    # The in-memory database goes away with its connection
+    tracker.close()
+
+
+@pytest.fixture
+def test_order(request):
+    """Test order whose ID is unique to the requesting test."""
+    return _make_order(f"TEST-{request.node.name}")
+
+
+def test_not_sent(tracker, test_order):
+    """An order that was never marked is not reported as sent."""
+    is_sent, _ = tracker.has_order_been_sent(test_order['order_id'])
+    assert not is_sent
+
+
+def test_mark_sent(tracker, test_order):
+    """Marking an order as sent makes the duplicate check see it."""
+    assert tracker.mark_order_as_sent(**_sent_record(test_order))
+    is_sent, _ = tracker.has_order_been_sent(test_order['order_id'])
+    assert is_sent
+
+
+def test_duplicate_detection(tracker, test_order):
+    """Marking the same order twice updates the row instead of adding another."""
+    tracker.mark_order_as_sent(**_sent_record(test_order))
+    tracker.mark_order_as_sent(**_sent_record(test_order))
+    assert len(tracker.get_sent_orders()) == 1
+
+
+def test_get_details(tracker, test_order):
+    """Details come back with the stored customer, recipient and products."""
+    tracker.mark_order_as_sent(**_sent_record(test_order))
+    details = tracker.get_order_details(test_order['order_id'])
+    assert details is not None
+    assert details['sent_to'] == test_order['recipient_email']
+    assert details['tileware_products'] == test_order['tileware_products']
+
+
+def test_statistics(tracker, test_order):
+    """Statistics count the orders sent in the period."""
+    tracker.mark_order_as_sent(**_sent_record(test_order))
+    stats = tracker.get_statistics()
+    assert stats['total_orders_sent'] == 1
+    assert stats['period_days'] == 7
+
+
+def test_history(tracker, test_order):
+    """Marking an order as sent logs it in the processing history."""
+    tracker.mark_order_as_sent(**_sent_record(test_order))
+    tracker.flush()
+    history = tracker.get_order_history(test_order['order_id'])
+    assert history
+    assert all(entry['order_id'] == test_order['order_id'] for entry in history)
+
+
+def test_bulk_insert_and_listing(tracker, test_order):
+    """Orders written in one batch all show up in the listing."""
+    synthetic_orders = [
+        _make_order(f"{test_order['order_id']}-BULK-{i:04d}")
+        for i in range(SYNTHETIC_ORDER_COUNT)
+    ]
+    records = [_sent_record(order) for order in [test_order] + synthetic_orders]
+    assert tracker.mark_orders_as_sent_bulk(records)
     
-    # Test 3: Check if the order is now marked as sent
-    print("Test 3: Verifying order is marked as sent...")
-    if tracker.has_order_been_sent(order_id):
-        print("✓ Order correctly identified as already sent\n")
-    else:
-        print("✗ Error: Order should be marked as sent\n")
+    orders = tracker.get_sent_orders(limit=10)
+    assert len(orders) == 10
+    assert len(tracker.get_sent_orders(limit=len(records) + 1)) == len(records)
+
+
+def test_daily_stats_follow_insert_delete_and_remark(tmp_path):
+    """sent_count counts each stored order once through upserts, deletes and re-marks."""
+    db_path = str(tmp_path / "order_tracking.db")
+    tracker = OrderTracker(db_path=db_path)
+    try:
+        order = _make_order("TEST-333")
+        tracker.mark_order_as_sent(**_sent_record(order))
+        assert tracker.get_statistics()['total_orders_sent'] == 1
+        
+        # Re-marking updates the row in place
+        tracker.mark_order_as_sent(**_sent_record(order))
+        assert tracker.get_statistics()['total_orders_sent'] == 1
+        
+        # The admin panel deletes rows directly
+        conn = sqlite3.connect(db_path)
+        conn.execute("DELETE FROM sent_orders WHERE order_id = ?", ("TEST-333",))
+        conn.commit()
+        conn.close()
+        assert tracker.get_statistics()['total_orders_sent'] == 0
+        
+        tracker.mark_order_as_sent(**_sent_record(order))
+        assert tracker.get_statistics()['total_orders_sent'] == 1
+        assert _query(db_path, "SELECT SUM(sent_count) FROM daily_stats")[0][0] == 1
+    finally:
+        tracker.close()
+
+
+def test_daily_stats_backfilled_on_existing_db(tmp_path):
+    """Opening a database from before daily_stats fills it from the existing rows."""
+    db_path = str(tmp_path / "order_tracking.db")
+    _create_baseline_db(
+        db_path,
+        orders=[("OLD-1", "2025-06-01 09:00:00"), ("OLD-2", "2025-06-01 17:30:00"),
+                ("OLD-3", "2025-06-02 08:15:00")],
+        duplicate_checks=["2025-06-01 10:00:00", "2025-06-01 11:00:00", "2025-06-02 12:00:00"]
+    )
     
-    # Test 4: Try to mark the same order again (should fail)
-    print("Test 4: Testing duplicate prevention...")
-    if not tracker.mark_order_as_sent(test_order):
-        print("✓ Correctly prevented duplicate order entry\n")
-    else:
-        print("✗ Error: Should not allow duplicate order\n")
+    OrderTracker(db_path=db_path).close()
     
-    # Test 5: Retrieve order details
-    print("Test 5: Retrieving order details...")
-    order_details = tracker.get_order_details(order_id)
-    if order_details:
-        print("✓ Successfully retrieved order details")
-        print(f"  Customer: {order_details.get('customer_name')}")
-        print(f"  Total: {order_details.get('total_amount')}")
-        print(f"  Sent to: {order_details.get('recipient_email')}\n")
-    else:
-        print("✗ Failed to retrieve order details\n")
+    rows = _query(db_path, "SELECT day, sent_count, duplicate_count FROM daily_stats ORDER BY day")
+    assert rows == [("2025-06-01", 2, 2), ("2025-06-02", 1, 1)]
+
+
+def test_migrates_baseline_db(tmp_path):
+    """An existing database is upgraded in place with its rows intact."""
+    db_path = str(tmp_path / "order_tracking.db")
+    _create_baseline_db(db_path, orders=[("OLD-1", "2025-06-01 09:00:00"),
+                                         ("OLD-2", "2025-06-02 08:15:00")])
     
-    # Test 6: Get statistics
-    print("Test 6: Getting statistics...")
-    stats = tracker.get_statistics()
-    print(f"✓ Statistics retrieved:")
-    print(f"  Total orders: {stats.get('total_orders', 0)}")
-    print(f"  Orders today: {stats.get('orders_today', 0)}")
-    print(f"  Orders this week: {stats.get('orders_this_week', 0)}\n")
+    tracker = OrderTracker(db_path=db_path)
+    try:
+        assert tracker.has_order_been_sent("OLD-1")[0]
+        assert tracker.get_order_details("OLD-2")['customer_name'] == 'Old Customer'
+    finally:
+        tracker.close()
     
-    # Test 7: Add another order for listing test
-    print("Test 7: Adding another test order...")
-    test_order2 = {
-        'order_id': 'TEST-67890',
-        'email_subject': 'New customer order #TEST-67890',
-        'email_date': datetime.now().isoformat(),
-        'customer_name': 'Another Test Customer',
-        'total': '$199.99',
-        'recipient_email': 'cs@example.com',
-        'tileware_products': [
-            {
-                'name': 'TileWare Another Product',
-                'sku': 'TEST-SKU-002',
-                'quantity': 1,
-                'price': '$199.99'
-            }
-        ],
-        'shipping_address': {
-            'name': 'Another Test Customer',
-            'street': '456 Test Avenue',
-            'city': 'Test Town',
-            'state': 'TS',
-            'zip': '67890'
-        }
-    }
+    columns = {row[1] for row in _query(db_path, "PRAGMA table_info(sent_orders)")}
+    assert {'duplicate_hits', 'created_ts'} <= columns
+    assert _query(db_path, "PRAGMA user_version")[0][0] == SCHEMA_VERSION
+    assert _query(db_path, "PRAGMA auto_vacuum")[0][0] == 2  # INCREMENTAL
+    rows = _query(db_path, "SELECT order_id, created_at, created_ts, duplicate_hits "
+                           "FROM sent_orders ORDER BY order_id")
+    assert rows == [
+        # The has_order_been_sent check above counted one duplicate hit
+        ("OLD-1", "2025-06-01 09:00:00", 1748768400, 1),
+        ("OLD-2", "2025-06-02 08:15:00", 1748852100, 0),
+    ]
     
-    if tracker.mark_order_as_sent(test_order2):
-        print("✓ Successfully added second test order\n")
+    # A second open finds the current user_version and leaves the data alone
+    OrderTracker(db_path=db_path).close()
+    assert _query(db_path, "SELECT COUNT(*) FROM sent_orders")[0][0] == 2
+
+
+def test_duplicate_hits_reach_daily_stats(tracker, test_order):
+    """Buffered duplicate hits land in duplicate_count and the order's counter once flushed."""
+    tracker.mark_order_as_sent(**_sent_record(test_order))
+    for _ in range(3):
+        assert tracker.has_order_been_sent(test_order['order_id'])[0]
+    tracker.flush()
     
-    # Test 8: List orders
-    print("Test 8: Listing recent orders...")
-    orders = tracker.get_sent_orders(limit=10)
-    print(f"✓ Found {len(orders)} orders:")
-    for order in orders:
-        print(f"  - Order {order.get('order_id')}: {order.get('customer_name')} - {order.get('total_amount')}")
+    assert tracker.get_statistics()['duplicate_attempts_blocked'] == 3
+    assert tracker.get_order_details(test_order['order_id'])['duplicate_hits'] == 3
+
+
+def test_duplicate_hits_kept_when_write_fails(tracker, test_order, monkeypatch):
+    """Hits whose write fails are retried on the next flush instead of being dropped."""
+    tracker.mark_order_as_sent(**_sent_record(test_order))
+    assert tracker.has_order_been_sent(test_order['order_id'])[0]
+    with monkeypatch.context() as patch:
+        patch.setattr(order_tracker, "ADD_DAILY_DUPLICATES_SQL", "INSERT INTO no_such_table VALUES (?, ?)")
+        tracker.flush()
+    assert sum(tracker._pending_hits.values()) == 1
     
-    # Cleanup test database
-    print("\nCleaning up test database...")
+    tracker.flush()
+    assert tracker.get_order_details(test_order['order_id'])['duplicate_hits'] == 1
+    assert tracker.get_statistics()['duplicate_attempts_blocked'] == 1
+
+
+def test_duplicate_hits_flushed_after_interval(tmp_path, monkeypatch):
+    """A few buffered hits reach daily_stats without a flush() or more traffic."""
+    monkeypatch.setattr(order_tracker, "DUPLICATE_FLUSH_INTERVAL", 0.05)
+    db_path = str(tmp_path / "order_tracking.db")
+    tracker = OrderTracker(db_path=db_path)
     try:
-        os.remove("test_order_tracking.db")
-        print("✓ Test database removed")
-    except:
-        print("✗ Could not remove test database")
-    
-    print("\n=== All tests completed ===")
+        order = _make_order("TEST-113")
+        assert tracker.mark_order_as_sent(**_sent_record(order))
+        assert tracker.has_order_been_sent("TEST-113")[0]
+        tracker._hit_timer.join(5)
+        assert _query(db_path, "SELECT SUM(duplicate_count) FROM daily_stats") == [(1,)]
+    finally:
+        tracker.close()
+
+
+def test_log_action_commits_immediately(tmp_path):
+    """Log entries from outside the tracker are visible to other connections right away."""
+    db_path = str(tmp_path / "order_tracking.db")
+    tracker = OrderTracker(db_path=db_path)
+    try:
+        tracker._log_action("TEST-222", "updated", "{}")
+        conn = sqlite3.connect(db_path)
+        count = conn.execute("SELECT COUNT(*) FROM order_processing_log WHERE order_id = ?",
+                             ("TEST-222",)).fetchone()[0]
+        conn.close()
+        assert count == 1
+    finally:
+        tracker.close()
+
+
+def test_delete_seen_by_other_tracker(tmp_path, monkeypatch):
+    """An order deleted through another connection is no longer reported as sent."""
+    # Poll data_version on every lookup instead of once a second
+    monkeypatch.setattr(order_tracker, "DATA_VERSION_POLL_INTERVAL", 0)
+    db_path = str(tmp_path / "order_tracking.db")
+    # scheduler stands in for main.py's long-lived tracker, admin for the admin panel's
+    scheduler = OrderTracker(db_path=db_path)
+    admin = OrderTracker(db_path=db_path)
+    try:
+        order = _make_order("TEST-111")
+        assert admin.mark_order_as_sent(**_sent_record(order))
+        assert scheduler.has_order_been_sent("TEST-111")[0]
+        assert scheduler.get_order_details("TEST-111") is not None
+        
+        # The admin panel deletes rows over its own connection, then forgets them
+        conn = sqlite3.connect(db_path)
+        conn.execute("DELETE FROM sent_orders WHERE order_id = ?", ("TEST-111",))
+        conn.commit()
+        conn.close()
+        admin.forget_order("TEST-111")
+        
+        assert not admin.has_order_been_sent("TEST-111")[0]
+        assert not scheduler.has_order_been_sent("TEST-111")[0]
+        assert scheduler.get_order_details("TEST-111") is None
+    finally:
+        scheduler.close()
+        admin.close()
+
+
+def test_cached_lookup_does_not_wait_for_writer(tmp_path, monkeypatch):
+    """A duplicate check answered from the cache doesn't take the writer lock."""
+    monkeypatch.setattr(order_tracker, "DATA_VERSION_POLL_INTERVAL", 0)
+    tracker = OrderTracker(db_path=str(tmp_path / "order_tracking.db"))
+    try:
+        assert tracker.mark_order_as_sent(**_sent_record(_make_order("TEST-112")))
+        assert tracker.has_order_been_sent("TEST-112")[0]
+        
+        # Stand-in for a long bulk insert or cleanup chunk on another thread
+        locked = threading.Event()
+        release = threading.Event()
+        
+        def hold_writer():
+            with tracker._lock:
+                locked.set()
+                release.wait(10)
+                
+        holder = threading.Thread(target=hold_writer)
+        holder.start()
+        locked.wait(10)
+        results = []
+        reader = threading.Thread(target=lambda: results.append(tracker.has_order_been_sent("TEST-112")[0]))
+        reader.start()
+        reader.join(5)
+        release.set()
+        holder.join()
+        assert results == [True]
+    finally:
+        tracker.close()
 
 
 if __name__ == "__main__":
-    test_order_tracking()
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,28 @@
+"""Load the .env file once per process."""
+
+from dotenv import load_dotenv
+
+_loaded = False
+
+
+def load_env_once(override: bool = False) -> bool:
+    """
+    Load environment variables from .env the first time this is called.
+
+    Scripts that are imported together (e.g. during test collection) share
+    one parse of the file instead of each re-reading it. Later calls are
+    no-ops even with override=True, so values set after the first load
+    aren't clobbered.
+
+    Args:
+        override: Let .env values replace variables already in the environment
+
+    Returns:
+        True if this call loaded the file, False if it was already loaded
+    """
+    global _loaded
+    if _loaded:
+        return False
+    load_dotenv(override=override)
+    _loaded = True
+    return True
@@ -1,50 +1,87 @@
 """Logging configuration for the email client."""
 
+import atexit
+import functools
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from colorlog import ColoredFormatter
 
+# Loggers hand records to one queue; a background listener formats them and
+# does the console/file writes, so logging never blocks the calling thread.
+_log_queue = queue.SimpleQueue()
+_listener = None
+_listener_lock = threading.Lock()
+_queue_handlers = []
 
-def setup_logger(name: str) -> logging.Logger:
+# Records written between log file size checks
+ROLLOVER_CHECK_INTERVAL = 256
+
+
+class BatchedRotatingFileHandler(RotatingFileHandler):
     """
-    Set up a logger with both console and file handlers.
+    RotatingFileHandler that checks the file size every ROLLOVER_CHECK_INTERVAL
+    records instead of on every record.
     
-    Args:
-        name: Logger name
-        
-    Returns:
-        Configured logger instance
+    The file can grow past maxBytes by at most that many records before it
+    rotates.
     """
-    logger = logging.getLogger(name)
     
-    # Set log level from environment
-    log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
-    logger.setLevel(getattr(logging, log_level, logging.INFO))
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._emit_count = 0
     
-    # Prevent duplicate handlers
-    if logger.handlers:
-        return logger
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        self._emit_count += 1
+        if self._emit_count < ROLLOVER_CHECK_INTERVAL:
+            return False
+        self._emit_count = 0
+        return super().shouldRollover(record)
+
+
+def disable_unused_record_fields():
+    """
+    Stop gathering thread, process and call-site fields for every log record.
     
-    # Console handler with color
+    Neither formatter here uses them, but these switches are interpreter-wide
+    and also affect third-party loggers and handlers, so only an entry point
+    that owns all of its process's logging (main.py) should call this. Leave
+    them on before adding e.g. %(threadName)s or %(lineno)d to a format string.
+    """
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
+
+
+def _create_handlers():
+    """Build the console and rotating file handlers the listener writes to."""
+    # Console handler, with color only when writing to a terminal
     console_handler = logging.StreamHandler()
-    console_formatter = ColoredFormatter(
-        '%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S',
-        log_colors={
-            'DEBUG': 'cyan',
-            'INFO': 'green',
-            'WARNING': 'yellow',
-            'ERROR': 'red',
-            'CRITICAL': 'red,bg_white',
-        }
-    )
+    if console_handler.stream.isatty():
+        console_formatter = ColoredFormatter(
+            '%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S',
+            log_colors={
+                'DEBUG': 'cyan',
+                'INFO': 'green',
+                'WARNING': 'yellow',
+                'ERROR': 'red',
+                'CRITICAL': 'red,bg_white',
+            }
+        )
+    else:
+        console_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
     
     # File handler with rotation
     log_file = os.getenv('LOG_FILE', 'email_processor.log')
-    file_handler = RotatingFileHandler(
+    file_handler = BatchedRotatingFileHandler(
         log_file,
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=5
@@ -54,6 +91,76 @@ def setup_logger(name: str) -> logging.Logger:
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
     
-    return logger
\ No newline at end of file
+    return console_handler, file_handler
+
+
+def _stop_listener():
+    """Write out any queued records and stop the listener (runs at exit)."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def _start_listener():
+    """Start the background listener if it isn't running yet."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = QueueListener(_log_queue, *_create_handlers(), respect_handler_level=True)
+            _listener.start()
+
+
+def _reset_after_fork():
+    """Give a forked child its own queue and listener; the parent's thread isn't copied."""
+    global _log_queue, _listener, _listener_lock
+    _listener_lock = threading.Lock()
+    _log_queue = queue.SimpleQueue()
+    for handler in _queue_handlers:
+        handler.queue = _log_queue
+    if _listener is not None:
+        _listener = None
+        _start_listener()
+        # multiprocessing workers leave via os._exit, skipping atexit
+        from multiprocessing import util
+        util.Finalize(None, _stop_listener, exitpriority=0)
+
+
+atexit.register(_stop_listener)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@functools.cache
+def setup_logger(name: str) -> logging.Logger:
+    """
+    Set up a logger with both console and file handlers.
+    
+    Records go through a queue to a shared background listener that owns
+    the console and rotating file handlers. Each name is set up once; later
+    calls return the same logger without re-reading LOG_LEVEL.
+    
+    Args:
+        name: Logger name
+    
+    Returns:
+        Configured logger instance
+    """
+    logger = logging.getLogger(name)
+    
+    # Set log level from environment
+    log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
+    logger.setLevel(getattr(logging, log_level, logging.INFO))
+    
+    # Prevent duplicate handlers
+    if logger.handlers:
+        return logger
+    
+    _start_listener()
+    queue_handler = QueueHandler(_log_queue)
+    _queue_handlers.append(queue_handler)
+    logger.addHandler(queue_handler)
+    
+    return logger
@@ -0,0 +1,17 @@
+"""Process-wide shared price list reader and Laticrete processor for scripts."""
+
+import functools
+
+from src.laticrete_processor import LatricreteProcessor
+from src.price_list_reader import PriceListReader
+
+
+def get_price_reader() -> PriceListReader:
+    """Price list reader shared within the process; the Excel file is parsed once."""
+    return PriceListReader.shared()
+
+
+@functools.cache
+def get_laticrete_processor() -> LatricreteProcessor:
+    """Laticrete processor shared within the process, built on the shared reader."""
+    return LatricreteProcessor(price_reader=get_price_reader())
@@ -1,28 +1,83 @@
 #!/usr/bin/env python3
 """Comprehensive verification of Laticrete product matching functionality."""
 
+import functools
+import io
 import os
+import re
 import sys
 import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from dotenv import load_dotenv
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Add src to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.price_list_reader import PriceListReader
-from src.laticrete_processor import LatricreteProcessor
 from src.claude_processor import ClaudeProcessor
 from src.email_parser import TileProDepotParser
+from src.utils.env_bootstrap import load_env_once
+from src.utils.shared_components import get_laticrete_processor, get_price_reader
 
 # Load environment variables
-load_dotenv()
+load_env_once()
+
+# Product lines counted by the coverage check, in priority order
+PRODUCT_TYPES = ['HYDRO BAN', '254 PLATINUM', 'STRATA', 'SPECTRALOCK', 'PERMACOLOR']
+PRODUCT_TYPE_RE = re.compile('|'.join(re.escape(ptype) for ptype in PRODUCT_TYPES))
+
+
+def _lookup_key(name: str) -> str:
+    """Cache key for a product name; every matching strategy ignores case."""
+    return name.strip().upper()
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_find(name_key: str, sku):
+    return get_price_reader().find_product(name_key, sku)
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_best_match(name_key: str, sku):
+    return get_price_reader().find_best_match(name_key, sku, return_alternatives=True)
+
+
+def _find(name: str, sku=None):
+    """Memoized reader.find_product; returns a copy the caller may modify."""
+    result = _cached_find(_lookup_key(name), sku)
+    return dict(result) if result else result
 
 
-def test_matching_scenarios():
+def _find_alternatives(name: str, sku=None):
+    """Memoized reader.find_best_match(..., return_alternatives=True)."""
+    result = _cached_best_match(_lookup_key(name), sku)
+    return dict(result) if result else result
+
+
+def _buffered_output(check):
+    """Collect a check's output when no stream is given and write it to stdout in one go."""
+    @functools.wraps(check)
+    def wrapper(out=None):
+        if out is not None:
+            return check(out)
+        buffer = io.StringIO()
+        try:
+            return check(buffer)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+    return wrapper
+
+
+@_buffered_output
+def test_matching_scenarios(out=None):
     """Test various real-world product matching scenarios."""
-    print("\n=== TESTING PRODUCT MATCHING SCENARIOS ===")
-    reader = PriceListReader()
+    print("\n=== TESTING PRODUCT MATCHING SCENARIOS ===", file=out)
     
     # Real-world product names that have caused issues
     problem_products = [
@@ -92,18 +147,18 @@ def test_matching_scenarios():
     }
     
     for product in problem_products:
-        print(f"\n--- Testing: {product['name']}")
-        print(f"    SKU: {product.get('sku', 'None')}")
-        print(f"    Notes: {product['notes']}")
+        print(f"\n--- Testing: {product['name']}", file=out)
+        print(f"    SKU: {product.get('sku', 'None')}", file=out)
+        print(f"    Notes: {product['notes']}", file=out)
         
         # Try to find the product
-        result = reader.find_product(product['name'], product.get('sku'))
+        result = _find(product['name'], product.get('sku'))
         
         if result:
             results['matched'] += 1
-            print(f"    ✓ MATCHED: {result['name']}")
-            print(f"      SKU: {result['sku']}")
-            print(f"      Price: {result.get('price', 'N/A')}")
+            print(f"    ✓ MATCHED: {result['name']}", file=out)
+            print(f"      SKU: {result['sku']}", file=out)
+            print(f"      Price: {result.get('price', 'N/A')}", file=out)
             
             results['details'].append({
                 'original': product['name'],
@@ -114,19 +169,15 @@ def test_matching_scenarios():
             })
         else:
             results['unmatched'] += 1
-            print(f"    ✗ NOT MATCHED")
+            print(f"    ✗ NOT MATCHED", file=out)
             
             # Get alternatives
-            alternatives = reader.find_best_match(
-                product['name'], 
-                product.get('sku'), 
-                return_alternatives=True
-            )
+            alternatives = _find_alternatives(product['name'], product.get('sku'))
             
             if alternatives and alternatives.get('alternatives'):
-                print("    Alternatives found:")
+                print("    Alternatives found:", file=out)
                 for i, alt in enumerate(alternatives['alternatives'][:3], 1):
-                    print(f"      {i}. {alt['name']} (SKU: {alt['sku']}, Score: {alt.get('match_score', 'N/A')})")
+                    print(f"      {i}. {alt['name']} (SKU: {alt['sku']}, Score: {alt.get('match_score', 'N/A')})", file=out)
             
             results['details'].append({
                 'original': product['name'],
@@ -137,11 +188,12 @@ def test_matching_scenarios():
     return results
 
 
-def test_end_to_end_processing():
+@_buffered_output
+def test_end_to_end_processing(out=None):
     """Test complete order processing flow."""
-    print("\n=== TESTING END-TO-END PROCESSING ===")
+    print("\n=== TESTING END-TO-END PROCESSING ===", file=out)
     
-    processor = LatricreteProcessor()
+    processor = get_laticrete_processor()
     
     # Sample order with products that have caused issues
     test_order = {
@@ -178,72 +230,57 @@ def test_end_to_end_processing():
     # Process order to see enrichment
     enriched_order = processor._enrich_with_prices(test_order)
     
-    print("\nEnrichment Results:")
+    print("\nEnrichment Results:", file=out)
     for i, product in enumerate(enriched_order['laticrete_products'], 1):
-        print(f"\n{i}. {product['name']}")
-        print(f"   Original SKU: {test_order['laticrete_products'][i-1].get('sku', 'None')}")
-        print(f"   Matched SKU: {product.get('sku', 'None')}")
-        print(f"   List Price: {product.get('list_price', 'N/A')}")
-        print(f"   Needs Verification: {product.get('needs_verification', False)}")
+        print(f"\n{i}. {product['name']}", file=out)
+        print(f"   Original SKU: {test_order['laticrete_products'][i-1].get('sku', 'None')}", file=out)
+        print(f"   Matched SKU: {product.get('sku', 'None')}", file=out)
+        print(f"   List Price: {product.get('list_price', 'N/A')}", file=out)
+        print(f"   Needs Verification: {product.get('needs_verification', False)}", file=out)
         if product.get('verification_note'):
-            print(f"   Note: {product['verification_note']}")
+            print(f"   Note: {product['verification_note']}", file=out)
     
     return enriched_order
 
 
-def test_price_list_coverage():
+@_buffered_output
+def test_price_list_coverage(out=None):
     """Analyze price list coverage and common product categories."""
-    print("\n=== ANALYZING PRICE LIST COVERAGE ===")
+    print("\n=== ANALYZING PRICE LIST COVERAGE ===", file=out)
     
-    reader = PriceListReader()
+    reader = get_price_reader()
     all_products = reader.get_all_products()
     
-    # Analyze product categories
-    categories = {}
-    brands = {}
-    product_types = []
+    # Analyze product categories and brands
+    categories = Counter(product['category'] for product in all_products if 'category' in product)
+    brands = Counter(product['brand'] for product in all_products if 'brand' in product)
     
+    # Analyze product types from names; a name with several types counts as the first listed
+    type_counts = Counter()
     for product in all_products:
-        # Extract category
-        if 'category' in product:
-            cat = product['category']
-            categories[cat] = categories.get(cat, 0) + 1
-        
-        # Extract brand
-        if 'brand' in product:
-            brand = product['brand']
-            brands[brand] = brands.get(brand, 0) + 1
-        
-        # Analyze product types from names
-        name = product.get('name', '').upper()
-        if 'HYDRO BAN' in name:
-            product_types.append('HYDRO BAN')
-        elif '254 PLATINUM' in name:
-            product_types.append('254 PLATINUM')
-        elif 'STRATA' in name:
-            product_types.append('STRATA')
-        elif 'SPECTRALOCK' in name:
-            product_types.append('SPECTRALOCK')
-        elif 'PERMACOLOR' in name:
-            product_types.append('PERMACOLOR')
+        found = set(PRODUCT_TYPE_RE.findall(product.get('name', '').upper()))
+        if found:
+            type_counts[next(ptype for ptype in PRODUCT_TYPES if ptype in found)] += 1
     
-    print(f"\nTotal products in price list: {len(all_products)}")
-    print(f"\nCategories found: {len(categories)}")
-    for cat, count in sorted(categories.items(), key=lambda x: x[1], reverse=True)[:10]:
-        print(f"  - {cat}: {count} products")
+    print(f"\nTotal products in price list: {len(all_products)}", file=out)
+    print(f"\nCategories found: {len(categories)}", file=out)
+    for cat, count in categories.most_common(10):
+        print(f"  - {cat}: {count} products", file=out)
     
-    print(f"\nBrands found: {len(brands)}")
-    for brand, count in sorted(brands.items(), key=lambda x: x[1], reverse=True)[:5]:
-        print(f"  - {brand}: {count} products")
+    print(f"\nBrands found: {len(brands)}", file=out)
+    for brand, count in brands.most_common(5):
+        print(f"  - {brand}: {count} products", file=out)
     
-    # Count common product types
-    type_counts = {}
-    for ptype in product_types:
-        type_counts[ptype] = type_counts.get(ptype, 0) + 1
+    print("\nCommon product types:", file=out)
+    for ptype, count in type_counts.most_common():
+        print(f"  - {ptype}: {count} products", file=out)
     
-    print("\nCommon product types:")
-    for ptype, count in sorted(type_counts.items(), key=lambda x: x[1], reverse=True):
-        print(f"  - {ptype}: {count} products")
+    return {
+        'total_products': len(all_products),
+        'categories': categories,
+        'brands': brands,
+        'product_types': type_counts
+    }
 
 
 def generate_matching_report():
@@ -251,12 +288,24 @@ def generate_matching_report():
     print("\n" + "=" * 70)
     print("LATICRETE PRODUCT MATCHING VERIFICATION REPORT")
     print("=" * 70)
-    print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    generated_at = datetime.now()
+    print(f"Generated: {generated_at.strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Run all tests
-    matching_results = test_matching_scenarios()
-    enriched_order = test_end_to_end_processing()
-    test_price_list_coverage()
+    # Run all tests side by side, each printing into its own buffer so the
+    # sections come out whole and in order. The shared reader is loaded up
+    # front so the threads don't each build one.
+    get_price_reader()
+    outputs = [io.StringIO() for _ in range(3)]
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        matching_future = executor.submit(test_matching_scenarios, outputs[0])
+        enrichment_future = executor.submit(test_end_to_end_processing, outputs[1])
+        coverage_future = executor.submit(test_price_list_coverage, outputs[2])
+        matching_results = matching_future.result()
+        enriched_order = enrichment_future.result()
+        # Only its printed output is reported; result() re-raises any failure
+        coverage_future.result()
+    for output in outputs:
+        sys.stdout.write(output.getvalue())
     
     # Summary
     print("\n" + "=" * 70)
@@ -289,18 +338,23 @@ def generate_matching_report():
     print("\n" + "=" * 70)
     
     # Save detailed results
-    report_file = f"laticrete_matching_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(report_file, 'w') as f:
-        json.dump({
-            'timestamp': datetime.now().isoformat(),
-            'summary': {
-                'total_tested': total_tested,
-                'matched': matching_results['matched'],
-                'unmatched': matching_results['unmatched'],
-                'success_rate': success_rate
-            },
-            'detailed_results': matching_results['details']
-        }, f, indent=2)
+    report_file = f"laticrete_matching_report_{generated_at.strftime('%Y%m%d_%H%M%S')}.json"
+    report = {
+        'timestamp': generated_at.isoformat(),
+        'summary': {
+            'total_tested': total_tested,
+            'matched': matching_results['matched'],
+            'unmatched': matching_results['unmatched'],
+            'success_rate': success_rate
+        },
+        'detailed_results': matching_results['details']
+    }
+    if ORJSON_AVAILABLE:
+        with open(report_file, 'wb') as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    else:
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
     
     print(f"\nDetailed report saved to: {report_file}")
 
@@ -4,6 +4,7 @@ Email Client CLI - Cross-platform startup script
 Starts all components: main processor, admin backend, and admin frontend
 """
 
+import hashlib
 import os
 import sys
 import subprocess
@@ -12,7 +13,11 @@ import signal
 import atexit
 import platform
 import shutil
+import logging
+import threading
 import requests
+from logging.handlers import RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -23,9 +28,19 @@ YELLOW = '\033[1;33m'
 BLUE = '\033[0;34m'
 NC = '\033[0m'  # No Color
 
+# Hash of the requirements file a venv was last installed from
+REQUIREMENTS_HASH_FILE = ".req_hash"
+
+# Service log rotation
+LOG_MAX_BYTES = 10 * 1024 * 1024  # 10MB
+LOG_BACKUP_COUNT = 5
+
 # Store process handles
 processes = []
 
+# Set by the SIGCHLD handler; the main loop does the actual check
+child_exited = threading.Event()
+
 def print_status(message):
     """Print status message with timestamp."""
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -45,6 +60,8 @@ def print_warning(message):
 
 def cleanup():
     """Kill all child processes on exit."""
+    # Children stopped here are expected; don't report them as crashes
+    ignore_child_exits()
     print_status("Shutting down all services...")
     
     for process in processes:
@@ -61,13 +78,26 @@ def check_command(command):
     """Check if a command exists."""
     return shutil.which(command) is not None
 
-def wait_for_service(url, name, max_attempts=30):
-    """Wait for a service to be ready."""
+def wait_for_service(url, name, max_attempts=30, session=None):
+    """
+    Wait for a service to be ready.
+    
+    Probes start 100ms apart and back off to once a second, so a service that
+    comes up quickly is seen right away. max_attempts keeps its old meaning of
+    roughly how many seconds to wait.
+    """
+    if session is None:
+        # Keep one connection alive across the probes
+        with requests.Session() as session:
+            return wait_for_service(url, name, max_attempts, session)
+    
     print_status(f"Waiting for {name} to be ready...")
+    deadline = time.monotonic() + max_attempts
+    attempt = 0
     
-    for attempt in range(max_attempts):
+    while time.monotonic() < deadline:
         try:
-            response = requests.get(url, timeout=1)
+            response = session.get(url, timeout=1)
             if response.status_code in [200, 404]:
                 print_success(f"{name} is ready")
                 return True
@@ -75,28 +105,87 @@ def wait_for_service(url, name, max_attempts=30):
             pass
         
         print(".", end="", flush=True)
-        time.sleep(1)
+        time.sleep(min(1.0, 0.1 * 2 ** attempt))
+        attempt += 1
     
     print()
     print_error(f"{name} failed to start")
     return False
 
+def wait_for_services(services):
+    """
+    Wait for several services at once.
+    
+    Args:
+        services: (url, name) pairs
+    
+    Returns:
+        True if every service became ready
+    """
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=len(services)) as executor:
+        futures = [
+            executor.submit(wait_for_service, url, name, session=session)
+            for url, name in services
+        ]
+        return all(future.result() for future in futures)
+
+def copy_output(stream, handler):
+    """Write each line a service prints to its rotating log file."""
+    with stream:
+        for line in stream:
+            text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+            handler.handle(logging.makeLogRecord({"msg": text}))
+    handler.close()
+
+def start_service(command, log_path, **popen_kwargs):
+    """Start a service with its output appended to a size-rotated log file."""
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        **popen_kwargs
+    )
+    processes.append(process)
+    
+    handler = RotatingFileHandler(
+        log_path,
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8"
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    threading.Thread(target=copy_output, args=(process.stdout, handler), daemon=True).start()
+    return process
+
 def setup_venv(path, requirements_file):
-    """Set up virtual environment if it doesn't exist."""
+    """Set up virtual environment, installing requirements when they have changed."""
     venv_path = path / "venv"
+    hash_path = venv_path / REQUIREMENTS_HASH_FILE
+    requirements_hash = hashlib.sha256(Path(requirements_file).read_bytes()).hexdigest()
     
-    if not venv_path.exists():
+    created = not venv_path.exists()
+    if created:
         print_warning("Virtual environment not found. Creating...")
         subprocess.run([sys.executable, "-m", "venv", str(venv_path)], check=True)
-        
-        # Install requirements
-        if platform.system() == "Windows":
-            pip_path = venv_path / "Scripts" / "pip.exe"
-        else:
-            pip_path = venv_path / "bin" / "pip"
-        
-        subprocess.run([str(pip_path), "install", "-q", "-r", str(requirements_file)], check=True)
-        print_success("Virtual environment created")
+    elif hash_path.exists() and hash_path.read_text().strip() == requirements_hash:
+        # Installed from this exact requirements file already
+        return venv_path
+    else:
+        print_warning(f"{requirements_file} changed. Updating virtual environment...")
+    
+    # Install requirements
+    if platform.system() == "Windows":
+        pip_path = venv_path / "Scripts" / "pip.exe"
+    else:
+        pip_path = venv_path / "bin" / "pip"
+    
+    subprocess.run(
+        [str(pip_path), "install", "-q", "--prefer-binary", "-r", str(requirements_file)],
+        check=True,
+        env={**os.environ, "PIP_DISABLE_PIP_VERSION_CHECK": "1"}
+    )
+    hash_path.write_text(requirements_hash)
+    print_success("Virtual environment created" if created else "Virtual environment updated")
     
     return venv_path
 
@@ -107,12 +196,30 @@ def get_python_executable(venv_path):
     else:
         return venv_path / "bin" / "python"
 
+def ignore_child_exits():
+    """Stop the SIGCHLD handler from flagging service exits."""
+    if hasattr(signal, "SIGCHLD"):
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+def handle_stop_signal(signum, frame):
+    """Exit cleanly on SIGINT/SIGTERM; cleanup runs from atexit."""
+    ignore_child_exits()
+    sys.exit(0)
+
+def check_processes():
+    """Stop everything if any service process has died."""
+    for i, process in enumerate(processes):
+        if process.poll() is not None:
+            print_error(f"Process {i} has stopped unexpectedly")
+            cleanup()
+            sys.exit(1)
+
 def main():
     """Main function to start all services."""
     # Register cleanup
     atexit.register(cleanup)
-    signal.signal(signal.SIGINT, lambda s, f: sys.exit(0))
-    signal.signal(signal.SIGTERM, lambda s, f: sys.exit(0))
+    signal.signal(signal.SIGINT, handle_stop_signal)
+    signal.signal(signal.SIGTERM, handle_stop_signal)
     
     # Get script directory
     script_dir = Path(__file__).parent.absolute()
@@ -156,14 +263,11 @@ def main():
     main_venv = setup_venv(script_dir, script_dir / "requirements.txt")
     main_python = get_python_executable(main_venv)
     
-    with open(log_dir / "email_processor.log", "w") as log_file:
-        process = subprocess.Popen(
-            [str(main_python), "main.py"],
-            stdout=log_file,
-            stderr=subprocess.STDOUT,
-            cwd=script_dir
-        )
-        processes.append(process)
+    process = start_service(
+        [str(main_python), "main.py"],
+        log_dir / "email_processor.log",
+        cwd=script_dir
+    )
     
     print_success(f"Email processor started (PID: {process.pid})")
     
@@ -185,24 +289,16 @@ def main():
     ])
     backend_env['PYTHONPATH'] = os.pathsep.join(pythonpath_parts)
     
-    with open(log_dir / "admin_backend.log", "w") as log_file:
-        process = subprocess.Popen(
-            [str(backend_python), "-m", "uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000", "--reload"],
-            stdout=log_file,
-            stderr=subprocess.STDOUT,
-            cwd=backend_dir,
-            env=backend_env
-        )
-        processes.append(process)
+    process = start_service(
+        [str(backend_python), "-m", "uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000", "--reload"],
+        log_dir / "admin_backend.log",
+        cwd=backend_dir,
+        env=backend_env
+    )
     
     print_success(f"Admin backend starting (PID: {process.pid})")
     
-    # Wait for backend
-    if not wait_for_service("http://localhost:8000/health", "Admin Backend"):
-        cleanup()
-        sys.exit(1)
-    
-    # Start admin panel frontend
+    # Start admin panel frontend while the backend boots
     print_status("Starting admin panel frontend...")
     
     frontend_dir = script_dir / "admin_panel" / "frontend"
@@ -212,19 +308,19 @@ def main():
         print_warning("Node modules not found. Installing dependencies...")
         subprocess.run(["npm", "install"], cwd=frontend_dir, check=True)
     
-    with open(log_dir / "admin_frontend.log", "w") as log_file:
-        process = subprocess.Popen(
-            ["npm", "run", "dev", "--", "--host", "0.0.0.0"],
-            stdout=log_file,
-            stderr=subprocess.STDOUT,
-            cwd=frontend_dir
-        )
-        processes.append(process)
+    process = start_service(
+        ["npm", "run", "dev", "--", "--host", "0.0.0.0"],
+        log_dir / "admin_frontend.log",
+        cwd=frontend_dir
+    )
     
     print_success(f"Admin frontend starting (PID: {process.pid})")
     
-    # Wait for frontend
-    if not wait_for_service("http://localhost:5173", "Admin Frontend"):
+    # Wait for backend and frontend together
+    if not wait_for_services([
+        ("http://localhost:8000/health", "Admin Backend"),
+        ("http://localhost:5173", "Admin Frontend"),
+    ]):
         cleanup()
         sys.exit(1)
     
@@ -253,14 +349,21 @@ def main():
     
     # Keep running
     try:
-        while True:
-            # Check if any process has died
-            for i, process in enumerate(processes):
-                if process.poll() is not None:
-                    print_error(f"Process {i} has stopped unexpectedly")
-                    cleanup()
-                    sys.exit(1)
-            time.sleep(1)
+        if hasattr(signal, "SIGCHLD"):
+            # Sleep until a child exits (or Ctrl+C) instead of polling. The
+            # handler only sets a flag so cleanup() and sys.exit() never run
+            # inside a signal handler.
+            signal.signal(signal.SIGCHLD, lambda s, f: child_exited.set())
+            check_processes()
+            while True:
+                signal.pause()
+                if child_exited.is_set():
+                    child_exited.clear()
+                    check_processes()
+        else:
+            while True:
+                check_processes()
+                time.sleep(5)
     except KeyboardInterrupt:
         print()
         print_status("Received interrupt signal")
@@ -3,6 +3,7 @@
 
 import sys
 import os
+import traceback
 from pathlib import Path
 
 # Add paths like admin panel does
@@ -11,10 +12,10 @@ sys.path.append(str(Path(__file__).parent / 'admin_panel' / 'backend'))
 
 from admin_panel.backend.services.order_service import OrderService
 from admin_panel.backend.database import get_db_session
-from dotenv import load_dotenv
+from src.utils.env_bootstrap import load_env_once
 
 # Load environment variables
-load_dotenv(override=True)
+load_env_once(override=True)
 
 def test_admin_resend():
     """Test resending through admin panel service."""
@@ -41,7 +42,6 @@ def test_admin_resend():
                 
         except Exception as e:
             print(f"✗ Error: {e}")
-            import traceback
             traceback.print_exc()
             return False
 
@@ -2,9 +2,13 @@
 """Test script to send sample TileWare and Laticrete orders with updated signatures."""
 
 import sys
+import copy
 import os
+import itertools
+import time
+import types
 from pathlib import Path
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -13,65 +17,118 @@ from src.email_sender import EmailSender
 from src.order_formatter import OrderFormatter
 from src.laticrete_processor import LatricreteProcessor
 from src.order_tracker import OrderTracker
-from dotenv import load_dotenv
+from src.utils.env_bootstrap import load_env_once
 
 # Load environment variables (force reload)
-load_dotenv(override=True)
+load_env_once(override=True)
 
-def send_test_tileware_order():
+# Tracking UIDs for the test sends; seeded from the clock so runs don't collide
+_UID = itertools.count(int(time.time()) * 1000)
+
+# Settings the test sends use, read once after the .env load
+ENV = types.SimpleNamespace(
+    smtp_server=os.getenv('SMTP_SERVER'),
+    smtp_port=int(os.getenv('SMTP_PORT', 587)),
+    smtp_user=os.getenv('SMTP_USERNAME'),
+    smtp_pass=os.getenv('SMTP_PASSWORD'),
+    signature=os.getenv('EMAIL_SIGNATURE_TEXT'),
+    cs_email=os.getenv('CS_EMAIL', 'mitch.mossy@gmail.com'),
+    lat_email=os.getenv('LATICRETE_CS_EMAIL', 'mitch.mossy@gmail.com'),
+)
+
+# Test TileWare order; send_test_tileware_order works on a deep copy
+_TW_TEMPLATE = types.MappingProxyType({
+    "order_id": "TEST-TW-001",
+    "customer_name": "Test Customer",
+    "tileware_products": [
+        {
+            "name": "TileWare Promessa™ Series Towel Bar",
+            "sku": "T102-124-BN",
+            "quantity": 2,
+            "price": "$89.99"
+        },
+        {
+            "name": "TileWare Bella Vetro™ Glass Tile Hook",
+            "sku": "BV-201-PC",
+            "quantity": 4,
+            "price": "$34.99"
+        }
+    ],
+    "shipping_address": {
+        "name": "Test Customer",
+        "street": "123 Test Street",
+        "city": "Boston",
+        "state": "MA",
+        "zip": "02101"
+    },
+    "shipping_method": "UPS GROUND",
+    "total": "$319.92"
+})
+
+# Test Laticrete order; send_test_laticrete_order works on a deep copy
+_LAT_TEMPLATE = types.MappingProxyType({
+    "order_id": "TEST-LAT-001",
+    "customer_name": "Test Laticrete Customer",
+    "phone": "617-555-1234",
+    "email": "test@example.com",
+    "laticrete_products": [
+        {
+            "name": "LATICRETE HYDRO BAN Sheet Waterproofing Membrane 5' x 100'",
+            "sku": None,
+            "quantity": 2,
+            "price": None  # Will be enriched from price list
+        },
+        {
+            "name": "LATICRETE 254 PLATINUM PLUS GREY 25LB",
+            "sku": None,
+            "quantity": 5,
+            "price": None  # Will be enriched from price list
+        }
+    ],
+    "shipping_address": {
+        "name": "Test Laticrete Customer",
+        "company": "Test Construction Co.",
+        "street": "456 Builder Lane",
+        "city": "Worcester",
+        "state": "MA",
+        "zip": "01609"
+    },
+    "shipping_method": "LTL FREIGHT",
+    "po_number": "TEST-PO-2024",
+    "notes": "Test order - please confirm signature is updated"
+})
+
+def create_sender():
+    """Email sender configured with the custom signature from the environment."""
+    return EmailSender(
+        smtp_server=ENV.smtp_server,
+        smtp_port=ENV.smtp_port,
+        username=ENV.smtp_user,
+        password=ENV.smtp_pass,
+        signature_html=ENV.signature
+    )
+
+def send_test_tileware_order(sender=None):
     """Send a test TileWare order."""
     print("\n=== Sending Test TileWare Order ===")
     
     # Initialize components with custom signature
-    email_signature = os.getenv('EMAIL_SIGNATURE_TEXT')
-    print(f"Using custom signature: {'Yes' if email_signature else 'No'}")
-    
-    sender = EmailSender(
-        smtp_server=os.getenv('SMTP_SERVER'),
-        smtp_port=int(os.getenv('SMTP_PORT', 587)),
-        username=os.getenv('SMTP_USERNAME'),
-        password=os.getenv('SMTP_PASSWORD'),
-        signature_html=email_signature
-    )
+    print(f"Using custom signature: {'Yes' if ENV.signature else 'No'}")
+    
+    sender = sender or create_sender()
     
     formatter = OrderFormatter()
     tracker = OrderTracker()
     
     # Create test order data
-    test_order = {
-        "order_id": "TEST-TW-001",
-        "customer_name": "Test Customer",
-        "tileware_products": [
-            {
-                "name": "TileWare Promessa™ Series Towel Bar",
-                "sku": "T102-124-BN",
-                "quantity": 2,
-                "price": "$89.99"
-            },
-            {
-                "name": "TileWare Bella Vetro™ Glass Tile Hook",
-                "sku": "BV-201-PC",
-                "quantity": 4,
-                "price": "$34.99"
-            }
-        ],
-        "shipping_address": {
-            "name": "Test Customer",
-            "street": "123 Test Street",
-            "city": "Boston",
-            "state": "MA",
-            "zip": "02101"
-        },
-        "shipping_method": "UPS GROUND",
-        "total": "$319.92"
-    }
+    test_order = copy.deepcopy(dict(_TW_TEMPLATE))
     
     # Format the order
     formatted_order = formatter.format_order(test_order)
     print(f"Formatted order preview:\n{formatted_order[:200]}...")
     
     # Send the email
-    recipient = os.getenv('CS_EMAIL', 'mitch.mossy@gmail.com')
+    recipient = ENV.cs_email
     print(f"Sending to: {recipient}")
     
     success = sender.send_order_to_cs(
@@ -88,7 +145,7 @@ def send_test_tileware_order():
             order_id=test_order['order_id'],
             email_data={
                 'subject': f"Test TileWare Order {test_order['order_id']}",
-                'uid': f"test-{datetime.now().timestamp()}"
+                'uid': f"test-{next(_UID)}"
             },
             order_details=test_order,
             formatted_content=formatted_order,
@@ -99,46 +156,16 @@ def send_test_tileware_order():
     
     return success
 
-def send_test_laticrete_order():
+def send_test_laticrete_order(sender=None):
     """Send a test Laticrete order with PDF."""
     print("\n=== Sending Test Laticrete Order ===")
     
     # Initialize processor
-    processor = LatricreteProcessor()
+    processor = LatricreteProcessor(email_sender=sender)
     tracker = OrderTracker()
     
     # Create test order data
-    test_order = {
-        "order_id": "TEST-LAT-001",
-        "customer_name": "Test Laticrete Customer",
-        "phone": "617-555-1234",
-        "email": "test@example.com",
-        "laticrete_products": [
-            {
-                "name": "LATICRETE HYDRO BAN Sheet Waterproofing Membrane 5' x 100'",
-                "sku": None,
-                "quantity": 2,
-                "price": None  # Will be enriched from price list
-            },
-            {
-                "name": "LATICRETE 254 PLATINUM PLUS GREY 25LB",
-                "sku": None,
-                "quantity": 5,
-                "price": None  # Will be enriched from price list
-            }
-        ],
-        "shipping_address": {
-            "name": "Test Laticrete Customer",
-            "company": "Test Construction Co.",
-            "street": "456 Builder Lane",
-            "city": "Worcester",
-            "state": "MA",
-            "zip": "01609"
-        },
-        "shipping_method": "LTL FREIGHT",
-        "po_number": "TEST-PO-2024",
-        "notes": "Test order - please confirm signature is updated"
-    }
+    test_order = copy.deepcopy(dict(_LAT_TEMPLATE))
     
     print(f"Processing Laticrete order {test_order['order_id']}...")
     
@@ -149,12 +176,12 @@ def send_test_laticrete_order():
         print("✓ Test Laticrete order sent successfully!")
         
         # Track in database
-        recipient = os.getenv('LATICRETE_CS_EMAIL', 'mitch.mossy@gmail.com')
+        recipient = ENV.lat_email
         tracker.mark_order_as_sent(
             order_id=test_order['order_id'],
             email_data={
                 'subject': f"Test Laticrete Order {test_order['order_id']}",
-                'uid': f"test-lat-{datetime.now().timestamp()}"
+                'uid': f"test-lat-{next(_UID)}"
             },
             order_details=test_order,
             formatted_content="Laticrete order with PDF attachment",
@@ -183,21 +210,26 @@ def main():
     # Auto-proceed for non-interactive mode
     print("\nProceeding with test emails...")
     
-    # Send test orders
-    tileware_success = send_test_tileware_order()
-    laticrete_success = send_test_laticrete_order()
-    
-    print("\n" + "=" * 50)
-    print("Test Results:")
-    print(f"TileWare order: {'✓ Sent' if tileware_success else '✗ Failed'}")
-    print(f"Laticrete order: {'✓ Sent' if laticrete_success else '✗ Failed'}")
-    print("=" * 50)
+    # Send test orders side by side over one SMTP connection; the Laticrete
+    # PDF fill overlaps with the TileWare send
+    with create_sender() as sender, ThreadPoolExecutor(max_workers=2) as executor:
+        tileware_future = executor.submit(send_test_tileware_order, sender)
+        laticrete_future = executor.submit(send_test_laticrete_order, sender)
+        tileware_success = tileware_future.result()
+        laticrete_success = laticrete_future.result()
     
     if tileware_success and laticrete_success:
-        print("\nBoth test emails sent successfully!")
-        print("Check your inbox to verify the signature has been updated.")
+        summary = ("Both test emails sent successfully!\n"
+                   "Check your inbox to verify the signature has been updated.")
     else:
-        print("\nSome tests failed. Check the logs for details.")
+        summary = "Some tests failed. Check the logs for details."
+    
+    # Results and summary go out in one write
+    print("\n" + "=" * 50 + "\n"
+          "Test Results:\n"
+          f"TileWare order: {'✓ Sent' if tileware_success else '✗ Failed'}\n"
+          f"Laticrete order: {'✓ Sent' if laticrete_success else '✗ Failed'}\n"
+          + "=" * 50 + "\n\n" + summary)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
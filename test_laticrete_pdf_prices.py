@@ -2,19 +2,64 @@
 """Test that Laticrete PDFs include product prices."""
 
 import sys
+import copy
 import os
+import itertools
+import time
 from pathlib import Path
-from datetime import datetime
+from types import MappingProxyType
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.laticrete_processor import LatricreteProcessor
 from src.order_tracker import OrderTracker
-from dotenv import load_dotenv
+from src.utils.env_bootstrap import load_env_once
 
 # Load environment variables
-load_dotenv(override=True)
+load_env_once(override=True)
+
+# Tracking UIDs for the test sends; seeded from the clock so runs don't collide
+_UID = itertools.count(int(time.time()) * 1000)
+
+# Test Laticrete order; test_laticrete_pdf_with_prices works on a deep copy
+_LAT_TEMPLATE = MappingProxyType({
+    "order_id": "PDF-PRICE-TEST-001",
+    "customer_name": "PDF Price Test Customer",
+    "phone": "617-555-1234",
+    "email": "pdftest@example.com",
+    "laticrete_products": [
+        {
+            "name": "LATICRETE 254 PLATINUM PLUS GREY 25LB",
+            "sku": None,
+            "quantity": 5,
+            "price": None  # Will be enriched
+        },
+        {
+            "name": "LATICRETE HYDRO BAN PREFORMED NICHE 12X12IN SQUARE",
+            "sku": None,
+            "quantity": 2,
+            "price": None  # Will be enriched
+        },
+        {
+            "name": "LATICRETE PERMACOLOR SELECT GROUT - SILVER",
+            "sku": None,
+            "quantity": 10,
+            "price": None  # Will be enriched
+        }
+    ],
+    "shipping_address": {
+        "name": "PDF Price Test Customer",
+        "company": "Test Construction Co.",
+        "street": "123 Test Street",
+        "city": "Boston",
+        "state": "MA",
+        "zip": "02101"
+    },
+    "shipping_method": "UPS GROUND",
+    "po_number": "PDF-TEST-2024",
+    "notes": "Testing PDF generation with prices"
+})
 
 def test_laticrete_pdf_with_prices():
     """Test creating a Laticrete order PDF with prices."""
@@ -24,43 +69,7 @@ def test_laticrete_pdf_with_prices():
     tracker = OrderTracker()
     
     # Create test order
-    test_order = {
-        "order_id": "PDF-PRICE-TEST-001",
-        "customer_name": "PDF Price Test Customer",
-        "phone": "617-555-1234",
-        "email": "pdftest@example.com",
-        "laticrete_products": [
-            {
-                "name": "LATICRETE 254 PLATINUM PLUS GREY 25LB",
-                "sku": None,
-                "quantity": 5,
-                "price": None  # Will be enriched
-            },
-            {
-                "name": "LATICRETE HYDRO BAN PREFORMED NICHE 12X12IN SQUARE",
-                "sku": None,
-                "quantity": 2,
-                "price": None  # Will be enriched
-            },
-            {
-                "name": "LATICRETE PERMACOLOR SELECT GROUT - SILVER",
-                "sku": None,
-                "quantity": 10,
-                "price": None  # Will be enriched
-            }
-        ],
-        "shipping_address": {
-            "name": "PDF Price Test Customer",
-            "company": "Test Construction Co.",
-            "street": "123 Test Street",
-            "city": "Boston",
-            "state": "MA",
-            "zip": "02101"
-        },
-        "shipping_method": "UPS GROUND",
-        "po_number": "PDF-TEST-2024",
-        "notes": "Testing PDF generation with prices"
-    }
+    test_order = copy.deepcopy(dict(_LAT_TEMPLATE))
     
     print("Processing order with price enrichment...")
     
@@ -76,7 +85,7 @@ def test_laticrete_pdf_with_prices():
             order_id=f"LAT-{test_order['order_id']}",
             email_data={
                 'subject': f"Test Laticrete PDF Prices {test_order['order_id']}",
-                'uid': f"test-pdf-prices-{datetime.now().timestamp()}"
+                'uid': f"test-pdf-prices-{next(_UID)}"
             },
             order_details=test_order,
             formatted_content="Laticrete order with PDF attachment (price test)",
@@ -3,6 +3,7 @@
 
 import sys
 import os
+import traceback
 from pathlib import Path
 
 # Add project root to path
@@ -10,11 +11,11 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from src.order_tracker import OrderTracker
 from src.laticrete_processor import LatricreteProcessor
-from dotenv import load_dotenv
+from src.utils.env_bootstrap import load_env_once
 import json
 
 # Load environment variables
-load_dotenv(override=True)
+load_env_once(override=True)
 
 def test_laticrete_resend():
     """Test resending a Laticrete order."""
@@ -56,7 +57,6 @@ def test_laticrete_resend():
             
     except Exception as e:
         print(f"✗ Error processing order: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -2,10 +2,10 @@
 """Test if email signature is loading from environment."""
 
 import os
-from dotenv import load_dotenv
+from src.utils.env_bootstrap import load_env_once
 
 # Reload environment variables
-load_dotenv(override=True)
+load_env_once(override=True)
 
 # Check if signature is loaded
 signature = os.getenv('EMAIL_SIGNATURE_TEXT', 'NOT FOUND')